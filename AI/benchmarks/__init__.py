@@ -0,0 +1 @@
+# Synthetic data generators and benchmarks for the schedulers
@@ -0,0 +1,402 @@
+"""HTTP load test for the scheduling service.
+
+A scenario file lists the requests to mix, with weights::
+
+    {"name": "50-loose-s0",
+     "requests": [
+       {"name": "cp", "method": "POST", "path": "/cp/generate", "weight": 1, "body": {...}},
+       {"name": "sections", "method": "POST", "path": "/sections/generate",
+        "weight": 2, "body_files": ["recorded/a.json", "recorded/b.json"]},
+       {"name": "health", "method": "GET", "path": "/health", "weight": 1}]}
+
+``body_file`` paths are relative to the scenario file, so recorded request
+bodies can be reused as they are. ``bodies`` (or ``body_files``) lists
+variants instead; worker ``i`` always sends variant ``i % len(bodies)``.
+Identical in-flight requests share one solve in the service, so workers
+sending one shared body would measure coalescing rather than load.
+
+``scenario`` writes one from the synthetic generator, with a campus (seed)
+per variant; ``run`` drives the in-process app (or ``--url``) with it and
+reports latency percentiles, throughput, errors, requests the service
+coalesced and ``/health`` latency while solves are in flight.
+
+Run from the AI directory:
+``python -m benchmarks.loadtest scenario --courses 50 --campuses 4 --output scenario.json``
+``python -m benchmarks.loadtest run scenario.json --concurrency 4 --requests 40``
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.synthetic import (
+    CAPACITY_PROFILES,
+    CampusSpec,
+    generate_campus,
+    lecture_tables,
+    section_tables,
+)
+
+# Paths whose requests count as solves for the health-during-solve figures.
+SOLVE_PATH_PREFIXES = ("/cp/", "/sections/", "/schedule/")
+
+
+@dataclass
+class ScenarioRequest:
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    bodies: List[Any] = field(default_factory=lambda: [None])
+
+    @property
+    def is_solve(self) -> bool:
+        return self.path.startswith(SOLVE_PATH_PREFIXES)
+
+    def body_for(self, worker: int) -> Optional[Any]:
+        return self.bodies[worker % len(self.bodies)]
+
+
+@dataclass
+class Sample:
+    name: str
+    seconds: float
+    status: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.status is None or self.status >= 400
+
+
+@dataclass
+class LoadRun:
+    samples: List[Sample] = field(default_factory=list)
+    health: List[Sample] = field(default_factory=list)
+    health_during_solves: List[Sample] = field(default_factory=list)
+    solves_in_flight: int = 0
+
+
+def load_scenario(path: Path) -> List[ScenarioRequest]:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    requests = []
+    for entry in document["requests"]:
+        bodies = entry.get("bodies") or [entry.get("body")]
+        files = entry.get("body_files") or ([entry["body_file"]] if "body_file" in entry else [])
+        if files:
+            bodies = [
+                json.loads((path.parent / name).read_text(encoding="utf-8")) for name in files
+            ]
+        requests.append(
+            ScenarioRequest(
+                name=entry.get("name", entry["path"]),
+                method=entry.get("method", "POST" if bodies[0] is not None else "GET").upper(),
+                path=entry["path"],
+                weight=float(entry.get("weight", 1.0)),
+                bodies=bodies,
+            )
+        )
+    if not requests:
+        raise ValueError(f"{path}: scenario has no requests")
+    return requests
+
+
+def build_scenario(
+    spec: CampusSpec, campuses: int, time_limit_seconds: int, max_days_per_year: int
+) -> Dict[str, Any]:
+    """CP, sections and health requests, with one body per campus.
+
+    Campus ``i`` uses seed ``spec.seed + i``. The sections bodies need a
+    lecture schedule, so each campus is solved once here; campuses without
+    one are left out of the sections variants.
+    """
+    from src.data_loader import DataLoader
+    from src.scheduler import SchedulingCP
+
+    config = {"time_limit_seconds": time_limit_seconds, "max_days_per_year": max_days_per_year}
+    cp_bodies, section_bodies = [], []
+    for offset in range(campuses):
+        campus_spec = replace(spec, seed=spec.seed + offset)
+        campus = generate_campus(campus_spec)
+        cp_bodies.append({"config": config, "data": lecture_tables(campus)})
+
+        loader = DataLoader()
+        if not loader.load_from_json(lecture_tables(campus)):
+            raise RuntimeError(f"{campus_spec.name}: generated lecture data did not load")
+        cp = SchedulingCP(
+            loader.instance,
+            time_limit_seconds=time_limit_seconds,
+            max_days_per_year=max_days_per_year,
+        )
+        schedule = cp.solve()
+        if schedule:
+            schedule_df = cp.schedule_frame(schedule)
+            cp_rows = json.loads(schedule_df.to_json(orient="records"))
+            section_bodies.append({"data": section_tables(campus, cp_rows)})
+        else:
+            print(
+                f"{campus_spec.name}: no lecture schedule ({cp.last_solver_status}); "
+                "sections left out"
+            )
+
+    requests: List[Dict[str, Any]] = [
+        {"name": "cp", "method": "POST", "path": "/cp/generate", "weight": 1, "bodies": cp_bodies}
+    ]
+    if section_bodies:
+        requests.append(
+            {
+                "name": "sections",
+                "method": "POST",
+                "path": "/sections/generate",
+                "weight": 2,
+                "bodies": section_bodies,
+            }
+        )
+    requests.append({"name": "health", "method": "GET", "path": "/health", "weight": 1})
+    return {"name": f"{spec.name}-x{campuses}", "requests": requests}
+
+
+async def _send(client: httpx.AsyncClient, request: ScenarioRequest, worker: int = 0) -> Sample:
+    started = time.perf_counter()
+    try:
+        response = await client.request(
+            request.method, request.path, json=request.body_for(worker)
+        )
+        await response.aread()
+        return Sample(request.name, time.perf_counter() - started, response.status_code)
+    except httpx.HTTPError as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        return Sample(request.name, time.perf_counter() - started, None, error)
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    worker: int,
+    requests: List[ScenarioRequest],
+    rng: random.Random,
+    run: LoadRun,
+    remaining: List[int],
+    deadline: Optional[float],
+) -> None:
+    weights = [request.weight for request in requests]
+    while True:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if remaining[0] <= 0:
+            return
+        remaining[0] -= 1
+        request = rng.choices(requests, weights)[0]
+        if request.is_solve:
+            run.solves_in_flight += 1
+        try:
+            run.samples.append(await _send(client, request, worker))
+        finally:
+            if request.is_solve:
+                run.solves_in_flight -= 1
+
+
+async def _probe_health(client: httpx.AsyncClient, run: LoadRun, interval: float) -> None:
+    probe = ScenarioRequest("health_probe", "GET", "/health")
+    while True:
+        during_solve = run.solves_in_flight > 0
+        sample = await _send(client, probe)
+        run.health.append(sample)
+        if during_solve:
+            run.health_during_solves.append(sample)
+        await asyncio.sleep(interval)
+
+
+async def run_load(
+    requests: List[ScenarioRequest],
+    url: Optional[str],
+    concurrency: int,
+    total_requests: Optional[int],
+    duration_seconds: Optional[float],
+    health_interval: float,
+    timeout_seconds: float,
+    seed: int,
+) -> Dict[str, Any]:
+    """Run ``concurrency`` closed-loop workers until the request count or duration is reached."""
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=timeout_seconds)
+    else:
+        from src.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=timeout_seconds,
+        )
+
+    run = LoadRun()
+    remaining = [total_requests if total_requests is not None else float("inf")]
+    async with client:
+        coalesced_before = await _coalesced_total(client)
+        started = time.perf_counter()
+        deadline = started + duration_seconds if duration_seconds else None
+        probe = asyncio.create_task(_probe_health(client, run, health_interval))
+        try:
+            await asyncio.gather(
+                *(
+                    _worker(
+                        client, idx, requests, random.Random(seed + idx), run, remaining, deadline
+                    )
+                    for idx in range(concurrency)
+                )
+            )
+        finally:
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        coalesced_after = await _coalesced_total(client)
+
+    coalesced = None
+    if coalesced_before is not None and coalesced_after is not None:
+        coalesced = coalesced_after - coalesced_before
+    return {
+        "target": url or "in-process",
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "requests": len(run.samples),
+        "throughput_per_second": len(run.samples) / elapsed if elapsed else 0.0,
+        "errors": sum(sample.failed for sample in run.samples),
+        "error_rate": _error_rate(run.samples),
+        # Requests that shared another in-flight request's solve; None if not reported.
+        "coalesced": coalesced,
+        "routes": {
+            request.name: _summarize([s for s in run.samples if s.name == request.name])
+            for request in requests
+        },
+        "health": _summarize(run.health),
+        "health_during_solves": _summarize(run.health_during_solves),
+    }
+
+
+async def _coalesced_total(client: httpx.AsyncClient) -> Optional[int]:
+    """The service's ``coalesced_total`` admission counter, from ``/health``."""
+    try:
+        response = await client.get("/health")
+        return (response.json().get("admission") or {}).get("coalesced_total")
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+def _summarize(samples: List[Sample]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0}
+    seconds = np.array([sample.seconds for sample in samples])
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+    statuses = Counter(str(sample.status or sample.error) for sample in samples)
+    return {
+        "count": len(samples),
+        "errors": sum(sample.failed for sample in samples),
+        "error_rate": _error_rate(samples),
+        "statuses": dict(statuses),
+        "mean_seconds": float(seconds.mean()),
+        "p50_seconds": float(p50),
+        "p95_seconds": float(p95),
+        "p99_seconds": float(p99),
+        "max_seconds": float(seconds.max()),
+    }
+
+
+def _error_rate(samples: List[Sample]) -> float:
+    return sum(sample.failed for sample in samples) / len(samples) if samples else 0.0
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['requests']} requests in {report['elapsed_seconds']:.1f}s against "
+        f"{report['target']} (concurrency {report['concurrency']}): "
+        f"{report['throughput_per_second']:.2f} req/s, {report['error_rate']:.1%} errors, "
+        f"{'?' if report['coalesced'] is None else report['coalesced']} coalesced"
+    )
+    rows = [*report["routes"].items(), ("health probe", report["health"])]
+    rows.append(("health during solves", report["health_during_solves"]))
+    print(f"{'':>22}  {'count':>6}  {'errors':>7}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'max':>8}")
+    for name, summary in rows:
+        if not summary["count"]:
+            print(f"{name:>22}  {0:>6}")
+            continue
+        print(
+            f"{name:>22}  {summary['count']:>6}  {summary['error_rate']:>7.1%}  "
+            + "  ".join(
+                f"{summary[key]:>7.3f}s"
+                for key in ("p50_seconds", "p95_seconds", "p99_seconds", "max_seconds")
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP load test for the scheduling service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scenario = commands.add_parser("scenario", help="Write a scenario from a synthetic campus")
+    scenario.add_argument("--courses", type=int, default=50)
+    scenario.add_argument("--capacity", choices=CAPACITY_PROFILES, default="loose")
+    scenario.add_argument("--seed", type=int, default=0, help="Seed of the first campus")
+    scenario.add_argument(
+        "--campuses", type=int, default=4, help="Body variants, one campus each; at least --concurrency"
+    )
+    scenario.add_argument("--time-limit", type=int, default=10, help="config.time_limit_seconds")
+    scenario.add_argument("--max-days-per-year", type=int, default=6)
+    scenario.add_argument("--output", type=Path, required=True)
+
+    run = commands.add_parser("run", help="Run a scenario")
+    run.add_argument("scenario", type=Path)
+    run.add_argument("--url", help="Base URL of a running service; in-process app if omitted")
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument(
+        "--requests", type=int, help="Total requests (default 20 without --duration)"
+    )
+    run.add_argument(
+        "--duration", type=float, help="Stop starting requests after this many seconds"
+    )
+    run.add_argument(
+        "--health-interval", type=float, default=0.5, help="Seconds between /health probes"
+    )
+    run.add_argument("--timeout", type=float, default=600.0, help="Per-request timeout in seconds")
+    run.add_argument("--seed", type=int, default=0, help="Seed for the request mix")
+    run.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == "scenario":
+        spec = CampusSpec(courses=args.courses, capacity=args.capacity, seed=args.seed)
+        document = build_scenario(spec, args.campuses, args.time_limit, args.max_days_per_year)
+        args.output.write_text(json.dumps(document), encoding="utf-8")
+        print(f"Wrote {args.output} ({', '.join(r['name'] for r in document['requests'])})")
+        return
+
+    total_requests = args.requests
+    if total_requests is None and args.duration is None:
+        total_requests = 20
+    report = asyncio.run(
+        run_load(
+            load_scenario(args.scenario),
+            url=args.url,
+            concurrency=args.concurrency,
+            total_requests=total_requests,
+            duration_seconds=args.duration,
+            health_interval=args.health_interval,
+            timeout_seconds=args.timeout,
+            seed=args.seed,
+        )
+    )
+    report["scenario"] = str(args.scenario)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
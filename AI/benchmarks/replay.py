@@ -0,0 +1,172 @@
+"""Replay archived requests against the current code and flag regressions.
+
+Reads the archive written by the request recorder (``PUT /debug/recorder``),
+sends each request to the in-process app and compares the result with the
+recorded one:
+
+- HTTP status and solver status (OPTIMAL > FEASIBLE > anything else)
+- relaxation used (``max_days_per_year_used``), assignments and unassigned sections
+- double bookings and over-full rooms reported by the schedule validator
+- per-phase seconds, using the thresholds of ``benchmarks.scaling``
+
+Stream routes are replayed on their JSON route. Output files and profiling
+are switched off. Timings are only comparable when the archive was recorded
+on similar hardware.
+
+Run from the AI directory:
+``python -m benchmarks.replay "data/Processed Data/recordings" --last 20 --output replay.json``
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.scaling import REGRESSION_MIN_SECONDS, REGRESSION_THRESHOLD
+from src.recorder import read_archive
+
+_STATUS_RANK = {"OPTIMAL": 2, "FEASIBLE": 1}
+
+# Validator findings that make a replayed schedule a regression. Lectures
+# outside an instructor's hours are left out: the CP model only enforces
+# available days, so recorded schedules already have them.
+CONFLICT_KINDS = ("room", "instructor", "assistant", "division", "capacity")
+
+
+async def replay(
+    records: List[Dict[str, Any]], time_limit_seconds: Optional[int]
+) -> List[Dict[str, Any]]:
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://replay", timeout=None
+    ) as client:
+        for index, record in enumerate(records):
+            route = record["route"].removesuffix("/stream")
+            body = _replay_body(route, record["request"], time_limit_seconds)
+            response = await client.post(route, json=body)
+            is_json = response.headers.get("content-type", "").startswith("application/json")
+            payload = response.json() if is_json else {}
+            row = compare_record(record, response.status_code, payload)
+            row["index"] = index
+            rows.append(row)
+            print(_format_row(row), flush=True)
+    return rows
+
+
+def _replay_body(
+    route: str, request: Dict[str, Any], time_limit_seconds: Optional[int]
+) -> Dict[str, Any]:
+    body = {**request, "write_output": False, "profile": False, "validate_result": True}
+    if route.startswith("/sections/"):
+        body["response_mode"] = "full"
+    if time_limit_seconds is not None and route.startswith("/cp/"):
+        body["config"] = {**(body.get("config") or {}), "time_limit_seconds": time_limit_seconds}
+    return body
+
+
+def compare_record(record: Dict[str, Any], status: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Differences between a recorded result and its replay; ``regressions`` lists the bad ones."""
+    old = record["result"]
+    changes: List[str] = []
+    regressions: List[str] = []
+
+    if status != record["status"]:
+        changes.append(f"http {record['status']} -> {status}")
+        if record["status"] < 400 <= status:
+            regressions.append("http status")
+
+    old_status, new_status = old.get("solver_status"), payload.get("solver_status")
+    if old_status != new_status:
+        changes.append(f"solver {old_status} -> {new_status}")
+        if _STATUS_RANK.get(new_status, 0) < _STATUS_RANK.get(old_status, 0):
+            regressions.append("solver status")
+
+    for key, worse in (
+        ("max_days_per_year_used", 1),
+        ("total_assignments", -1),
+        ("unassigned_sections", 1),
+    ):
+        if old.get(key) is None or payload.get(key) is None or old[key] == payload[key]:
+            continue
+        changes.append(f"{key} {old[key]} -> {payload[key]}")
+        if (payload[key] - old[key]) * worse > 0:
+            regressions.append(key)
+
+    conflicts = schedule_conflicts(payload)
+    if conflicts:
+        changes.append(f"{conflicts} conflicts")
+        regressions.append("schedule validity")
+
+    phases = {}
+    old_phases = (old.get("timings") or {}).get("phases", {})
+    new_phases = (payload.get("timings") or {}).get("phases", {})
+    for name in old_phases.keys() & new_phases.keys():
+        before, after = old_phases[name]["seconds"], new_phases[name]["seconds"]
+        phases[name] = {"before": before, "after": after}
+        slower = after - before
+        if slower > REGRESSION_MIN_SECONDS and before and slower / before > REGRESSION_THRESHOLD:
+            changes.append(f"{name} {before:.2f}s -> {after:.2f}s")
+            regressions.append(f"{name} time")
+
+    return {
+        "route": record["route"],
+        "recorded_at": record["recorded_at"],
+        "status": status,
+        "solver_status": new_status,
+        "conflicts": conflicts,
+        "phases": phases,
+        "changes": changes,
+        "regressions": regressions,
+    }
+
+
+def schedule_conflicts(payload: Dict[str, Any]) -> int:
+    """``CONFLICT_KINDS`` findings in the replayed schedule's validation report."""
+    counts = (payload.get("validation") or {}).get("counts", {})
+    return sum(counts.get(kind, 0) for kind in CONFLICT_KINDS)
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    verdict = "REGRESSION" if row["regressions"] else "ok"
+    changes = "; ".join(row["changes"]) or "no change"
+    return f"{row['index']:>4}  {row['route']:<26} {verdict:<10}  {changes}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded requests and flag regressions")
+    parser.add_argument("archive", type=Path, help="Recorder directory")
+    parser.add_argument("--route", nargs="+", help="Only these recorded routes")
+    parser.add_argument("--last", type=int, help="Only the most recent N records")
+    parser.add_argument("--time-limit", type=int, help="Override config.time_limit_seconds")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    records = [
+        record
+        for record in read_archive(args.archive)
+        if record.get("request") is not None and (not args.route or record["route"] in args.route)
+    ]
+    if args.last:
+        records = records[-args.last :]
+    if not records:
+        print(f"No replayable records in {args.archive}")
+        return
+
+    rows = asyncio.run(replay(records, args.time_limit))
+    regressions = sum(bool(row["regressions"]) for row in rows)
+    print(f"Replayed {len(rows)} requests: {regressions} with regressions")
+    if args.output:
+        args.output.write_text(json.dumps(rows, indent=1), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
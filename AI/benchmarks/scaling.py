@@ -0,0 +1,324 @@
+"""Scaling benchmark for ``SchedulingCP`` and ``SectionScheduler`` on synthetic campuses.
+
+Each case runs in a fresh process so its peak RSS is its own. Results go
+to a JSON file; ``--compare`` prints the change between two such files.
+A run ends with the memory fit behind ``src.admission.BASE_BYTES`` and
+``BYTES_PER_ITEM``: peak RSS growth over each solve against the
+``estimate_size()`` counts of its model.
+
+Run from the AI directory:
+``python -m benchmarks.scaling --courses 10 50 200 --capacity loose tight --output results.json``
+``python -m benchmarks.scaling --compare before.json after.json``
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import (
+    CAPACITY_PROFILES,
+    CampusSpec,
+    generate_campus,
+    lecture_tables,
+    section_tables,
+)
+
+# Relative change in seconds reported as a regression by --compare; changes
+# smaller than REGRESSION_MIN_SECONDS are timing noise and never count.
+REGRESSION_THRESHOLD = 0.2
+REGRESSION_MIN_SECONDS = 0.5
+
+
+def run_case(
+    spec: CampusSpec,
+    time_limit_seconds: int,
+    max_days_per_year: int,
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    """Generate ``spec``, solve lectures, then place sections; one result row."""
+    from src.data_loader import DataLoader
+    from src.scheduler import SchedulingCP
+    from src.timings import Timings
+
+    campus = generate_campus(spec)
+    result: Dict[str, Any] = {
+        "case": spec.name,
+        "spec": asdict(spec),
+        "rows": {name: len(rows) for name, rows in campus.items()},
+    }
+
+    timings = Timings(trace_memory=trace_memory)
+    loader = DataLoader(timings)
+    if not loader.load_from_json(lecture_tables(campus)):
+        raise RuntimeError(f"{spec.name}: generated lecture data did not load")
+
+    rss_before = _peak_rss_bytes()
+    started = time.perf_counter()
+    cp = SchedulingCP(
+        loader.instance,
+        time_limit_seconds=time_limit_seconds,
+        max_days_per_year=max_days_per_year,
+        timings=timings,
+    )
+    size = cp.estimate_size()
+    schedule = cp.solve()
+    cp_seconds = time.perf_counter() - started
+    attempts = cp.solver_attempts
+    result["cp"] = {
+        "status": cp.last_solver_status,
+        "seconds": cp_seconds,
+        "attempts": len(attempts),
+        "max_days_per_year_used": cp.max_days_per_year,
+        "meetings": len(cp.divisions),
+        "variables": cp.solve_stats.get("variables"),
+        "constraints": cp.solve_stats.get("constraints"),
+        "presolve_seconds": attempts[-1]["presolve_seconds"] if attempts else None,
+        "first_solution_seconds": cp.solve_stats.get("first_solution_seconds"),
+        "assignments": len(schedule) if schedule else 0,
+        "estimated_items": size["variables"] + size["constraints"],
+        "rss_growth_bytes": _peak_rss_bytes() - rss_before,
+    }
+
+    result["sections"] = None
+    if schedule:
+        schedule_df = cp.schedule_frame(schedule)
+        result["sections"] = _run_sections(
+            spec, campus, schedule_df.to_dict("records"), timings
+        )
+
+    phases = timings.finish()["phases"]
+    result["build_seconds"] = sum(
+        phases.get(name, {}).get("seconds", 0.0)
+        for name in ("build_frames", "encode_instance", "prepare_data", "build_model")
+    )
+    result["solve_seconds"] = phases.get("search", {}).get("seconds", 0.0)
+    result["phases"] = phases
+    result["peak_rss_bytes"] = _peak_rss_bytes()
+    return result
+
+
+def _peak_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _run_sections(
+    spec: CampusSpec,
+    campus: Dict[str, List[Dict[str, Any]]],
+    cp_rows: List[Dict[str, Any]],
+    timings: Any,
+) -> Dict[str, Any]:
+    """Place sections around the lecture schedule ``cp_rows``."""
+    from src.section_loader import SectionDataLoader
+    from src.section_scheduler import SectionScheduler
+
+    started = time.perf_counter()
+    section_loader = SectionDataLoader(timings)
+    if not section_loader.load_from_json(section_tables(campus, cp_rows)):
+        raise RuntimeError(f"{spec.name}: generated section data did not load")
+    sections = SectionScheduler(
+        cp_schedule=section_loader.cp_schedule,
+        rooms=section_loader.rooms,
+        sections=section_loader.sections,
+        assistants=section_loader.assistants,
+        divisions=section_loader.divisions,
+        courses=section_loader.courses,
+        doctors=section_loader.doctors,
+        timings=timings,
+    ).run()
+    return {
+        "seconds": time.perf_counter() - started,
+        "placed": len(sections.section_schedule) - sections.unassigned_sections,
+        "unassigned": sections.unassigned_sections,
+    }
+
+
+def _ortools_version() -> str:
+    import ortools
+
+    return ortools.__version__
+
+
+def run_suite(
+    specs: List[CampusSpec],
+    time_limit_seconds: int,
+    max_days_per_year: int,
+    trace_memory: bool,
+) -> List[Dict[str, Any]]:
+    results = []
+    for spec in specs:
+        # A fresh interpreter per case keeps ru_maxrss specific to the case.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            future = pool.submit(
+                run_case, spec, time_limit_seconds, max_days_per_year, trace_memory
+            )
+            try:
+                result = future.result()
+            except Exception as exc:
+                result = {"case": spec.name, "spec": asdict(spec), "error": str(exc)}
+        results.append(result)
+        print(_format_result(result), flush=True)
+    return results
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"{result['case']:>22}  error: {result['error']}"
+    cp, sections = result["cp"], result["sections"]
+    section_text = (
+        f"sections {sections['seconds']:6.2f}s  unassigned {sections['unassigned']:5d}"
+        if sections
+        else f"{'no lecture schedule':>33}"
+    )
+    return (
+        f"{result['case']:>22}  {cp['status'] or '-':>10}  "
+        f"build {result['build_seconds']:7.2f}s  solve {result['solve_seconds']:7.2f}s  "
+        f"{section_text}  rss {result['peak_rss_bytes'] / 2**20:7.1f} MiB"
+    )
+
+
+def fit_memory(results: List[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+    """Least-squares ``(base_bytes, bytes_per_item)`` over the lecture solves.
+
+    The section pass runs after the solve in the same process, below its
+    peak, so it adds no points. None with fewer than two distinct model sizes.
+    """
+    points = [
+        (result["cp"]["estimated_items"], result["cp"]["rss_growth_bytes"])
+        for result in results
+        if "error" not in result and "estimated_items" in result["cp"]
+    ]
+    if len({items for items, _ in points}) < 2:
+        return None
+    mean_items = sum(items for items, _ in points) / len(points)
+    mean_bytes = sum(growth for _, growth in points) / len(points)
+    per_item = sum(
+        (items - mean_items) * (growth - mean_bytes) for items, growth in points
+    ) / sum((items - mean_items) ** 2 for items, _ in points)
+    return mean_bytes - per_item * mean_items, per_item
+
+
+def _format_fit(fit: Optional[Tuple[float, float]]) -> str:
+    from src.admission import BASE_BYTES, BYTES_PER_ITEM
+
+    used = f"admission uses {BASE_BYTES / 2**20:.0f} MiB + {BYTES_PER_ITEM / 1024:.0f} KiB per item"
+    if fit is None:
+        return f"Memory fit: needs at least two model sizes ({used})"
+    base, per_item = fit
+    return f"Memory fit: {base / 2**20:.1f} MiB + {per_item / 1024:.2f} KiB per item ({used})"
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ortools": _ortools_version(),
+    }
+
+
+def compare(before_path: Path, after_path: Path) -> int:
+    """Print per-case changes; returns the number of regressions."""
+    before = {row["case"]: row for row in json.loads(before_path.read_text())["results"]}
+    after = {row["case"]: row for row in json.loads(after_path.read_text())["results"]}
+    regressions = 0
+    for case in sorted(before.keys() & after.keys(), key=_case_order):
+        old, new = before[case], after[case]
+        if "error" in old or "error" in new:
+            print(f"{case:>22}  error: {new.get('error') or old.get('error')}")
+            continue
+        notes = []
+        for key in ("build_seconds", "solve_seconds"):
+            change = _relative(old[key], new[key])
+            notes.append(f"{key.split('_')[0]} {old[key]:.2f}s -> {new[key]:.2f}s ({change:+.0%})")
+            if change > REGRESSION_THRESHOLD and new[key] - old[key] > REGRESSION_MIN_SECONDS:
+                regressions += 1
+        if old["cp"]["status"] != new["cp"]["status"]:
+            notes.append(f"status {old['cp']['status']} -> {new['cp']['status']}")
+            regressions += new["cp"]["status"] not in ("OPTIMAL", "FEASIBLE")
+        if old["sections"] and new["sections"]:
+            unassigned_delta = new["sections"]["unassigned"] - old["sections"]["unassigned"]
+        else:
+            unassigned_delta = 0
+        if unassigned_delta:
+            notes.append(f"unassigned {unassigned_delta:+d}")
+            regressions += unassigned_delta > 0
+        rss_change = _relative(old["peak_rss_bytes"], new["peak_rss_bytes"])
+        notes.append(f"rss {rss_change:+.0%}")
+        print(f"{case:>22}  " + "  ".join(notes))
+    for case in sorted(before.keys() ^ after.keys()):
+        print(f"{case:>22}  only in {'before' if case in before else 'after'}")
+    print(f"Regressions (> {REGRESSION_THRESHOLD:.0%} slower or worse result): {regressions}")
+    return regressions
+
+
+def _relative(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def _case_order(case: str) -> tuple:
+    courses, capacity, seed = case.split("-")
+    return int(courses), capacity, seed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic campuses")
+    parser.add_argument("--courses", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument(
+        "--capacity", choices=CAPACITY_PROFILES, nargs="+", default=list(CAPACITY_PROFILES)
+    )
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--time-limit", type=int, default=60, help="Solver limit per attempt")
+    parser.add_argument("--max-days-per-year", type=int, default=6)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also record tracemalloc peaks per phase (slower)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs=2,
+        metavar=("BEFORE", "AFTER"),
+        help="Compare two results files instead of running",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    specs = [
+        CampusSpec(courses=courses, capacity=capacity, seed=seed)
+        for courses in args.courses
+        for capacity in args.capacity
+        for seed in args.seeds
+    ]
+    started = time.time()
+    results = run_suite(specs, args.time_limit, args.max_days_per_year, args.trace_memory)
+    document = {
+        "created_at": started,
+        "environment": environment(),
+        "settings": {
+            "time_limit_seconds": args.time_limit,
+            "max_days_per_year": args.max_days_per_year,
+            "trace_memory": args.trace_memory,
+        },
+        "results": results,
+        "memory_fit": fit_memory(results),
+    }
+    print(_format_fit(document["memory_fit"]))
+    args.output.write_text(json.dumps(document, indent=1, default=str), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Seeded synthetic campus generator for benchmarks and load tests.
+
+Tables use the JSON row shape of the API (``/cp/generate`` and
+``/sections/generate``), so a generated campus can be sent as a request
+payload or fed to the loaders directly.
+
+Run from the AI directory to write a ``/cp/generate`` payload:
+``python -m benchmarks.synthetic --courses 200 --capacity tight --output cp.json``
+"""
+
+import argparse
+import json
+import math
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.instance import DEFAULT_DAYS
+
+CAPACITY_PROFILES = ("loose", "tight")
+
+# Share of room-hours the weekly lectures should fill.
+_ROOM_UTILISATION = {"loose": 0.3, "tight": 0.6}
+_DAY_HOURS = 9  # 08:00-17:00, the default TimeGrid
+_COURSES_PER_DIVISION = 6
+_COURSES_PER_INSTRUCTOR = {"loose": 3, "tight": 4}
+
+
+@dataclass(frozen=True)
+class CampusSpec:
+    """Size and shape of a generated campus."""
+
+    courses: int = 50
+    capacity: str = "loose"
+    seed: int = 0
+    # Share of courses that also get sections (labs/tutorials).
+    section_share: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.courses < 1:
+            raise ValueError("courses must be at least 1")
+        if self.capacity not in CAPACITY_PROFILES:
+            raise ValueError(f"capacity must be one of {CAPACITY_PROFILES}")
+
+    @property
+    def name(self) -> str:
+        return f"{self.courses}-{self.capacity}-s{self.seed}"
+
+
+def generate_campus(spec: CampusSpec) -> Dict[str, List[Dict[str, Any]]]:
+    """Rooms, courses, doctors, divisions, sections and assistants for ``spec``.
+
+    The same spec always yields the same tables.
+    """
+    rng = random.Random(f"{spec.seed}:{spec.courses}:{spec.capacity}")
+    tight = spec.capacity == "tight"
+
+    divisions = _divisions(rng, math.ceil(spec.courses / _COURSES_PER_DIVISION), tight)
+    num_instructors = math.ceil(spec.courses / _COURSES_PER_INSTRUCTOR[spec.capacity])
+    doctors, instructor_ids = _doctors(rng, num_instructors)
+    courses = _courses(rng, spec.courses, divisions, instructor_ids)
+    rooms = _rooms(rng, courses, divisions, spec.capacity)
+    sections, assistants = _sections(rng, courses, divisions, spec.section_share, tight)
+    return {
+        "rooms": rooms,
+        "courses": courses,
+        "doctors": doctors,
+        "divisions": divisions,
+        "sections": sections,
+        "assistants": assistants,
+    }
+
+
+def lecture_tables(campus: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """The tables ``DataLoader.load_from_json`` and ``/cp/generate`` take."""
+    return {name: campus[name] for name in ("rooms", "courses", "doctors", "divisions")}
+
+
+def section_tables(
+    campus: Dict[str, List[Dict[str, Any]]], cp_schedule: List[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """The tables ``SectionDataLoader.load_from_json`` and ``/sections/generate`` take."""
+    return {
+        "cp_schedule": cp_schedule,
+        "rooms": campus["rooms"],
+        "sections": campus["sections"],
+        "assistants": campus["assistants"],
+        "divisions": campus["divisions"],
+        "courses": campus["courses"],
+        "doctors": campus["doctors"],
+    }
+
+
+def _divisions(rng: random.Random, count: int, tight: bool) -> List[Dict[str, Any]]:
+    """Two majors per department, four years per major."""
+    rows = []
+    for idx in range(count):
+        group, year = divmod(idx, 4)
+        department = f"DEP{group // 2 + 1:02d}"
+        students = rng.randint(120, 320) if tight else rng.randint(60, 200)
+        rows.append(
+            {
+                "Num_ID": f"D{idx + 1:04d}",
+                "Department": department,
+                "Major": f"{department}-M{group % 2 + 1}",
+                "Year": year + 1,
+                "StudentNum": students,
+            }
+        )
+    return rows
+
+
+def _doctors(rng: random.Random, count: int) -> tuple[List[Dict[str, Any]], List[str]]:
+    """Availability rows: two to four days per instructor, mostly full days."""
+    rows = []
+    ids = []
+    for idx in range(count):
+        instructor_id = f"I{idx + 1:04d}"
+        ids.append(instructor_id)
+        for day in rng.sample(DEFAULT_DAYS, rng.randint(2, 4)):
+            start = rng.choice([8, 8, 8, 9, 10])
+            end = rng.choice([15, 16, 17, 17, 17])
+            rows.append(
+                {
+                    "Instructor_ID": instructor_id,
+                    "Instructor_Name": f"Dr. Instructor {idx + 1:04d}",
+                    "Department": f"DEP{idx % 8 + 1:02d}",
+                    "Day": day,
+                    "Start_Time": f"{start:02d}:00",
+                    "End_Time": f"{end:02d}:00",
+                }
+            )
+    return rows, ids
+
+
+def _courses(
+    rng: random.Random,
+    count: int,
+    divisions: List[Dict[str, Any]],
+    instructor_ids: List[str],
+) -> List[Dict[str, Any]]:
+    rows = []
+    for idx in range(count):
+        division = divisions[idx // _COURSES_PER_DIVISION]
+        course_type = "Lab" if rng.random() < 0.25 else "Lecture"
+        rows.append(
+            {
+                "Course_ID": f"C{idx + 1:05d}",
+                "Course_Name": f"Course {idx + 1:05d}",
+                "Department": division["Department"],
+                "Major": division["Major"],
+                "Days": rng.choice([1, 2, 2, 2, 3]),
+                "Hours_per_day": rng.choice([1, 1, 2]),
+                "Instructor_ID": instructor_ids[idx % len(instructor_ids)],
+                "Year": division["Year"],
+                "Type": course_type,
+            }
+        )
+    return rows
+
+
+def _rooms(
+    rng: random.Random,
+    courses: List[Dict[str, Any]],
+    divisions: List[Dict[str, Any]],
+    capacity: str,
+) -> List[Dict[str, Any]]:
+    """Enough lecture and lab rooms for the weekly hours at the profile's utilisation."""
+    week_hours = len(DEFAULT_DAYS) * _DAY_HOURS
+    hours = {"Lecture": 0, "Lab": 0}
+    for course in courses:
+        hours[course["Type"]] += course["Days"] * course["Hours_per_day"]
+    groups = sorted(division["StudentNum"] // 2 for division in divisions)
+    largest_group, median_group = groups[-1], groups[len(groups) // 2]
+
+    rows = []
+    for room_type in ("Lecture", "Lab"):
+        count = max(1, math.ceil(hours[room_type] / week_hours / _ROOM_UTILISATION[capacity]))
+        for number in range(count):
+            if capacity == "loose":
+                seats = rng.randint(largest_group, largest_group * 2)
+            elif number == 0:
+                seats = largest_group
+            else:
+                # Large groups compete for the few rooms that can seat them.
+                seats = rng.randint(median_group, largest_group)
+            idx = len(rows) + 1
+            rows.append(
+                {
+                    "Room_ID": f"R{idx:04d}",
+                    "Room": f"Room {idx:04d}",
+                    "Capacity": max(seats, 20),
+                    "Type": room_type,
+                }
+            )
+    return rows
+
+
+def _sections(
+    rng: random.Random,
+    courses: List[Dict[str, Any]],
+    divisions: List[Dict[str, Any]],
+    share: float,
+    tight: bool,
+) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    division_by_major_year = {(d["Major"], d["Year"]): d for d in divisions}
+    sections = []
+    for course in courses:
+        if rng.random() >= share:
+            continue
+        division = division_by_major_year[(course["Major"], course["Year"])]
+        for number in range(rng.randint(2, 4) if tight else rng.randint(1, 3)):
+            sections.append(
+                {
+                    "Course_Name": course["Course_Name"],
+                    "Division": division["Num_ID"],
+                    "Section": f"S{number + 1}",
+                    "Major": course["Major"],
+                }
+            )
+    num_assistants = max(1, math.ceil(len(sections) / 6))
+    assistants = [
+        {"Assistant_ID": f"A{idx + 1:04d}", "Assistant_Name": f"Assistant {idx + 1:04d}"}
+        for idx in range(num_assistants)
+    ]
+    return sections, assistants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic campus payload")
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--capacity", choices=CAPACITY_PROFILES, default="loose")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--tables",
+        choices=["campus", "cp"],
+        default="cp",
+        help="cp: a /cp/generate request body; campus: all six tables",
+    )
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    spec = CampusSpec(courses=args.courses, capacity=args.capacity, seed=args.seed)
+    campus = generate_campus(spec)
+    if args.tables == "cp":
+        document: Dict[str, Any] = {"data": lecture_tables(campus)}
+    else:
+        document = {"spec": asdict(spec), **campus}
+    args.output.write_text(json.dumps(document, indent=1), encoding="utf-8")
+    counts = ", ".join(f"{len(rows)} {name}" for name, rows in campus.items())
+    print(f"Wrote {args.output} ({spec.name}: {counts})")
+
+
+if __name__ == "__main__":
+    main()
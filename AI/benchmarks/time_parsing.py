@@ -0,0 +1,82 @@
+"""Per-row ``time_to_minutes`` versus column-level ``times_to_minutes``.
+
+Run from the AI directory: ``python -m benchmarks.time_parsing --rows 200000``
+"""
+
+import argparse
+import random
+import time
+from datetime import time as dt_time
+
+import numpy as np
+import pandas as pd
+
+from src.utils import _string_to_minutes, time_to_minutes, times_to_minutes
+
+
+def make_column(rows: int, seed: int = 0) -> pd.Series:
+    """Mixed-format start times as they appear in Data.xlsx and CP outputs."""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(rows):
+        hour = rng.randint(8, 16)
+        minute = rng.choice([0, 30])
+        kind = rng.randrange(4)
+        if kind == 0:
+            period = "AM" if hour < 12 else "PM"
+            values.append(f"{(hour - 1) % 12 + 1}:{minute:02d} {period}")
+        elif kind == 1:
+            values.append(f"{hour}:{minute:02d}")
+        elif kind == 2:
+            values.append(dt_time(hour, minute))
+        else:
+            values.append(hour * 60 + minute)
+    return pd.Series(values, dtype=object)
+
+
+def per_row(column: pd.Series) -> np.ndarray:
+    return np.array([time_to_minutes(value) for value in column], dtype=np.int64)
+
+
+def per_row_uncached(column: pd.Series) -> np.ndarray:
+    """The original path: every string goes through upper/replace/split."""
+    parse_string = _string_to_minutes.__wrapped__
+    values = [
+        parse_string(value) if isinstance(value, str) else time_to_minutes(value)
+        for value in column
+    ]
+    return np.array(values, dtype=np.int64)
+
+
+def best_of(repeats: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        _string_to_minutes.cache_clear()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark time parsing")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    column = make_column(args.rows)
+    if not np.array_equal(per_row(column), times_to_minutes(column)):
+        raise SystemExit("Vectorized parser disagrees with time_to_minutes")
+
+    uncached_seconds = best_of(args.repeats, per_row_uncached, column)
+    row_seconds = best_of(args.repeats, per_row, column)
+    column_seconds = best_of(args.repeats, times_to_minutes, column)
+    print(f"Rows: {args.rows} | distinct values: {column.nunique()}")
+    print(f"Per-row, uncached parsing: {uncached_seconds * 1000:8.1f} ms")
+    print(f"Per-row time_to_minutes:   {row_seconds * 1000:8.1f} ms")
+    print(f"Column times_to_minutes:   {column_seconds * 1000:8.1f} ms")
+    print(f"Speed-up vs uncached per-row: {uncached_seconds / column_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Admin token for the debug routes and per-request profiling.
+
+The token is read from ``AI_ADMIN_TOKEN`` on every check, so it can be set
+or rotated without code changes. When it is unset, nobody is an admin and
+every gated request gets 403.
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN_ENV = "AI_ADMIN_TOKEN"
+ADMIN_HEADER = "X-Admin-Token"
+
+
+def is_admin(x_admin_token: Optional[str] = Header(default=None)) -> bool:
+    """Dependency: whether the ``X-Admin-Token`` header matches ``AI_ADMIN_TOKEN``."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV, "")
+    if not expected or x_admin_token is None:
+        return False
+    return hmac.compare_digest(x_admin_token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency: 403 unless the request carries the admin token."""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail=f"Requires the {ADMIN_HEADER} header")
@@ -0,0 +1,241 @@
+"""Admission control for solver runs: a memory/concurrency budget and request coalescing."""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Solver memory as a fixed overhead plus about 2 KiB per model variable or
+# constraint: the least-squares fit that ``python -m benchmarks.scaling``
+# prints over its cases (peak RSS growth during each solve against the
+# estimate_size() counts), rounded up.
+BASE_BYTES = 8 * 1024 * 1024
+BYTES_PER_ITEM = 2 * 1024
+
+
+@dataclass(frozen=True)
+class ModelEstimate:
+    """Expected size and cost of one solver run, known before the model is built."""
+
+    label: str
+    variables: int = 0
+    constraints: int = 0
+    memory_bytes: int = BASE_BYTES
+    # Upper bound on run time (time limit x relaxation attempts).
+    seconds: float = 0.0
+
+    @classmethod
+    def from_size(cls, label: str, size: Dict[str, int], seconds: float) -> "ModelEstimate":
+        """Estimate from a scheduler's ``estimate_size()`` counts."""
+        variables = int(size.get("variables", 0))
+        constraints = int(size.get("constraints", 0))
+        return cls(
+            label=label,
+            variables=variables,
+            constraints=constraints,
+            memory_bytes=BASE_BYTES + BYTES_PER_ITEM * (variables + constraints),
+            seconds=float(seconds),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "variables": self.variables,
+            "constraints": self.constraints,
+            "memory_bytes": self.memory_bytes,
+            "seconds": self.seconds,
+        }
+
+
+class AdmissionRejected(Exception):
+    """A run was refused; ``retry_after`` is None when retrying cannot help."""
+
+    def __init__(self, message: str, retry_after: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Ticket:
+    estimate: ModelEstimate
+    enqueued_at: float
+    started_at: Optional[float] = None
+    ready: Optional["asyncio.Future[None]"] = None
+
+
+def _default_memory_budget() -> int:
+    """Half of physical memory, or 2 GiB where that cannot be read."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+    except (AttributeError, ValueError, OSError):
+        return 2 * 1024 * 1024 * 1024
+
+
+class AdmissionController:
+    """Admit solver runs while their estimated memory and count fit the budget.
+
+    Runs that do not fit wait in FIFO order (a large run is never overtaken
+    by smaller ones) for up to ``max_wait_seconds``; a full queue or a long
+    wait is rejected with a retry hint, and a run larger than the whole
+    budget is rejected outright. Identical in-flight requests share one
+    execution via ``coalesce``. State is only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        max_queue: int = 32,
+        max_wait_seconds: float = 120.0,
+    ) -> None:
+        self.memory_budget_bytes = memory_budget_bytes or _default_memory_budget()
+        # CP-SAT already searches with several workers per solve.
+        self.max_concurrent = max_concurrent or max(1, (os.cpu_count() or 1) // 2)
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+
+        self._running: List[_Ticket] = []
+        self._queue: Deque[_Ticket] = deque()
+        self._reserved_bytes = 0
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._counts = {
+            "admitted_total": 0,
+            "queued_total": 0,
+            "rejected_total": 0,
+            "coalesced_total": 0,
+        }
+        self._last_estimate: Optional[ModelEstimate] = None
+
+    async def coalesce(self, key: str, job: Callable[[], Awaitable[T]]) -> T:
+        """Run ``job`` once for all concurrent callers with the same ``key``.
+
+        The shared run is shielded, so one caller disconnecting does not
+        cancel it for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(job())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._counts["coalesced_total"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an abandoned failure is not logged
+
+    @asynccontextmanager
+    async def admit(self, estimate: ModelEstimate) -> AsyncIterator[None]:
+        """Hold a share of the budget for the duration of the block."""
+        self._last_estimate = estimate
+        if estimate.memory_bytes > self.memory_budget_bytes:
+            self._counts["rejected_total"] += 1
+            raise AdmissionRejected(
+                f"Estimated model ({estimate.variables} variables, {estimate.constraints} "
+                f"constraints, {estimate.memory_bytes // 2**20} MiB) exceeds the "
+                f"{self.memory_budget_bytes // 2**20} MiB solver budget"
+            )
+
+        ticket = _Ticket(estimate, time.monotonic())
+        if not self._queue and self._fits(estimate):
+            self._start(ticket)
+        else:
+            await self._wait(ticket)
+
+        try:
+            yield
+        finally:
+            self._running.remove(ticket)
+            self._reserved_bytes -= estimate.memory_bytes
+            self._wake()
+
+    async def _wait(self, ticket: _Ticket) -> None:
+        if len(self._queue) >= self.max_queue:
+            self._counts["rejected_total"] += 1
+            raise AdmissionRejected(
+                f"Solver queue is full ({len(self._queue)} waiting)", self.retry_after()
+            )
+
+        ticket.ready = asyncio.get_running_loop().create_future()
+        self._queue.append(ticket)
+        self._counts["queued_total"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.ready), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            if ticket.started_at is not None:
+                return  # admitted just as the wait ran out
+            self._queue.remove(ticket)
+            self._wake()
+            self._counts["rejected_total"] += 1
+            raise AdmissionRejected(
+                f"Waited {self.max_wait_seconds:.0f}s for solver capacity", self.retry_after()
+            ) from None
+        except asyncio.CancelledError:
+            if ticket.started_at is not None:
+                self._running.remove(ticket)
+                self._reserved_bytes -= ticket.estimate.memory_bytes
+            else:
+                self._queue.remove(ticket)
+            self._wake()
+            raise
+
+    def _fits(self, estimate: ModelEstimate) -> bool:
+        return (
+            len(self._running) < self.max_concurrent
+            and self._reserved_bytes + estimate.memory_bytes <= self.memory_budget_bytes
+        )
+
+    def _start(self, ticket: _Ticket) -> None:
+        ticket.started_at = time.monotonic()
+        self._running.append(ticket)
+        self._reserved_bytes += ticket.estimate.memory_bytes
+        self._counts["admitted_total"] += 1
+        if ticket.ready is not None:
+            ticket.ready.set_result(None)
+
+    def _wake(self) -> None:
+        while self._queue and self._fits(self._queue[0].estimate):
+            self._start(self._queue.popleft())
+
+    def retry_after(self) -> int:
+        """Seconds until the earliest running solve should have finished."""
+        now = time.monotonic()
+        remaining = [
+            ticket.started_at + ticket.estimate.seconds - now for ticket in self._running
+        ]
+        return max(1, math.ceil(min(remaining, default=1)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue depth, reserved budget, counters and per-run estimates."""
+        now = time.monotonic()
+        return {
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "in_flight_requests": len(self._inflight),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "memory_reserved_bytes": self._reserved_bytes,
+            **self._counts,
+            "running_estimates": [
+                {**ticket.estimate.to_dict(), "running_seconds": now - ticket.started_at}
+                for ticket in self._running
+            ],
+            "queued_estimates": [
+                {**ticket.estimate.to_dict(), "waiting_seconds": now - ticket.enqueued_at}
+                for ticket in self._queue
+            ],
+            "last_estimate": self._last_estimate.to_dict() if self._last_estimate else None,
+        }
+
+
+admission = AdmissionController()
@@ -0,0 +1,304 @@
+"""Content-Encoding support: compressed request bodies and negotiated responses."""
+
+import io
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+
+# Preferred first when the client accepts several with equal weight.
+ENCODINGS: Tuple[str, ...] = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class CompressionStats:
+    """Bytes and time spent per (direction, encoding), for the metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, direction: str, encoding: str, raw_bytes: int, encoded_bytes: int, seconds: float
+    ) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(
+                (direction, encoding),
+                {"count": 0, "raw_bytes": 0, "encoded_bytes": 0, "seconds": 0.0},
+            )
+            totals["count"] += 1
+            totals["raw_bytes"] += raw_bytes
+            totals["encoded_bytes"] += encoded_bytes
+            totals["seconds"] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """``"<direction>/<encoding>"`` -> totals plus the overall ratio."""
+        with self._lock:
+            return {
+                f"{direction}/{encoding}": {
+                    **totals,
+                    "ratio": totals["raw_bytes"] / totals["encoded_bytes"]
+                    if totals["encoded_bytes"]
+                    else 0.0,
+                }
+                for (direction, encoding), totals in self._totals.items()
+            }
+
+
+compression_stats = CompressionStats()
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an ``Accept-Encoding`` header, or None."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best = None
+    best_weight = 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def decode_body(encoding: str, body: bytes, max_size: int) -> bytes:
+    """Decompress a request body; ValueError if corrupt or larger than ``max_size``."""
+    if encoding == "gzip":
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            decoded = decoder.decompress(body, max_size + 1)
+        except zlib.error as exc:
+            raise ValueError(f"Invalid gzip body: {exc}") from exc
+        if len(decoded) <= max_size and not decoder.eof:
+            raise ValueError("Truncated gzip body")
+    elif encoding == "zstd" and zstandard is not None:
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)) as reader:
+                decoded = reader.read(max_size + 1)
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"Invalid zstd body: {exc}") from exc
+    else:
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+    if len(decoded) > max_size:
+        raise ValueError(f"Decompressed body exceeds {max_size} bytes")
+    return decoded
+
+
+class _Encoder:
+    """Incremental compressor; ``flush`` keeps the stream decodable so far."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int) -> None:
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        encoded = self._compressor.compress(data)
+        if final:
+            return encoded + self._compressor.flush()
+        return encoded + self._compressor.flush(self._sync_flush)
+
+
+class CompressionMiddleware:
+    """Decode ``Content-Encoding`` request bodies and compress responses.
+
+    Responses are compressed with the best encoding the client accepts
+    (zstd when ``zstandard`` is installed, else gzip). Single-message bodies
+    smaller than ``minimum_size`` are sent as-is; streamed bodies are
+    compressed chunk by chunk and flushed so each chunk is readable on arrival.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        max_request_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.max_request_size = max_request_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if request_encoding and request_encoding != "identity":
+            if request_encoding not in ENCODINGS:
+                response = JSONResponse(
+                    {"detail": f"Unsupported Content-Encoding: {request_encoding}"},
+                    status_code=415,
+                    headers={"Accept-Encoding": ", ".join(ENCODINGS)},
+                )
+                await response(scope, receive, send)
+                return
+            body = await _read_body(receive)
+            start = time.perf_counter()
+            try:
+                decoded = decode_body(request_encoding, body, self.max_request_size)
+            except ValueError as exc:
+                await JSONResponse({"detail": str(exc)}, status_code=400)(scope, receive, send)
+                return
+            compression_stats.record(
+                "request", request_encoding, len(decoded), len(body), time.perf_counter() - start
+            )
+            scope = _decoded_scope(scope, len(decoded))
+            receive = _replay(decoded, receive)
+
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSender(
+            send, _Encoder(encoding, self.gzip_level, self.zstd_level), encoding, self.minimum_size
+        )
+        await self.app(scope, receive, responder)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _decoded_scope(scope: Scope, length: int) -> Scope:
+    headers = [
+        (name, value)
+        for name, value in scope["headers"]
+        if name not in (b"content-encoding", b"content-length")
+    ]
+    headers.append((b"content-length", str(length).encode("latin-1")))
+    return {**scope, "headers": headers}
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            # After the body, pass through so disconnects are still seen.
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+class _CompressingSender:
+    """ASGI ``send`` wrapper deciding per response whether to compress."""
+
+    def __init__(self, send: Send, encoder: _Encoder, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoder = encoder
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.streaming: Optional[bool] = None  # None until the first body message
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.seconds = 0.0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.streaming is False:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.streaming is None:
+            if not self._compressible(body, more_body):
+                self.streaming = False
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            if not more_body:
+                # Whole body in one message: compress it so Content-Length is exact.
+                self.streaming = False
+                encoded = self._encode(body, final=True)
+                self._record()
+                await self.send(self._encoded_start(len(encoded)))
+                await self.send({"type": "http.response.body", "body": encoded})
+                return
+            self.streaming = True
+            await self.send(self._encoded_start(None))
+
+        encoded = self._encode(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": encoded, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    def _compressible(self, body: bytes, more_body: bool) -> bool:
+        headers = Headers(raw=self.start_message["headers"])
+        return (
+            "content-encoding" not in headers
+            and self.start_message["status"] not in (204, 304)
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            and (more_body or len(body) >= self.minimum_size)
+        )
+
+    def _encoded_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return {**self.start_message, "headers": headers.raw}
+
+    def _encode(self, body: bytes, final: bool) -> bytes:
+        start = time.perf_counter()
+        encoded = self.encoder.compress(body, final)
+        self.seconds += time.perf_counter() - start
+        self.raw_bytes += len(body)
+        self.encoded_bytes += len(encoded)
+        return encoded
+
+    def _record(self) -> None:
+        compression_stats.record(
+            "response", self.encoding, self.raw_bytes, self.encoded_bytes, self.seconds
+        )
@@ -0,0 +1,204 @@
+"""Versioned per-campus scheduling datasets, edited with row-level patches."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .instance import SchedulingInstance
+
+
+TABLES = ("rooms", "courses", "doctors", "divisions")
+
+# Columns identifying a row in PATCH requests.
+TABLE_KEYS: Dict[str, List[str]] = {
+    "rooms": ["Room_ID"],
+    "courses": ["Course_ID"],
+    "doctors": ["Instructor_ID", "Day", "Start_Time"],
+    "divisions": ["Num_ID"],
+}
+
+
+class VersionConflict(Exception):
+    """A patch was based on a version that is no longer the latest."""
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """One immutable dataset version and its encoded instance.
+
+    Tables a patch did not touch are the same frame objects as in the
+    previous version, and the instance re-encodes only the changed tables.
+    """
+
+    campus: str
+    version: int
+    tables: Dict[str, pd.DataFrame]
+    instance: SchedulingInstance
+    changes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def rows(self) -> Dict[str, int]:
+        return {name: len(frame) for name, frame in self.tables.items()}
+
+
+class DatasetStore:
+    """In-memory snapshots keyed by campus; the last ``max_versions`` are kept."""
+
+    def __init__(self, max_versions: int = 4) -> None:
+        self.max_versions = max_versions
+        self._campuses: Dict[str, "OrderedDict[int, DatasetSnapshot]"] = {}
+        self._next_version: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def put(self, campus: str, tables: Dict[str, Any]) -> DatasetSnapshot:
+        """Store a full dataset (row lists or column dicts per table) as a new version."""
+        frames = {name: pd.DataFrame(tables.get(name, [])) for name in TABLES}
+        for name, frame in frames.items():
+            duplicates = _duplicate_keys(frame, TABLE_KEYS[name])
+            if duplicates:
+                raise ValueError(f"Duplicate {name} keys: {duplicates[:5]}")
+        instance = SchedulingInstance.from_frames(
+            frames["rooms"], frames["courses"], frames["doctors"], frames["divisions"]
+        )
+        with self._lock:
+            return self._add(campus, frames, instance, {})
+
+    def patch(
+        self,
+        campus: str,
+        changes: Dict[str, Dict[str, Any]],
+        base_version: Optional[int] = None,
+    ) -> DatasetSnapshot:
+        """Apply ``{table: {"upsert": rows, "delete": keys}}`` to the latest version.
+
+        Upserted rows replace the row with the same key in place or are
+        appended; delete keys are tuples for multi-column keys. Raises
+        KeyError for an unknown campus and VersionConflict if
+        ``base_version`` is not the latest version.
+        """
+        with self._lock:
+            versions = self._campuses.get(campus)
+            if not versions:
+                raise KeyError(campus)
+            latest = next(reversed(versions.values()))
+            if base_version is not None and base_version != latest.version:
+                raise VersionConflict(
+                    f"Dataset {campus} is at version {latest.version}, not {base_version}"
+                )
+
+            frames = dict(latest.tables)
+            counts: Dict[str, Dict[str, int]] = {}
+            for name, change in changes.items():
+                upserts = change.get("upsert") or []
+                deletes = change.get("delete") or []
+                if not upserts and not deletes:
+                    continue
+                frames[name], counts[name] = _apply_changes(
+                    frames[name], TABLE_KEYS[name], upserts, deletes
+                )
+
+            instance = latest.instance.with_tables(
+                frames["rooms"],
+                frames["courses"],
+                frames["doctors"],
+                frames["divisions"],
+                changed=counts.keys(),
+            )
+            return self._add(campus, frames, instance, counts)
+
+    def get(self, campus: str, version: Optional[int] = None) -> Optional[DatasetSnapshot]:
+        """The given version (latest when None), or None if unknown or evicted."""
+        with self._lock:
+            versions = self._campuses.get(campus)
+            if not versions:
+                return None
+            if version is None:
+                return next(reversed(versions.values()))
+            return versions.get(version)
+
+    def versions(self, campus: str) -> List[int]:
+        with self._lock:
+            return list(self._campuses.get(campus, {}))
+
+    def _add(
+        self,
+        campus: str,
+        frames: Dict[str, pd.DataFrame],
+        instance: SchedulingInstance,
+        counts: Dict[str, Dict[str, int]],
+    ) -> DatasetSnapshot:
+        version = self._next_version.get(campus, 1)
+        self._next_version[campus] = version + 1
+        snapshot = DatasetSnapshot(campus, version, frames, instance, counts)
+        versions = self._campuses.setdefault(campus, OrderedDict())
+        versions[version] = snapshot
+        while len(versions) > self.max_versions:
+            versions.popitem(last=False)
+        return snapshot
+
+
+def _key_index(frame: pd.DataFrame, key: Sequence[str]) -> pd.MultiIndex:
+    if len(frame) == 0 or any(column not in frame.columns for column in key):
+        return pd.MultiIndex.from_tuples([], names=list(key))
+    return pd.MultiIndex.from_frame(frame[list(key)])
+
+
+def _duplicate_keys(frame: pd.DataFrame, key: Sequence[str]) -> List[Tuple[Any, ...]]:
+    index = _key_index(frame, key)
+    return list(index[index.duplicated()].unique())
+
+
+def _apply_changes(
+    frame: pd.DataFrame,
+    key: Sequence[str],
+    upsert_rows: List[Dict[str, Any]],
+    delete_keys: List[Any],
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """New frame with rows replaced in place, appended or removed, plus counts."""
+    upserts = pd.DataFrame(upsert_rows)
+    delete_keys = [k if isinstance(k, tuple) else (k,) for k in delete_keys]
+
+    index = _key_index(frame, key)
+    upsert_index = _key_index(upserts, key)
+    if upsert_index.has_duplicates:
+        duplicates = list(upsert_index[upsert_index.duplicated()])
+        raise ValueError(f"Duplicate upsert keys: {duplicates[:5]}")
+    if len(upsert_index) and upsert_index.isin(delete_keys).any():
+        raise ValueError("A row cannot be upserted and deleted in the same patch")
+
+    positions = index.get_indexer(upsert_index) if len(upserts) else np.zeros(0, dtype=np.intp)
+    replaced = np.zeros(len(frame), dtype=bool)
+    replaced[positions[positions >= 0]] = True
+    deleted = index.isin(delete_keys) if delete_keys else np.zeros(len(frame), dtype=bool)
+
+    kept = ~(replaced | deleted)
+    inserted = positions < 0
+    # Replaced rows keep their position, new rows go to the end.
+    order = np.concatenate(
+        [
+            np.flatnonzero(kept),
+            np.where(inserted, len(frame) + np.cumsum(inserted) - 1, positions),
+        ]
+    )
+    parts = [part for part in (frame[kept], upserts) if len(part)]
+    if not parts:
+        return frame.iloc[0:0], _change_counts(inserted, deleted)
+    result = pd.concat(parts, ignore_index=True)
+    result = result.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+    return result, _change_counts(inserted, deleted)
+
+
+def _change_counts(inserted: np.ndarray, deleted: np.ndarray) -> Dict[str, int]:
+    return {
+        "inserted": int(inserted.sum()),
+        "updated": int((~inserted).sum()),
+        "deleted": int(deleted.sum()),
+    }
+
+
+dataset_store = DatasetStore()
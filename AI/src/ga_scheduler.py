@@ -0,0 +1,553 @@
+"""Genetic algorithm scheduler on NumPy arrays (Final GA notebook).
+
+A population is three ``(individuals, meetings)`` integer arrays: the day,
+room code and start slot of every meeting of every ``divisions`` pair.
+Genes are only drawn from each meeting's domain (rooms that fit, the
+instructor's days, starts inside that day's hours), so fitness counts what
+the CP model states as NoOverlap, AllDifferent and the per-year day limit:
+
+- room: meetings overlapping an earlier one in the same room
+- instructor: the same, per instructor
+- division: the same, per division timeline
+- day: meetings of one pair on a day the pair already uses
+- year_days: active days per year above ``max_days_per_year``
+
+Each kind is one sort-and-sweep over the whole population. Islands evolve
+on their own, in worker processes when there is more than one, and pass
+their best individual on every ``MIGRATION_INTERVAL`` generations.
+"""
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .instance import SchedulingInstance
+from .scheduler import SchedulingCP
+from .solver_log import SolverLog
+
+# Generations an island runs between migrations; also the progress log interval.
+MIGRATION_INTERVAL = 20
+
+# Meetings without a conflict move at this fraction of ``mutation_rate``.
+BACKGROUND_MUTATION = 0.01
+
+VIOLATION_KINDS = ("room", "instructor", "division", "day", "year_days")
+
+# (days, rooms, starts), each (individuals, meetings)
+Population = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass
+class GAProblem:
+    """Gene domains and resources of every meeting as plain arrays.
+
+    Per-pair tables are padded; ``*_count`` holds the valid length of each row.
+    """
+
+    pair: np.ndarray
+    rank: np.ndarray
+    length: np.ndarray
+    instructor: np.ndarray
+    group: np.ndarray
+    year: np.ndarray
+    day_options: np.ndarray
+    day_count: np.ndarray
+    room_options: np.ndarray
+    room_count: np.ndarray
+    start_options: np.ndarray
+    start_count: np.ndarray
+    rooms: int
+    instructors: int
+    groups: int
+    years: int
+    days: int
+    stride: int
+
+    @property
+    def meetings(self) -> int:
+        return len(self.pair)
+
+
+@dataclass
+class GASettings:
+    population_size: int = 100
+    mutation_rate: float = 0.1
+    crossover_rate: float = 0.8
+    tournament_size: int = 3
+    elite_count: int = 1
+
+
+def random_population(problem: GAProblem, size: int, rng: np.random.Generator) -> Population:
+    """``size`` individuals; the meetings of a pair get distinct days where the domain allows."""
+    width = problem.day_options.shape[1]
+    keys = rng.random((size, len(problem.day_count), width))
+    keys[:, np.arange(width) >= problem.day_count[:, None]] = 2.0
+    position = keys.argsort(axis=2)[:, problem.pair, problem.rank % width]
+    position %= problem.day_count[problem.pair]
+    days = problem.day_options[problem.pair, position]
+    rooms = _pick(problem.room_options[problem.pair], problem.room_count[problem.pair], rng, size)
+    return days, rooms, _pick_starts(problem, days, rng)
+
+
+def _pick(
+    options: np.ndarray, counts: np.ndarray, rng: np.random.Generator, size: int
+) -> np.ndarray:
+    """A random valid entry of each meeting's padded ``options`` row, per individual."""
+    idx = (rng.random((size, len(counts))) * counts).astype(np.int64)
+    return np.take_along_axis(options[None], idx[..., None], axis=2)[..., 0]
+
+
+def _pick_starts(problem: GAProblem, days: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    counts = problem.start_count[problem.pair, days]
+    idx = (rng.random(days.shape) * counts).astype(np.int64)
+    return problem.start_options[problem.pair, days, idx]
+
+
+def violations_by_kind(
+    problem: GAProblem, population: Population, max_days_per_year: int
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Per-individual counts for each of ``VIOLATION_KINDS``, and a conflict flag per meeting."""
+    days, rooms, starts = population
+    size = len(days)
+    timeline = days * problem.stride + starts
+    span = problem.days * problem.stride
+    individual = np.arange(size)[:, None]
+
+    counts = {}
+    flags = np.zeros(days.shape, dtype=bool)
+    for kind, resource, resources in (
+        ("room", rooms, problem.rooms),
+        ("instructor", problem.instructor, problem.instructors),
+        ("division", problem.group, problem.groups),
+    ):
+        clash, involved = _overlaps(
+            individual * resources + resource, timeline, problem.length, span
+        )
+        counts[kind] = clash.sum(axis=1)
+        flags |= involved
+
+    repeated = _repeats((individual * len(problem.day_count) + problem.pair) * problem.days + days)
+    counts["day"] = repeated.sum(axis=1)
+    flags |= repeated
+
+    # Days a year is on campus; meetings on its least busy days are the ones to move.
+    cell = ((individual * problem.years + problem.year) * problem.days + days).ravel()
+    per_cell = np.bincount(cell, minlength=size * problem.years * problem.days)
+    active = (per_cell > 0).reshape(size, problem.years, problem.days).sum(axis=2)
+    excess = np.maximum(active - max_days_per_year, 0)
+    counts["year_days"] = excess.sum(axis=1)
+    over = (excess > 0)[individual, problem.year]
+    average = per_cell.reshape(size, problem.years, -1).sum(axis=2) / np.maximum(active, 1)
+    flags |= over & (per_cell[cell].reshape(days.shape) <= average[individual, problem.year])
+    return counts, flags
+
+
+def evaluate(
+    problem: GAProblem, population: Population, max_days_per_year: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Total violations per individual and the per-meeting conflict flags."""
+    counts, flags = violations_by_kind(problem, population, max_days_per_year)
+    return sum(counts.values()), flags
+
+
+def _overlaps(
+    timeline_id: np.ndarray, start: np.ndarray, length: np.ndarray, span: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Meetings starting before an earlier one on the same timeline has ended.
+
+    Timelines are laid end to end ``span`` apart, so one running maximum of
+    end times sweeps all of them without crossing from one to the next. The
+    second array also flags the meeting just before each clash, usually the
+    one it clashes with.
+    """
+    begin = (timeline_id * span + start).ravel()
+    order = np.argsort(begin)
+    begin = begin[order]
+    reach = np.maximum.accumulate(begin + np.broadcast_to(length, start.shape).ravel()[order])
+    late = np.concatenate(([False], reach[:-1] > begin[1:]))
+    clash = np.empty(len(order), dtype=bool)
+    clash[order] = late
+    involved = np.empty(len(order), dtype=bool)
+    involved[order] = late | np.append(late[1:], False)
+    return clash.reshape(start.shape), involved.reshape(start.shape)
+
+
+def _repeats(keys: np.ndarray) -> np.ndarray:
+    """Entries equal to an earlier entry."""
+    flat = keys.ravel()
+    order = np.argsort(flat)
+    repeat = np.empty(len(order), dtype=bool)
+    repeat[order] = np.concatenate(([False], flat[order][1:] == flat[order][:-1]))
+    return repeat.reshape(keys.shape)
+
+
+def evolve(
+    problem: GAProblem,
+    settings: GASettings,
+    population: Population,
+    max_days_per_year: int,
+    generations: int,
+    seconds: float,
+    seed: Any,
+) -> Tuple[Population, np.ndarray, int]:
+    """Run up to ``generations`` generations within ``seconds``; stops at zero violations.
+
+    Returns the population sorted best first, its violations and the
+    generations run.
+    """
+    deadline = time.perf_counter() + seconds
+    rng = np.random.default_rng(seed)
+    violations, flags = evaluate(problem, population, max_days_per_year)
+    done = 0
+    while done < generations and violations.min() > 0 and time.perf_counter() < deadline:
+        population = _next_generation(problem, settings, population, violations, flags, rng)
+        violations, flags = evaluate(problem, population, max_days_per_year)
+        done += 1
+    order = np.argsort(violations, kind="stable")
+    return tuple(genes[order] for genes in population), violations[order], done
+
+
+def _next_generation(
+    problem: GAProblem,
+    settings: GASettings,
+    population: Population,
+    violations: np.ndarray,
+    flags: np.ndarray,
+    rng: np.random.Generator,
+) -> Population:
+    """Elites, then tournament selection, per-pair crossover and mutation."""
+    size, meetings = flags.shape
+    elite = np.argsort(violations, kind="stable")[: settings.elite_count]
+    children = size - len(elite)
+
+    contenders = rng.integers(size, size=(2, children, settings.tournament_size))
+    winner = violations[contenders].argmin(axis=2)
+    first, second = np.take_along_axis(contenders, winner[..., None], axis=2)[..., 0]
+
+    # Uniform crossover over whole pairs, so a pair's meetings move together.
+    crossed = rng.random(children) < settings.crossover_rate
+    take = (rng.random((children, len(problem.day_count))) < 0.5) & crossed[:, None]
+    parent = np.where(take[:, problem.pair], second[:, None], first[:, None])
+    meeting = np.arange(meetings)
+    days, rooms, starts = (genes[parent, meeting] for genes in population)
+
+    # Conflicting meetings move at mutation_rate, the rest much less often;
+    # a move changes the room, the start, or the day and start.
+    rate = settings.mutation_rate * np.where(flags[parent, meeting], 1.0, BACKGROUND_MUTATION)
+    moved = rng.random(days.shape) < rate
+    change = rng.integers(3, size=days.shape)
+    pair = problem.pair
+    new_rooms = _pick(problem.room_options[pair], problem.room_count[pair], rng, children)
+    rooms = np.where(moved & (change == 0), new_rooms, rooms)
+    new_days = _pick(problem.day_options[pair], problem.day_count[pair], rng, children)
+    days = np.where(moved & (change == 2), new_days, days)
+    starts = np.where(moved & (change > 0), _pick_starts(problem, days, rng), starts)
+
+    return tuple(
+        np.concatenate((genes[elite], child))
+        for genes, child in zip(population, (days, rooms, starts))
+    )
+
+
+# Set in each worker process by the pool initializer, so the problem is sent once.
+_worker_problem: Optional[GAProblem] = None
+
+
+def _set_worker_problem(problem: GAProblem) -> None:
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _evolve_in_worker(*args: Any) -> Tuple[Population, np.ndarray, int]:
+    return evolve(_worker_problem, *args)
+
+
+class SchedulingGA(SchedulingCP):
+    """Genetic algorithm over the lecture pairs of ``SchedulingCP``.
+
+    Data preparation, room suitability, the time grid and the output
+    format are the CP scheduler's; only the search differs. ``solve``
+    returns a schedule only when it has no violations; a failed attempt
+    passes its populations on to the next ``max_days_per_year``, as an
+    infeasible CP attempt relaxes the limit.
+    """
+
+    def __init__(
+        self,
+        instance: SchedulingInstance,
+        population_size: int = 100,
+        generations: int = 1000,
+        mutation_rate: float = 0.1,
+        crossover_rate: float = 0.8,
+        tournament_size: int = 3,
+        elite_count: int = 1,
+        islands: int = 1,
+        seed: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        self.settings = GASettings(
+            population_size=population_size,
+            mutation_rate=mutation_rate,
+            crossover_rate=crossover_rate,
+            tournament_size=tournament_size,
+            elite_count=elite_count,
+        )
+        self.generations = generations
+        self.islands = islands
+        self.seed = seed
+        super().__init__(instance, **kwargs)
+
+    def build_problem(self) -> GAProblem:
+        """Gene domains of every meeting, following ``build_model``'s constraints."""
+        inst = self.instance
+        self.day_stride = len(self.time_slots)
+        required = np.array([int(p["required_days"]) for p in self.divisions], dtype=np.int64)
+        pair = np.repeat(np.arange(len(self.divisions)), required)
+        rank = np.arange(len(pair)) - np.repeat(np.cumsum(required) - required, required)
+
+        starts_by_duration: Dict[int, List[List[int]]] = {}
+        day_lists, room_lists, start_lists = [], [], []
+        for pair_info in self.divisions:
+            duration = int(pair_info["duration_minutes"])
+            if duration not in starts_by_duration:
+                starts_by_duration[duration] = [
+                    self.time_grid.allowed_start_indices(day, duration) for day in self.days
+                ]
+            starts_by_day = starts_by_duration[duration]
+            start_lists.append(starts_by_day)
+
+            day_indices = list(inst.instructor_days.get(pair_info["instructor_code"], []))
+            if len(day_indices) < int(pair_info["required_days"]):
+                day_indices = list(range(len(self.days)))
+            day_lists.append([day for day in day_indices if starts_by_day[day]])
+
+            suitable_rooms, fallback_capacity = self._suitable_rooms(pair_info)
+            if fallback_capacity is not None:
+                print(
+                    f"Warning: No room fits "
+                    f"{int(inst.division_students[pair_info['div_idx']]) // 2} students for "
+                    f"{pair_info['course_id']}/{pair_info['div_id']}. "
+                    f"Using largest capacity {fallback_capacity}."
+                )
+            room_lists.append(suitable_rooms)
+
+        day_options, day_count = _padded(day_lists)
+        room_options, room_count = _padded(room_lists)
+        start_width = max((len(s) for by_day in start_lists for s in by_day), default=1)
+        start_options = np.zeros((len(start_lists), len(self.days), start_width), dtype=np.int64)
+        start_count = np.zeros((len(start_lists), len(self.days)), dtype=np.int64)
+        for pair_idx, starts_by_day in enumerate(start_lists):
+            for day_idx, starts in enumerate(starts_by_day):
+                start_options[pair_idx, day_idx, : len(starts)] = starts
+                start_count[pair_idx, day_idx] = len(starts)
+
+        instructor = np.array([p["instructor_code"] for p in self.divisions], dtype=np.int64)
+        _, group = np.unique([p["group_key"] for p in self.divisions], return_inverse=True)
+        _, year = np.unique([p["year"] for p in self.divisions], return_inverse=True)
+        slots = [self.time_grid.slots_for(int(p["duration_minutes"])) for p in self.divisions]
+        return GAProblem(
+            pair=pair,
+            rank=rank,
+            length=np.array(slots, dtype=np.int64)[pair],
+            instructor=instructor[pair],
+            group=group.astype(np.int64)[pair],
+            year=year.astype(np.int64)[pair],
+            day_options=day_options,
+            day_count=day_count,
+            room_options=room_options,
+            room_count=room_count,
+            start_options=start_options,
+            start_count=start_count,
+            rooms=len(self.all_rooms),
+            instructors=int(instructor.max(initial=0)) + 1,
+            groups=int(group.max(initial=0)) + 1,
+            years=int(year.max(initial=0)) + 1,
+            days=len(self.days),
+            stride=self.day_stride,
+        )
+
+    def estimate_size(self) -> Dict[str, int]:
+        """Genes per individual as variables; timelines, pairs and years as constraints."""
+        meetings = sum(int(p["required_days"]) for p in self.divisions)
+        rooms = {room for p in self.divisions for room in self._suitable_rooms(p)[0]}
+        constraints = (
+            len(rooms)
+            + len({p["instructor_id"] for p in self.divisions})
+            + len({p["group_key"] for p in self.divisions})
+            + len(self.divisions)
+            + len({p["year"] for p in self.divisions})
+        )
+        return {"variables": 3 * meetings, "constraints": constraints, "meetings": meetings}
+
+    def solve(self) -> Optional[List[Dict[str, Any]]]:
+        """Evolve until an individual has no violations; None if none does in time."""
+        self.solve_stats = {
+            "attempts": 0,
+            "solve_seconds": 0.0,
+            "first_solution_seconds": None,
+            "variables": 0,
+            "constraints": 0,
+        }
+        self.solver_attempts = []
+        self.solver_log = SolverLog(self.solver_log_lines if self.capture_solver_log else 0)
+        with self.timings.span("build_model"):
+            problem = self.build_problem()
+        size = self.estimate_size()
+        self.solve_stats["variables"] = size["variables"]
+        self.solve_stats["constraints"] = size["constraints"]
+
+        if not problem.meetings or not (problem.room_count.all() and problem.day_count.all()):
+            # Nothing to place, or a pair without any room of its type or usable day.
+            self.last_solver_status = "FEASIBLE" if not problem.meetings else "INFEASIBLE"
+            return [] if not problem.meetings else None
+
+        populations: Optional[List[Population]] = None
+        with self._workers(problem) as pool:
+            for limit in self.relaxation_limits():
+                self.max_days_per_year = limit
+                self.solver_log.start_attempt(f"max_days_per_year={limit}")
+                started = time.perf_counter()
+                with self.timings.span("search"):
+                    populations, violations, generations = self._search(
+                        problem, populations, limit, pool
+                    )
+                wall_seconds = time.perf_counter() - started
+
+                island = int(np.argmin([values[0] for values in violations]))
+                best = tuple(genes[:1] for genes in populations[island])
+                counts = {
+                    kind: int(values[0])
+                    for kind, values in violations_by_kind(problem, best, limit)[0].items()
+                }
+                solved = not any(counts.values())
+                self.last_solver_status = "FEASIBLE" if solved else "UNKNOWN"
+                self.solver_attempts.append(
+                    {
+                        "max_days_per_year": limit,
+                        "status": self.last_solver_status,
+                        "wall_seconds": wall_seconds,
+                        "generations": generations,
+                        "evaluations": generations * self.settings.population_size * self.islands,
+                        "population_size": self.settings.population_size,
+                        "islands": self.islands,
+                        "best_violations": sum(counts.values()),
+                        "violations": counts,
+                    }
+                )
+
+                stats = self.solve_stats
+                stats["attempts"] += 1
+                stats["solve_seconds"] += wall_seconds
+                if solved:
+                    stats["first_solution_seconds"] = stats["solve_seconds"]
+                    return self._assignments(problem, best)
+
+        return None
+
+    def _workers(self, problem: GAProblem) -> ContextManager[Optional[Executor]]:
+        """A process per island (up to the CPU count); in-process for a single worker."""
+        workers = min(self.islands, os.cpu_count() or 1)
+        if workers <= 1:
+            return nullcontext(None)
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_set_worker_problem,
+            initargs=(problem,),
+        )
+
+    def _search(
+        self,
+        problem: GAProblem,
+        populations: Optional[List[Population]],
+        max_days_per_year: int,
+        pool: Optional[Executor],
+    ) -> Tuple[List[Population], List[np.ndarray], int]:
+        """Evolve every island within the time limit, migrating between epochs.
+
+        ``populations`` from an earlier attempt are evolved further. Returns
+        the populations sorted best first, their violations and the
+        generations run.
+        """
+        deadline = time.perf_counter() + self.time_limit_seconds
+        seeds = np.random.SeedSequence([self.seed, max_days_per_year])
+        if populations is None:
+            populations = [
+                random_population(problem, self.settings.population_size, np.random.default_rng(s))
+                for s in seeds.spawn(self.islands)
+            ]
+        violations = [evaluate(problem, p, max_days_per_year)[0] for p in populations]
+
+        generations = 0
+        while min(int(values.min()) for values in violations) > 0:
+            remaining = deadline - time.perf_counter()
+            epoch = min(MIGRATION_INTERVAL, self.generations - generations)
+            if epoch <= 0 or remaining <= 0:
+                break
+            tasks = [
+                (self.settings, population, max_days_per_year, epoch, remaining, seed)
+                for population, seed in zip(populations, seeds.spawn(len(populations)))
+            ]
+            if pool is None:
+                results = [evolve(problem, *task) for task in tasks]
+            else:
+                futures = [pool.submit(_evolve_in_worker, *task) for task in tasks]
+                results = [future.result() for future in futures]
+            populations = [population for population, _, _ in results]
+            violations = [values for _, values, _ in results]
+            generations += max(done for _, _, done in results)
+            best = min(int(values[0]) for values in violations)
+            self.solver_log.write(
+                f"generation {generations}: best {best} violations, "
+                f"mean {np.mean([values.mean() for values in violations]):.1f}"
+            )
+
+            # Ring migration: each island's best replaces the next island's worst.
+            if len(populations) > 1:
+                for idx in range(len(populations)):
+                    source = populations[idx - 1]
+                    for genes, incoming in zip(populations[idx], source):
+                        genes[-1] = incoming[0]
+                    violations[idx][-1] = violations[idx - 1][0]
+
+        return populations, violations, generations
+
+    def _assignments(self, problem: GAProblem, individual: Population) -> List[Dict[str, Any]]:
+        """Raw assignments of one individual, in the CP solution collector's format."""
+        days, rooms, starts = (genes[0] for genes in individual)
+        schedule = []
+        for meeting, pair_idx in enumerate(problem.pair):
+            pair_info = self.divisions[pair_idx]
+            day = self.days[days[meeting]]
+            start_time = self.time_slots[starts[meeting]]
+            duration_minutes = int(pair_info["duration_minutes"])
+            end_time = start_time + duration_minutes
+            schedule.append(
+                {
+                    "Day": day,
+                    "Course_ID": pair_info["course_id"],
+                    "Instructor_ID": pair_info["instructor_id"],
+                    "Group_ID": pair_info["div_id"],
+                    "Room_ID": self.all_rooms[rooms[meeting]],
+                    "Time_Slot": f"{day}_{start_time}_{end_time}",
+                    "Start_Time": start_time,
+                    "End_Time": end_time,
+                    "Duration": duration_minutes,
+                }
+            )
+        return schedule
+
+
+def _padded(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Rows of different lengths as a zero-padded table and the row lengths."""
+    counts = np.array([len(row) for row in rows], dtype=np.int64)
+    table = np.zeros((len(rows), max(int(counts.max(initial=0)), 1)), dtype=np.int64)
+    for idx, row in enumerate(rows):
+        table[idx, : len(row)] = row
+    return table, counts
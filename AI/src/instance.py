@@ -0,0 +1,221 @@
+"""Integer-coded scheduling input shared by the lecture engines and formatters."""
+
+from dataclasses import dataclass, replace
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import times_to_minutes
+
+
+DEFAULT_DAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Saturday")
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulingInstance:
+    """Rooms, courses, instructors, divisions and days as parallel tables.
+
+    Entities are referred to by their row index ("code") in these tables;
+    string tables are kept only for output. Numeric columns are NumPy arrays.
+    Built once per request and never mutated, so engines can share it.
+    """
+
+    days: Tuple[str, ...]
+
+    room_ids: Tuple[Any, ...]
+    room_names: Tuple[Any, ...]
+    room_types: Tuple[str, ...]
+    room_capacity: np.ndarray
+
+    # Instructors without a Doctors row have name None.
+    instructor_ids: Tuple[Any, ...]
+    instructor_names: Tuple[Optional[str], ...]
+
+    course_ids: Tuple[Any, ...]
+    course_names: Tuple[Any, ...]
+    course_departments: Tuple[Any, ...]
+    course_majors: Tuple[Any, ...]
+    course_types: Tuple[Any, ...]
+    course_instructor: np.ndarray
+    course_days: np.ndarray
+    course_hours: np.ndarray
+    course_year: np.ndarray
+
+    division_ids: Tuple[Any, ...]
+    division_departments: Tuple[Any, ...]
+    division_majors: Tuple[Any, ...]
+    division_year: np.ndarray
+    division_students: np.ndarray
+
+    # One entry per Doctors row: instructor code, day code, start/end minutes.
+    availability_instructor: np.ndarray
+    availability_day: np.ndarray
+    availability_start: np.ndarray
+    availability_end: np.ndarray
+    # Instructor code -> day codes with availability, in first-seen order.
+    instructor_days: Dict[int, List[int]]
+
+    room_index: Dict[Any, int]
+    course_index: Dict[Any, int]
+    division_index: Dict[Any, int]
+
+    @classmethod
+    def from_frames(
+        cls,
+        rooms: pd.DataFrame,
+        courses: pd.DataFrame,
+        doctors: pd.DataFrame,
+        divisions: pd.DataFrame,
+    ) -> "SchedulingInstance":
+        """Encode the Data.xlsx sheets (or their JSON equivalents)."""
+        return cls(
+            **_encode_rooms(rooms),
+            **_encode_courses(courses, doctors),
+            **_encode_divisions(divisions),
+        )
+
+    def with_tables(
+        self,
+        rooms: pd.DataFrame,
+        courses: pd.DataFrame,
+        doctors: pd.DataFrame,
+        divisions: pd.DataFrame,
+        changed: Collection[str],
+    ) -> "SchedulingInstance":
+        """Instance for edited tables, re-encoding only the ``changed`` ones.
+
+        Fields of unchanged tables are shared with ``self``. Courses and
+        doctors are encoded together because both define instructor codes.
+        """
+        fields: Dict[str, Any] = {}
+        if "rooms" in changed:
+            fields.update(_encode_rooms(rooms))
+        if "courses" in changed or "doctors" in changed:
+            fields.update(_encode_courses(courses, doctors))
+        if "divisions" in changed:
+            fields.update(_encode_divisions(divisions))
+        return replace(self, **fields) if fields else self
+
+    @property
+    def num_courses(self) -> int:
+        return len(self.course_ids)
+
+    @property
+    def num_rooms(self) -> int:
+        return len(self.room_ids)
+
+    def instructor_name(self, code: int) -> str:
+        """Display name, or ``Unknown (<id>)`` for instructors without a Doctors row."""
+        name = self.instructor_names[code]
+        return name if name is not None else f"Unknown ({self.instructor_ids[code]})"
+
+    def rooms_of_type(self, room_type: str) -> List[int]:
+        return [idx for idx, value in enumerate(self.room_types) if value == room_type]
+
+
+def _encode_rooms(rooms: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "room_ids": tuple(_column(rooms, "Room_ID")),
+        "room_names": tuple(_column(rooms, "Room")),
+        "room_types": tuple(_column(rooms, "Type")),
+        "room_capacity": _int_array(rooms, "Capacity"),
+        "room_index": _first_index(_column(rooms, "Room_ID")),
+    }
+
+
+def _encode_courses(courses: pd.DataFrame, doctors: pd.DataFrame) -> Dict[str, Any]:
+    """Days, instructors, availability and courses (which reference instructors)."""
+    if len(doctors) > 0 and "Day" in doctors.columns:
+        days = tuple(pd.unique(doctors["Day"]).tolist())
+    else:
+        days = DEFAULT_DAYS
+
+    instructor_index: Dict[Any, int] = {}
+    instructor_ids: List[Any] = []
+    instructor_names: List[Optional[str]] = []
+    instructor_days: Dict[int, List[int]] = {}
+    availability_instructor: List[int] = []
+    availability_day: List[int] = []
+    if len(doctors) > 0:
+        day_index = {day: idx for idx, day in enumerate(days)}
+        for inst_id, name, day in zip(
+            doctors["Instructor_ID"].tolist(),
+            _column(doctors, "Instructor_Name"),
+            doctors["Day"].tolist(),
+        ):
+            code = instructor_index.get(inst_id)
+            if code is None:
+                code = instructor_index[inst_id] = len(instructor_ids)
+                instructor_ids.append(inst_id)
+                instructor_names.append(name)
+                instructor_days[code] = []
+            day_code = day_index.get(day, -1)
+            if day_code >= 0 and day_code not in instructor_days[code]:
+                instructor_days[code].append(day_code)
+            availability_instructor.append(code)
+            availability_day.append(day_code)
+        availability_start = times_to_minutes(doctors["Start_Time"])
+        availability_end = times_to_minutes(doctors["End_Time"])
+    else:
+        availability_start = availability_end = np.zeros(0, dtype=np.int64)
+
+    course_instructor = []
+    for inst_id in _column(courses, "Instructor_ID"):
+        code = instructor_index.get(inst_id)
+        if code is None:
+            code = instructor_index[inst_id] = len(instructor_ids)
+            instructor_ids.append(inst_id)
+            instructor_names.append(None)
+        course_instructor.append(code)
+
+    return {
+        "days": days,
+        "instructor_ids": tuple(instructor_ids),
+        "instructor_names": tuple(instructor_names),
+        "course_ids": tuple(_column(courses, "Course_ID")),
+        "course_names": tuple(_column(courses, "Course_Name")),
+        "course_departments": tuple(_column(courses, "Department")),
+        "course_majors": tuple(_column(courses, "Major")),
+        "course_types": tuple(_column(courses, "Type")),
+        "course_instructor": np.asarray(course_instructor, dtype=np.int32),
+        "course_days": _int_array(courses, "Days"),
+        "course_hours": _int_array(courses, "Hours_per_day"),
+        "course_year": _int_array(courses, "Year"),
+        "availability_instructor": np.asarray(availability_instructor, dtype=np.int32),
+        "availability_day": np.asarray(availability_day, dtype=np.int32),
+        "availability_start": availability_start,
+        "availability_end": availability_end,
+        "instructor_days": instructor_days,
+        "course_index": _first_index(_column(courses, "Course_ID")),
+    }
+
+
+def _encode_divisions(divisions: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "division_ids": tuple(_column(divisions, "Num_ID")),
+        "division_departments": tuple(_column(divisions, "Department")),
+        "division_majors": tuple(_column(divisions, "Major")),
+        "division_year": _int_array(divisions, "Year"),
+        "division_students": _int_array(divisions, "StudentNum"),
+        "division_index": _first_index(_column(divisions, "Num_ID")),
+    }
+
+
+def _column(frame: pd.DataFrame, column: str) -> List[Any]:
+    if column not in frame.columns:
+        return [None] * len(frame)
+    return frame[column].tolist()
+
+
+def _int_array(frame: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in frame.columns:
+        return np.zeros(len(frame), dtype=np.int64)
+    return frame[column].fillna(0).to_numpy(dtype=np.int64)
+
+
+def _first_index(values: Sequence[Any]) -> Dict[Any, int]:
+    index: Dict[Any, int] = {}
+    for idx, value in enumerate(values):
+        index.setdefault(value, idx)
+    return index
@@ -0,0 +1,214 @@
+"""Single CP-SAT model placing lectures and sections together."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from .instance import SchedulingInstance
+from .scheduler import SchedulingCP
+from .section_scheduler import SectionScheduler
+
+
+class JointScheduler(SchedulingCP):
+    """Lectures as mandatory intervals, sections as optional lower-priority ones.
+
+    Sections share the lecture model's room, instructor and division
+    timelines, and the objective maximises the number of placed sections.
+    A division's lectures block every section of its major; sections of
+    different student groups may still run side by side.
+    """
+
+    def __init__(
+        self,
+        instance: SchedulingInstance,
+        section_scheduler: SectionScheduler,
+        **kwargs: Any,
+    ) -> None:
+        self.section_scheduler = section_scheduler
+        self.section_demands: List[Dict[str, Any]] = []
+        self.section_room_indices: List[List[int]] = []
+        self.section_vars: List[Optional[Dict[str, Any]]] = []
+        super().__init__(instance, **kwargs)
+
+    def prepare_data(self) -> None:
+        super().prepare_data()
+
+        self.section_demands, candidate_rooms = self.section_scheduler.prepare_sections(
+            self.course_catalog()
+        )
+        room_index_by_name = {
+            str(name).strip(): idx for idx, name in enumerate(self.instance.room_names)
+        }
+        self.section_room_indices = [
+            [room_index_by_name[name] for name in names if name in room_index_by_name]
+            for names in candidate_rooms
+        ]
+
+    def course_catalog(self) -> pd.DataFrame:
+        """Course_Name -> Instructor_Name / Major, as the CP output would give."""
+        inst = self.instance
+        return pd.DataFrame(
+            {
+                "Course_Name": inst.course_names,
+                "Instructor_Name": [
+                    inst.instructor_names[code] or "" for code in inst.course_instructor
+                ],
+                "Major": inst.course_majors,
+            }
+        )
+
+    def estimate_size(self) -> Dict[str, int]:
+        """Lecture model size plus each section's variables and constraints.
+
+        Sections add one cumulative per division of a major with sections.
+        """
+        size = super().estimate_size()
+        if not any(self.time_grid.section_blocks(day) for day in self.days):
+            return size
+
+        inst = self.instance
+        divisions_by_major: Dict[str, set] = {}
+        for pair_info in self.divisions:
+            major = str(inst.course_majors[pair_info["course_idx"]]).strip()
+            divisions_by_major.setdefault(major, set()).add(pair_info["group_key"])
+
+        majors_with_sections = set()
+        resources: Dict[str, int] = {}
+        for demand, room_indices in zip(self.section_demands, self.section_room_indices):
+            if not room_indices:
+                continue
+            num_rooms = len(room_indices)
+            # placed, day, time, room, start + in-room booleans
+            size["variables"] += 5 + num_rooms
+            # table, start link, interval, room sum, per-room link and interval
+            size["constraints"] += 4 + 2 * num_rooms
+            majors_with_sections.add(demand["division_name"])
+            for key in (
+                f"assistant:{demand['assistant']}",
+                f"section:{demand['student_group_id']}",
+            ):
+                resources[key] = resources.get(key, 0) + 1
+        # One NoOverlap per section timeline with more than one interval.
+        size["constraints"] += sum(1 for count in resources.values() if count > 1)
+        size["constraints"] += sum(
+            len(divisions_by_major.get(major, ())) for major in majors_with_sections
+        )
+        size["sections"] = len(self.section_demands)
+        return size
+
+    def _add_constraints(self, model: cp_model.CpModel) -> None:
+        super()._add_constraints(model)
+
+        inst = self.instance
+        # (major, division key) -> lecture intervals; the lecture model keeps
+        # each division's lectures disjoint.
+        lectures_by_division: Dict[Tuple[str, str], List] = {}
+        for pair_idx, assignments in self.assignment_vars.items():
+            pair_info = self.divisions[pair_idx]
+            major = str(inst.course_majors[pair_info["course_idx"]]).strip()
+            lectures_by_division.setdefault((major, pair_info["group_key"]), []).extend(
+                assignment["interval"] for assignment in assignments.values()
+            )
+        sections_by_major: Dict[str, List] = {}
+
+        instructor_ids_by_name: Dict[str, List[Any]] = {}
+        for inst_id, name in zip(inst.instructor_ids, inst.instructor_names):
+            if name is not None:
+                instructor_ids_by_name.setdefault(str(name).strip(), []).append(inst_id)
+
+        duration_minutes = self.time_grid.section_duration
+        slots = self.time_grid.slots_for(duration_minutes)
+        allowed_day_times = [
+            (day_idx, self.time_grid.to_index(start))
+            for day_idx, day in enumerate(self.days)
+            for start, _ in self.time_grid.section_blocks(day)
+        ]
+        horizon = self.day_stride * len(self.days)
+
+        self.section_vars = []
+        placed_vars = []
+        for sec_idx, demand in enumerate(self.section_demands):
+            room_indices = self.section_room_indices[sec_idx]
+            if not room_indices or not allowed_day_times:
+                self.section_vars.append(None)
+                continue
+
+            placed = model.NewBoolVar(f"section_{sec_idx}_placed")
+            day_var = model.NewIntVar(0, len(self.days) - 1, f"section_day_{sec_idx}")
+            time_var = model.NewIntVar(0, len(self.time_slots) - 1, f"section_time_{sec_idx}")
+            room_var = model.NewIntVarFromDomain(
+                cp_model.Domain.FromValues(room_indices), f"section_room_{sec_idx}"
+            )
+            model.AddAllowedAssignments([day_var, time_var], allowed_day_times)
+
+            start_var = model.NewIntVar(0, horizon, f"section_start_{sec_idx}")
+            model.Add(start_var == day_var * self.day_stride + time_var)
+            interval = model.NewOptionalIntervalVar(
+                start_var, slots, start_var + slots, placed, f"section_interval_{sec_idx}"
+            )
+
+            room_choices = []
+            for room_idx in room_indices:
+                in_room = model.NewBoolVar(f"section_{sec_idx}_in_room_{room_idx}")
+                model.Add(room_var == room_idx).OnlyEnforceIf(in_room)
+                self.resource_intervals["room"].setdefault(room_idx, []).append(
+                    model.NewOptionalIntervalVar(
+                        start_var, slots, start_var + slots, in_room,
+                        f"section_room_interval_{sec_idx}_{room_idx}",
+                    )
+                )
+                room_choices.append(in_room)
+            model.Add(sum(room_choices) == placed)
+
+            assistant = demand["assistant"]
+            for key in instructor_ids_by_name.get(assistant, [f"assistant:{assistant}"]):
+                self.resource_intervals["instructor"].setdefault(key, []).append(interval)
+            self.resource_intervals["group"].setdefault(
+                f"section:{demand['student_group_id']}", []
+            ).append(interval)
+
+            sections_by_major.setdefault(demand["division_name"], []).append(interval)
+
+            self.section_vars.append(
+                {"placed": placed, "day": day_var, "time": time_var, "room": room_var}
+            )
+            placed_vars.append(placed)
+
+        # Per division, lectures take the whole capacity and each section one
+        # unit: sections fit side by side, but never next to a lecture.
+        for (major, _), lectures in lectures_by_division.items():
+            sections = sections_by_major.get(major)
+            if sections:
+                model.AddCumulative(
+                    lectures + sections,
+                    [len(sections)] * len(lectures) + [1] * len(sections),
+                    len(sections),
+                )
+
+        if placed_vars:
+            model.Maximize(sum(placed_vars))
+
+    def section_placements(self) -> List[Optional[Tuple[str, int, int, str]]]:
+        """(day, start, end, room name) per section from the last solve."""
+        solver = self.last_solver
+        duration_minutes = self.time_grid.section_duration
+        placements: List[Optional[Tuple[str, int, int, str]]] = []
+
+        for section_vars in self.section_vars:
+            if solver is None or section_vars is None or not solver.BooleanValue(
+                section_vars["placed"]
+            ):
+                placements.append(None)
+                continue
+            start_m = self.time_slots[solver.Value(section_vars["time"])]
+            room_name = str(self.instance.room_names[solver.Value(section_vars["room"])]).strip()
+            placements.append(
+                (
+                    self.days[solver.Value(section_vars["day"])],
+                    start_m,
+                    start_m + duration_minutes,
+                    room_name,
+                )
+            )
+        return placements
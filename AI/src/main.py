@@ -1,40 +1,90 @@
 """FastAPI application for CP lecture + section scheduling."""
 
+import hashlib
 import time
 import traceback
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
+import pydantic_core
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 
+from .admin import ADMIN_HEADER, is_admin, require_admin
+from .admission import AdmissionRejected, ModelEstimate, admission
+from .compression import CompressionMiddleware
 from .data_loader import DEFAULT_CP_OUTPUT_PATH, DEFAULT_DATA_PATH, DataLoader
+from .datasets import TABLE_KEYS, DatasetSnapshot, VersionConflict, dataset_store
 from .models import (
     CPConfig,
     CPFileScheduleRequest,
+    DatasetPatchRequest,
+    DatasetPutRequest,
+    DatasetResponse,
     FullScheduleFileRequest,
     FullScheduleResponse,
+    GAConfig,
     HealthResponse,
-    ScheduleEntry,
+    OutputFormat,
+    OutputJobResponse,
+    RecorderConfig,
+    RequestOptions,
+    ResponseMode,
+    ScheduleQualityRequest,
+    ScheduleQualityResponse,
     ScheduleRequest,
     ScheduleResponse,
+    ScheduleValidationRequest,
+    ScheduleValidationResponse,
+    SectionDataInput,
     SectionFileScheduleRequest,
-    SectionScheduleEntry,
     SectionScheduleRequest,
     SectionScheduleResponse,
+    SolveResponse,
+    SolverEngine,
+    TimeGridConfig,
+    UploadResponse,
 )
+from .ga_scheduler import SchedulingGA
+from .joint_scheduler import JointScheduler
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .metrics import MetricsMiddleware, observe_sections, observe_solve, registry
+from .output_writer import output_writer
+from .profiling import SORT_KEYS, profile_store, profiling, run_profiled
+from .quality import schedule_quality
+from .recorder import RecorderMiddleware, note_result, request_recorder
+from .schedule_io import check_output_format, with_format
 from .scheduler import SchedulingCP
 from .section_loader import (
     DEFAULT_OUTPUT_PATH,
     DEFAULT_SDATA_PATH,
     SectionDataLoader,
 )
-from .section_scheduler import SectionScheduler, dataframe_to_schedule_entries
+from .section_scheduler import (
+    FINAL_COLS,
+    SectionScheduleResult,
+    SectionScheduler,
+    dataframe_to_schedule_entries,
+    iter_schedule_entries,
+)
+from .solver_log import solve_store, summarize
+from .time_grid import TimeGrid
+from .timings import Timings
+from .uploads import UploadTooLarge, upload_store
+from .validator import validate_schedule
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_CHUNK_ROWS = 500
+
 
 def _resolve_path(path: str | None, default: Path) -> Path:
     if not path:
@@ -45,76 +95,405 @@ def _resolve_path(path: str | None, default: Path) -> Path:
     return PROJECT_ROOT / candidate
 
 
+def _resolve_output(
+    path: str | None, default: Path, output_format: OutputFormat | None
+) -> Path:
+    resolved = with_format(
+        _resolve_path(path, default), output_format.value if output_format else None
+    )
+    try:
+        check_output_format(resolved)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return resolved
+
+
+def _resolve_workbook(
+    path: str | None, upload_id: str | None, default: Path, kind: str
+) -> Path:
+    if upload_id:
+        resolved = upload_store.resolve(upload_id, kind)
+        if resolved is None:
+            raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+        return resolved
+    return _resolve_path(path, default)
+
+
+async def _store_upload(file: UploadFile, kind: str) -> UploadResponse:
+    start_time = time.time()
+    try:
+        upload_id, path, sheets = await run_in_threadpool(upload_store.store, file.file, kind)
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    finally:
+        await file.close()
+
+    elapsed = time.time() - start_time
+    return UploadResponse(
+        success=True,
+        message=f"Workbook stored as {upload_id} in {elapsed:.2f}s",
+        upload_id=upload_id,
+        filename=file.filename,
+        size_bytes=path.stat().st_size,
+        sheets={name: len(frame) for name, frame in sheets.items()},
+        elapsed_seconds=elapsed,
+    )
+
+
+def _submit_output(
+    response: ScheduleResponse | SectionScheduleResponse,
+    output_path: Path,
+    write: Callable[[], Path],
+) -> None:
+    """Queue ``write`` on the writer pool and point ``response`` at the job."""
+    job_id = output_writer.submit(output_path, write)
+    response.output_path = str(output_path.resolve())
+    response.output_job_id = job_id
+    response.output_status = output_writer.status(job_id)["status"]
+
+
+class ScheduleJSONResponse(Response):
+    """JSON body serialized in one pass by pydantic-core, without re-validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _to_json(content)
+
+
+def _to_json(content: Any) -> bytes:
+    return pydantic_core.to_json(content, inf_nan_mode="null", fallback=_json_fallback)
+
+
+def _json_fallback(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+_ROW_FIELDS = ("schedule", "cp_schedule", "sections_schedule")
+
+# Returns a fresh iterator over schedule rows on each call, so coalesced
+# stream requests each read the rows from the start.
+RowSource = Callable[[], Iterable[Dict[str, Any]]]
+
+
+def _response_header(response: ScheduleResponse | SectionScheduleResponse) -> Dict[str, Any]:
+    """Every response field except the schedule row lists."""
+    header = response.model_dump(exclude=set(_ROW_FIELDS))
+    note_result(header)
+    return header
+
+
+def _response_payload(response: ScheduleResponse | SectionScheduleResponse) -> Dict[str, Any]:
+    """Response fields in declaration order; row lists are passed through as built."""
+    header = _response_header(response)
+    return {
+        name: getattr(response, name) if name in _ROW_FIELDS else header[name]
+        for name in type(response).model_fields
+    }
+
+
+def _ndjson_response(
+    header: Dict[str, Any], parts: List[Tuple[str, Iterable[Dict[str, Any]]]]
+) -> StreamingResponse:
+    """A ``header`` record, one ``row`` record per schedule row, then ``end``.
+
+    Rows are encoded as ``parts`` yields them and sent every
+    ``STREAM_CHUNK_ROWS`` rows; callers pass iterators over the solution or
+    the result frames, so neither the row list nor the body is built up front.
+    """
+
+    def records() -> Iterator[bytes]:
+        yield _to_json({"record": "header", **header}) + b"\n"
+        count = 0
+        chunk: List[bytes] = []
+        for part, rows in parts:
+            for row in rows:
+                chunk.append(_to_json({"record": "row", "part": part, **row}) + b"\n")
+                count += 1
+                if len(chunk) >= STREAM_CHUNK_ROWS:
+                    yield b"".join(chunk)
+                    chunk = []
+        chunk.append(_to_json({"record": "end", "rows": count}) + b"\n")
+        yield b"".join(chunk)
+
+    return StreamingResponse(records(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _section_stream_parts(result) -> List[Tuple[str, Iterable[Dict[str, Any]]]]:
+    return [
+        ("cp", iter_schedule_entries(result.cp_formatted)),
+        ("sections", iter_schedule_entries(result.section_schedule)),
+    ]
+
+
 def _build_section_response(
-    result, elapsed_seconds: float, message: str
+    result,
+    elapsed_seconds: float,
+    message: str,
+    cache_status: dict[str, str] | None = None,
 ) -> SectionScheduleResponse:
-    combined = dataframe_to_schedule_entries(result.combined_schedule)
-    cp_only = dataframe_to_schedule_entries(result.cp_formatted)
-    sections_only = dataframe_to_schedule_entries(result.section_schedule)
-
-    return SectionScheduleResponse(
+    """Response without schedule rows; see ``_add_section_rows``."""
+    return SectionScheduleResponse.model_construct(
         success=True,
         message=message,
-        schedule=[SectionScheduleEntry(**entry) for entry in combined],
-        cp_schedule=[SectionScheduleEntry(**entry) for entry in cp_only],
-        sections_schedule=[SectionScheduleEntry(**entry) for entry in sections_only],
         cp_rows=len(result.cp_formatted),
         section_rows=len(result.section_schedule),
-        total_rows=len(result.combined_schedule),
+        total_rows=result.total_rows,
         unassigned_sections=result.unassigned_sections,
+        moved_sections=result.moved_sections,
+        unchanged_sections=result.unchanged_sections,
         output_path=str(result.written_path.resolve()) if result.written_path else None,
         elapsed_seconds=elapsed_seconds,
+        workbook_cache=cache_status or None,
     )
 
 
-def _run_cp(
+def _add_section_rows(
+    response: SectionScheduleResponse, result, mode: ResponseMode
+) -> SectionScheduleResponse:
+    """Attach plain row dicts; send the response with ``_response_payload``.
+
+    The combined schedule is the CP rows followed by the section rows, so
+    the split lists (full mode) share its dicts and indexed mode only
+    reports where each part starts and ends.
+    """
+    cp_only = dataframe_to_schedule_entries(result.cp_formatted)
+    sections_only = dataframe_to_schedule_entries(result.section_schedule)
+    response.schedule = cp_only + sections_only
+    if mode == ResponseMode.FULL:
+        response.cp_schedule = cp_only
+        response.sections_schedule = sections_only
+    elif mode == ResponseMode.INDEXED:
+        response.cp_range = [0, len(cp_only)]
+        response.sections_range = [len(cp_only), len(response.schedule)]
+    return response
+
+
+def _build_section_scheduler(
+    loader: SectionDataLoader, time_grid: TimeGridConfig | None, timings: Timings
+) -> SectionScheduler:
+    return SectionScheduler(
+        cp_schedule=loader.cp_schedule,
+        rooms=loader.rooms,
+        sections=loader.sections,
+        assistants=loader.assistants,
+        divisions=loader.divisions,
+        courses=loader.courses,
+        doctors=loader.doctors,
+        time_grid=TimeGrid.from_config(time_grid),
+        timings=timings,
+    )
+
+
+def _build_cp(
     loader: DataLoader,
     config: CPConfig,
-    write_output: bool,
-    output_path: Path | None,
-) -> tuple[ScheduleResponse, SchedulingCP, pd.DataFrame]:
-    cp = SchedulingCP(
-        courses_df=loader.courses_df,
-        rooms_df=loader.rooms_df,
-        doctors_df=loader.doctors_df,
-        divisions_df=loader.divisions_df,
+    timings: Timings,
+    section_scheduler: SectionScheduler | None = None,
+) -> tuple[SchedulingCP, ModelEstimate]:
+    """Scheduler with its data prepared, and the size of the model it will build."""
+    cp_kwargs = dict(
+        instance=loader.instance,
         time_limit_seconds=config.time_limit_seconds,
         max_days_per_year=config.max_days_per_year,
         relax_if_infeasible=config.relax_if_infeasible,
+        time_grid=TimeGrid.from_config(config.time_grid),
+        timings=timings,
+        capture_solver_log=config.capture_solver_log,
     )
+    if section_scheduler is not None:
+        cp, label = JointScheduler(section_scheduler=section_scheduler, **cp_kwargs), "joint"
+    elif config.engine == SolverEngine.GA:
+        cp, label = SchedulingGA(**cp_kwargs, **(config.ga or GAConfig()).model_dump()), "ga"
+    else:
+        cp, label = SchedulingCP(**cp_kwargs), "cp"
+
+    with timings.span("estimate_model"):
+        estimate = ModelEstimate.from_size(
+            label,
+            cp.estimate_size(),
+            seconds=config.time_limit_seconds * len(cp.relaxation_limits()),
+        )
+    return cp, estimate
+
+
+@asynccontextmanager
+async def _admitted(estimate: ModelEstimate, timings: Timings) -> AsyncIterator[None]:
+    """``admission.admit`` with rejections as 413 (never fits) or 429 (busy)."""
+    async with AsyncExitStack() as stack:
+        try:
+            with timings.span("admission_wait"):
+                await stack.enter_async_context(admission.admit(estimate))
+        except AdmissionRejected as exc:
+            if exc.retry_after is None:
+                raise HTTPException(status_code=413, detail=str(exc)) from exc
+            raise HTTPException(
+                status_code=429,
+                detail=str(exc),
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
+        yield
+
+
+def _check_profile(request: RequestOptions, admin: bool) -> None:
+    """403 for ``profile: true`` without the admin token; profiles expose code and data."""
+    if request.profile and not admin:
+        raise HTTPException(
+            status_code=403, detail=f"profile requires the {ADMIN_HEADER} header"
+        )
 
-    best_schedule = cp.solve()
+
+def _request_key(name: str, request: Any) -> str:
+    """Coalescing key: identical request bodies to the same route share a run."""
+    digest = hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
+    return f"{name}:{digest}"
+
+
+async def _run_cp(
+    loader: DataLoader,
+    config: CPConfig,
+    write_output: bool,
+    output_path: Path | None,
+    section_scheduler: SectionScheduler | None = None,
+    background_write: bool = False,
+    validate_result: bool = False,
+    quality_metrics: bool = False,
+    with_rows: bool = True,
+    need_frame: bool = False,
+) -> tuple[ScheduleResponse, SchedulingCP, pd.DataFrame | None, RowSource]:
+    """Solve, and build the response plus the schedule frame.
+
+    Without ``with_rows`` the response has no ``schedule`` list; its rows
+    come from the returned row source, formatted from the solution as they
+    are read, and the frame is only built for a file, a report or
+    ``need_frame``.
+    """
+    cp, estimate = await run_profiled(
+        _build_cp, loader, config, loader.timings, section_scheduler
+    )
+    async with _admitted(estimate, cp.timings):
+        best_schedule = await run_profiled(cp.solve)
+    observe_solve(estimate.label, cp.last_solver_status, cp.solve_stats)
+    solve_id = solve_store.save(
+        estimate.label, cp.last_solver_status, cp.solver_attempts, cp.solver_log
+    )
     if not best_schedule:
         raise HTTPException(
             status_code=422,
             detail=(
-                f"CP solver found no solution (status: {cp.last_solver_status}). "
-                "Try increasing time_limit_seconds or max_days_per_year."
+                f"{'GA' if estimate.label == 'ga' else 'CP solver'} found no solution "
+                f"(status: {cp.last_solver_status}). "
+                "Try increasing time_limit_seconds or max_days_per_year. "
+                f"Solver statistics: /solves/{solve_id}"
             ),
         )
+    needs_frame = with_rows or need_frame or write_output or validate_result or quality_metrics
+    response, schedule_df = await run_profiled(
+        _cp_response, cp, best_schedule, write_output, output_path, background_write, with_rows,
+        needs_frame,
+    )
+    response.solve_id = solve_id
+    response.solver_stats = summarize(cp.solver_attempts)
+    if validate_result or quality_metrics:
+        await run_profiled(
+            _add_reports,
+            response,
+            schedule_df,
+            loader.rooms_df,
+            loader.doctors_df,
+            loader.courses_df,
+            config.time_grid,
+            cp.timings,
+            validate_result,
+            quality_metrics,
+        )
+    return response, cp, schedule_df, lambda: cp.iter_schedule_entries(best_schedule)
+
 
-    formatted, schedule_df = cp.format_schedule(best_schedule)
+def _cp_response(
+    cp: SchedulingCP,
+    best_schedule: List[Dict[str, Any]],
+    write_output: bool,
+    output_path: Path | None,
+    background_write: bool,
+    with_rows: bool = True,
+    needs_frame: bool = True,
+) -> tuple[ScheduleResponse, pd.DataFrame | None]:
+    formatted: List[Dict[str, Any]] = []
+    schedule_df = None
+    if with_rows:
+        formatted, schedule_df = cp.format_schedule(best_schedule)
+    elif needs_frame:
+        schedule_df = cp.schedule_frame(best_schedule)
     written_path = None
-    if write_output and output_path is not None:
+    if write_output and output_path is not None and not background_write:
         written_path = cp.save_schedule(schedule_df, output_path)
 
-    return (
-        ScheduleResponse(
-            success=True,
-            message=(
-                f"CP schedule generated with {len(formatted)} assignments "
-                f"(solver: {cp.last_solver_status}, "
-                f"max_days_per_year={cp.max_days_per_year})"
-            ),
-            schedule=[ScheduleEntry(**entry) for entry in formatted],
-            total_assignments=len(formatted),
-            solver_status=cp.last_solver_status,
-            max_days_per_year_used=cp.max_days_per_year,
-            output_path=str(written_path.resolve()) if written_path else None,
+    response = ScheduleResponse.model_construct(
+        success=True,
+        message=(
+            f"CP schedule generated with {len(best_schedule)} assignments "
+            f"(solver: {cp.last_solver_status}, "
+            f"max_days_per_year={cp.max_days_per_year})"
         ),
-        cp,
-        schedule_df,
+        schedule=formatted,
+        total_assignments=len(best_schedule),
+        solver_status=cp.last_solver_status,
+        max_days_per_year_used=cp.max_days_per_year,
+        output_path=str(written_path.resolve()) if written_path else None,
     )
+    if write_output and output_path is not None and background_write:
+        _submit_output(response, output_path, lambda: cp.save_schedule(schedule_df, output_path))
+    return response, schedule_df
+
+
+def _add_reports(
+    response: ScheduleResponse | SectionScheduleResponse,
+    schedule: pd.DataFrame,
+    rooms: pd.DataFrame,
+    doctors: pd.DataFrame,
+    courses: pd.DataFrame,
+    time_grid: TimeGridConfig | None,
+    timings: Timings,
+    validate_result: bool,
+    quality_metrics: bool,
+) -> None:
+    """Set ``validation`` and ``quality`` on a generated response, as requested.
+
+    Timed as the ``validate`` and ``quality`` phases.
+    """
+    grid = TimeGrid.from_config(time_grid)
+    if validate_result:
+        with timings.span("validate"):
+            response.validation = validate_schedule(schedule, rooms, doctors, courses, grid)
+    if quality_metrics:
+        with timings.span("quality"):
+            response.quality = schedule_quality(schedule, rooms, courses, grid)
+
+
+async def _run_sections(
+    scheduler: SectionScheduler, **run_kwargs: Any
+) -> SectionScheduleResult:
+    """``scheduler.run`` on the threadpool, admitted on its section and room counts.
+
+    Placement is greedy and has no time limit, so the estimate carries no seconds.
+    """
+    estimate = ModelEstimate.from_size("sections", scheduler.estimate_size(), seconds=0.0)
+    async with _admitted(estimate, scheduler.timings):
+        result = await run_profiled(lambda: scheduler.run(**run_kwargs))
+    observe_sections("greedy", result.unassigned_sections)
+    return result
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # Let queued output files finish before the process exits.
+    output_writer.shutdown()
 
 
 app = FastAPI(
@@ -123,8 +502,12 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+app.add_middleware(RecorderMiddleware, recorder=request_recorder)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -147,6 +530,17 @@ async def root():
             "sections_generate": "/sections/generate",
             "sections_generate_from_files": "/sections/generate-from-files",
             "full_schedule_from_files": "/schedule/full-from-files",
+            "validate_schedule": "/schedule/validate",
+            "schedule_quality": "/schedule/quality",
+            "streaming": "append /stream to any generate endpoint for NDJSON",
+            "upload_data": "/uploads/data",
+            "upload_sdata": "/uploads/sdata",
+            "output_status": "/outputs/{job_id}",
+            "datasets": "/datasets/{campus}",
+            "solves": "/solves/{solve_id}",
+            "metrics": "/metrics",
+            "profiles": "/debug/profiles/{profile_id}",
+            "recorder": "/debug/recorder",
             "docs": "/docs",
         },
     }
@@ -161,258 +555,869 @@ async def health_check():
             "/sections/generate for section scheduling."
         ),
         version="2.0.0",
+        admission=admission.snapshot(),
     )
 
 
-@app.post("/cp/generate", response_model=ScheduleResponse)
-async def generate_cp_schedule(request: ScheduleRequest):
-    """Generate a lecture schedule using OR-Tools CP-SAT."""
-    config = request.config or CPConfig()
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of request, solver, queue and cache metrics."""
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
 
-    try:
-        start_time = time.time()
-        loader = DataLoader()
-        json_data = {
-            "rooms": [room.model_dump() for room in request.data.rooms],
-            "courses": [course.model_dump() for course in request.data.courses],
-            "doctors": [doctor.model_dump() for doctor in request.data.doctors],
-            "divisions": [division.model_dump() for division in request.data.divisions],
-        }
 
-        if not loader.load_from_json(json_data):
-            raise HTTPException(status_code=400, detail="Failed to parse JSON data")
+@app.get("/solves/{solve_id}", response_model=SolveResponse)
+async def solve_status(solve_id: str):
+    """Per-attempt solver statistics of a CP solve, and its search log if captured."""
+    record = solve_store.get(solve_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Solve not found: {solve_id}")
+    return SolveResponse(**record)
 
-        output_path = None
-        if request.write_output:
-            output_path = _resolve_path(request.output_path, DEFAULT_CP_OUTPUT_PATH)
 
-        response, _, _ = _run_cp(loader, config, request.write_output, output_path)
-        response.elapsed_seconds = time.time() - start_time
-        response.message = f"{response.message} in {response.elapsed_seconds:.2f}s"
-        return response
+@app.get("/debug/profiles", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Stored request profiles, newest first."""
+    return {"profiles": profile_store.summaries()}
 
-    except HTTPException:
-        raise
-    except Exception as exc:
-        print(f"Error generating CP schedule: {exc}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+@app.get(
+    "/debug/profiles/{profile_id}", include_in_schema=False, dependencies=[Depends(require_admin)]
+)
+async def get_profile(
+    profile_id: str, format: str = "text", sort: str = "cumulative", limit: int = 50
+):
+    """A request profile as a pstats table (``format=text``) or pstats file (``format=pstats``)."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    if format == "pstats":
+        return Response(
+            profile.dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    if format != "text":
+        raise HTTPException(status_code=400, detail="format must be 'text' or 'pstats'")
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+    return PlainTextResponse(profile.render(sort, limit))
 
 
-@app.post("/cp/generate-from-files", response_model=ScheduleResponse)
-async def generate_cp_from_files(request: CPFileScheduleRequest):
-    """Generate CP schedule from Data.xlsx (Final CP notebook)."""
-    config = request.config or CPConfig()
+@app.get("/debug/recorder", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def get_recorder():
+    """Request recording settings and counts."""
+    return request_recorder.status()
+
 
+@app.put("/debug/recorder", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def configure_recorder(config: RecorderConfig):
+    """Start or stop recording requests to a rotating JSONL archive.
+
+    The default anonymized fields are only dropped when the (admin) caller
+    sends ``keep_default_anonymize: false``.
+    """
     try:
-        start_time = time.time()
-        data_path = _resolve_path(request.data_path, DEFAULT_DATA_PATH)
+        await run_in_threadpool(
+            request_recorder.configure,
+            config.directory if config.enabled else None,
+            config.routes,
+            config.anonymize_fields,
+            config.max_bytes,
+            config.backup_count,
+            config.max_body_bytes,
+            config.keep_default_anonymize,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except OSError as exc:
+        raise HTTPException(status_code=400, detail=f"Cannot record to {config.directory}: {exc}")
+    return request_recorder.status()
 
-        if not data_path.exists():
-            raise HTTPException(status_code=404, detail=f"Data file not found: {data_path}")
 
-        loader = DataLoader()
-        if not loader.load_from_excel(data_path):
-            raise HTTPException(status_code=400, detail="Failed to load Data.xlsx")
+@app.post("/uploads/data", response_model=UploadResponse)
+async def upload_data_workbook(file: UploadFile = File(...)):
+    """Upload Data.xlsx; later requests reference it via data_upload_id."""
+    return await _store_upload(file, "data")
 
-        output_path = None
-        if request.write_output:
-            output_path = _resolve_path(request.output_path, DEFAULT_CP_OUTPUT_PATH)
 
-        response, _, _ = _run_cp(loader, config, request.write_output, output_path)
-        response.elapsed_seconds = time.time() - start_time
-        response.message = f"{response.message} in {response.elapsed_seconds:.2f}s"
-        return response
+@app.post("/uploads/sdata", response_model=UploadResponse)
+async def upload_sdata_workbook(file: UploadFile = File(...)):
+    """Upload SData.xlsx; later requests reference it via sdata_upload_id."""
+    return await _store_upload(file, "sdata")
 
-    except HTTPException:
-        raise
-    except Exception as exc:
-        print(f"Error generating CP schedule from files: {exc}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+def _dataset_response(
+    snapshot: DatasetSnapshot, message: str, elapsed_seconds: float
+) -> DatasetResponse:
+    return DatasetResponse(
+        success=True,
+        message=message,
+        campus=snapshot.campus,
+        version=snapshot.version,
+        versions=dataset_store.versions(snapshot.campus),
+        rows=snapshot.rows(),
+        changes=snapshot.changes,
+        elapsed_seconds=elapsed_seconds,
+    )
 
-@app.post("/sections/generate", response_model=SectionScheduleResponse)
-async def generate_sections(request: SectionScheduleRequest):
-    """Generate combined CP + section schedule from JSON."""
+
+@app.put("/datasets/{campus}", response_model=DatasetResponse)
+async def put_dataset(campus: str, request: DatasetPutRequest):
+    """Store a full campus dataset as a new version."""
+    start_time = time.time()
     try:
-        start_time = time.time()
-        loader = SectionDataLoader()
-        json_data = {
-            "cp_schedule": [row.model_dump() for row in request.data.cp_schedule],
-            "rooms": [row.model_dump(exclude_none=True) for row in request.data.rooms],
-            "sections": [row.model_dump(exclude_none=True) for row in request.data.sections],
-            "assistants": [
-                row.model_dump(exclude_none=True) for row in request.data.assistants
+        snapshot = dataset_store.put(campus, _scheduling_tables(request))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _dataset_response(
+        snapshot, f"Stored {campus} version {snapshot.version}", time.time() - start_time
+    )
+
+
+@app.patch("/datasets/{campus}", response_model=DatasetResponse)
+async def patch_dataset(campus: str, request: DatasetPatchRequest):
+    """Apply row-level upserts and deletes to the latest version of a dataset."""
+    start_time = time.time()
+    changes: Dict[str, Dict[str, Any]] = {}
+    for name, change in request.changes:
+        if change is None:
+            continue
+        key_columns = TABLE_KEYS[name]
+        changes[name] = {
+            "upsert": [row.model_dump() for row in change.upsert],
+            "delete": [
+                key if isinstance(key, str) else tuple(getattr(key, col) for col in key_columns)
+                for key in change.delete
             ],
-            "divisions": [row.model_dump() for row in request.data.divisions],
-            "courses": [row.model_dump() for row in request.data.courses],
-            "doctors": [row.model_dump() for row in request.data.doctors],
         }
 
-        if not loader.load_from_json(json_data):
-            raise HTTPException(status_code=400, detail="Failed to parse section JSON data")
-
-        output_path = None
-        if request.write_output:
-            output_path = _resolve_path(request.output_path, DEFAULT_OUTPUT_PATH)
-
-        scheduler = SectionScheduler(
-            cp_schedule=loader.cp_schedule,
-            rooms=loader.rooms,
-            sections=loader.sections,
-            assistants=loader.assistants,
-            divisions=loader.divisions,
-            courses=loader.courses,
-            doctors=loader.doctors,
-        )
-        result = scheduler.run(output_path=output_path)
-        elapsed = time.time() - start_time
+    try:
+        snapshot = dataset_store.patch(campus, changes, request.base_version)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Dataset not found: {campus}") from exc
+    except VersionConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _dataset_response(
+        snapshot, f"Patched {campus} to version {snapshot.version}", time.time() - start_time
+    )
 
-        message = (
-            f"Section schedule generated in {elapsed:.2f}s "
-            f"({len(result.cp_formatted)} CP rows, {len(result.section_schedule)} section rows)"
+
+@app.get("/datasets/{campus}", response_model=DatasetResponse)
+async def get_dataset(campus: str, version: int | None = None):
+    """Row counts of a stored dataset version (latest by default)."""
+    snapshot = dataset_store.get(campus, version)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=404, detail=f"Dataset not found: {campus} version {version or 'latest'}"
         )
-        if result.written_path:
-            message += f". Written to {result.written_path.resolve()}"
+    return _dataset_response(snapshot, f"{campus} version {snapshot.version}", 0.0)
+
+
+@app.get("/outputs/{job_id}", response_model=OutputJobResponse)
+async def output_status(job_id: str):
+    """Status and final path of a background output write."""
+    job = output_writer.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Output job not found: {job_id}")
+
+    write_seconds = None
+    if job["started_at"] is not None and job["finished_at"] is not None:
+        write_seconds = job["finished_at"] - job["started_at"]
+    return OutputJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        requested_path=job["requested_path"],
+        output_path=job["output_path"],
+        error=job["error"],
+        write_seconds=write_seconds,
+    )
 
-        return _build_section_response(result, elapsed, message)
 
-    except HTTPException:
-        raise
-    except Exception as exc:
-        print(f"Error generating section schedule: {exc}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+def _scheduling_tables(request: ScheduleRequest | DatasetPutRequest) -> Dict[str, Any]:
+    if request.columns is not None:
+        return request.columns.to_tables()
+    return {
+        "rooms": [room.model_dump() for room in request.data.rooms],
+        "courses": [course.model_dump() for course in request.data.courses],
+        "doctors": [doctor.model_dump() for doctor in request.data.doctors],
+        "divisions": [division.model_dump() for division in request.data.divisions],
+    }
+
+
+async def _generate_cp(
+    request: ScheduleRequest, with_rows: bool = True
+) -> tuple[ScheduleResponse, RowSource]:
+    """The response, and its rows as a row source (see ``_run_cp``)."""
+    config = request.config or CPConfig()
+    timings = Timings(trace_memory=request.trace_memory)
+
+    with profiling(request.profile, "/cp/generate") as profile:
+        try:
+            start_time = time.time()
+            loader = DataLoader(timings)
+            if request.dataset is not None:
+                snapshot = dataset_store.get(request.dataset.campus, request.dataset.version)
+                if snapshot is None:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Dataset not found: {request.dataset.campus} "
+                        f"version {request.dataset.version or 'latest'}",
+                    )
+                loader.load_from_dataset(snapshot)
+            else:
+
+                def load() -> bool:
+                    with timings.span("parse_request"):
+                        tables = _scheduling_tables(request)
+                    return loader.load_from_json(tables)
+
+                if not await run_profiled(load):
+                    raise HTTPException(status_code=400, detail="Failed to parse JSON data")
+
+            output_path = None
+            if request.write_output:
+                output_path = _resolve_output(
+                    request.output_path, DEFAULT_CP_OUTPUT_PATH, request.output_format
+                )
+
+            response, _, _, rows = await _run_cp(
+                loader,
+                config,
+                request.write_output,
+                output_path,
+                background_write=request.background_write,
+                validate_result=request.validate_result,
+                quality_metrics=request.quality_metrics,
+                with_rows=with_rows,
+            )
+            response.elapsed_seconds = time.time() - start_time
+            response.message = f"{response.message} in {response.elapsed_seconds:.2f}s"
+            response.timings = timings.finish()
+            response.profile_id = profile.profile_id if profile else None
+            return response, rows
+
+        except HTTPException:
+            raise
+        except Exception as exc:
+            print(f"Error generating CP schedule: {exc}")
+            print(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            timings.finish()
+            timings.log("request_timings", route="/cp/generate")
+
+
+@app.post("/cp/generate", response_model=ScheduleResponse)
+async def generate_cp_schedule(request: ScheduleRequest, admin: bool = Depends(is_admin)):
+    """Generate a lecture schedule using OR-Tools CP-SAT."""
+    _check_profile(request, admin)
+    response, _ = await admission.coalesce(
+        _request_key("cp", request), lambda: _generate_cp(request)
+    )
+    return ScheduleJSONResponse(_response_payload(response))
+
+
+@app.post("/cp/generate/stream", response_class=StreamingResponse)
+async def stream_cp_schedule(request: ScheduleRequest, admin: bool = Depends(is_admin)):
+    """/cp/generate as NDJSON: a header record, then one lecture row per line."""
+    _check_profile(request, admin)
+    response, rows = await admission.coalesce(
+        _request_key("cp/stream", request), lambda: _generate_cp(request, with_rows=False)
+    )
+    return _ndjson_response(_response_header(response), [("cp", rows())])
+
+
+async def _generate_cp_from_files(
+    request: CPFileScheduleRequest, with_rows: bool = True
+) -> tuple[ScheduleResponse, RowSource]:
+    """The response, and its rows as a row source (see ``_run_cp``)."""
+    config = request.config or CPConfig()
+    timings = Timings(trace_memory=request.trace_memory)
+
+    with profiling(request.profile, "/cp/generate-from-files") as profile:
+        try:
+            start_time = time.time()
+            data_path = _resolve_workbook(
+                request.data_path, request.data_upload_id, DEFAULT_DATA_PATH, "data"
+            )
+
+            if not data_path.exists():
+                raise HTTPException(status_code=404, detail=f"Data file not found: {data_path}")
+
+            loader = DataLoader(timings)
+            if not await run_profiled(loader.load_from_excel, data_path):
+                raise HTTPException(status_code=400, detail="Failed to load Data.xlsx")
+
+            output_path = None
+            if request.write_output:
+                output_path = _resolve_output(
+                    request.output_path, DEFAULT_CP_OUTPUT_PATH, request.output_format
+                )
+
+            response, _, _, rows = await _run_cp(
+                loader,
+                config,
+                request.write_output,
+                output_path,
+                background_write=request.background_write,
+                validate_result=request.validate_result,
+                quality_metrics=request.quality_metrics,
+                with_rows=with_rows,
+            )
+            response.elapsed_seconds = time.time() - start_time
+            response.message = f"{response.message} in {response.elapsed_seconds:.2f}s"
+            response.workbook_cache = loader.cache_status
+            response.timings = timings.finish()
+            response.profile_id = profile.profile_id if profile else None
+            return response, rows
+
+        except HTTPException:
+            raise
+        except Exception as exc:
+            print(f"Error generating CP schedule from files: {exc}")
+            print(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            timings.finish()
+            timings.log("request_timings", route="/cp/generate-from-files")
+
+
+@app.post("/cp/generate-from-files", response_model=ScheduleResponse)
+async def generate_cp_from_files(request: CPFileScheduleRequest, admin: bool = Depends(is_admin)):
+    """Generate CP schedule from Data.xlsx (Final CP notebook)."""
+    _check_profile(request, admin)
+    response, _ = await admission.coalesce(
+        _request_key("cp-files", request), lambda: _generate_cp_from_files(request)
+    )
+    return ScheduleJSONResponse(_response_payload(response))
+
+
+@app.post("/cp/generate-from-files/stream", response_class=StreamingResponse)
+async def stream_cp_from_files(request: CPFileScheduleRequest, admin: bool = Depends(is_admin)):
+    """/cp/generate-from-files as NDJSON."""
+    _check_profile(request, admin)
+    response, rows = await admission.coalesce(
+        _request_key("cp-files/stream", request),
+        lambda: _generate_cp_from_files(request, with_rows=False),
+    )
+    return _ndjson_response(_response_header(response), [("cp", rows())])
+
+
+def _section_rows(data: SectionDataInput) -> Dict[str, Any]:
+    json_data = {
+        "cp_schedule": [row.model_dump() for row in data.cp_schedule],
+        "rooms": [row.model_dump(exclude_none=True) for row in data.rooms],
+        "sections": [row.model_dump(exclude_none=True) for row in data.sections],
+        "assistants": [row.model_dump(exclude_none=True) for row in data.assistants],
+        "divisions": [row.model_dump() for row in data.divisions],
+        "courses": [row.model_dump() for row in data.courses],
+        "doctors": [row.model_dump() for row in data.doctors],
+    }
+    if data.previous_schedule is not None:
+        json_data["previous_schedule"] = [row.model_dump() for row in data.previous_schedule]
+    return json_data
+
+
+async def _generate_sections(
+    request: SectionScheduleRequest,
+) -> tuple[SectionScheduleResponse, SectionScheduleResult]:
+    timings = Timings(trace_memory=request.trace_memory)
+    with profiling(request.profile, "/sections/generate") as profile:
+        try:
+            start_time = time.time()
+            loader = SectionDataLoader(timings)
+            with timings.span("parse_request"):
+                if request.columns is not None:
+                    json_data = request.columns.to_tables()
+                else:
+                    json_data = _section_rows(request.data)
+
+            if not await run_profiled(loader.load_from_json, json_data):
+                raise HTTPException(status_code=400, detail="Failed to parse section JSON data")
+
+            output_path = None
+            if request.write_output:
+                output_path = _resolve_output(
+                    request.output_path, DEFAULT_OUTPUT_PATH, request.output_format
+                )
+
+            scheduler = _build_section_scheduler(loader, request.time_grid, timings)
+            result = await _run_sections(
+                scheduler,
+                output_path=None if request.background_write else output_path,
+                previous_schedule=loader.previous_schedule,
+            )
+            elapsed = time.time() - start_time
+
+            message = (
+                f"Section schedule generated in {elapsed:.2f}s "
+                f"({len(result.cp_formatted)} CP rows, {len(result.section_schedule)} section rows)"
+            )
+            if result.moved_sections is not None:
+                message += (
+                    f". Incremental: {result.unchanged_sections} unchanged, "
+                    f"{result.moved_sections} re-placed"
+                )
+            if result.written_path:
+                message += f". Written to {result.written_path.resolve()}"
+
+            response = _build_section_response(result, elapsed, message)
+            if request.validate_result or request.quality_metrics:
+                await run_profiled(
+                    _add_reports,
+                    response,
+                    result.combined_schedule,
+                    loader.rooms,
+                    loader.doctors,
+                    loader.courses,
+                    request.time_grid,
+                    timings,
+                    request.validate_result,
+                    request.quality_metrics,
+                )
+            if output_path is not None and request.background_write:
+                _submit_output(
+                    response, output_path, lambda: scheduler.save_result(result, output_path)
+                )
+            response.timings = timings.finish()
+            response.profile_id = profile.profile_id if profile else None
+            return response, result
+
+        except HTTPException:
+            raise
+        except Exception as exc:
+            print(f"Error generating section schedule: {exc}")
+            print(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            timings.finish()
+            timings.log("request_timings", route="/sections/generate")
+
+
+@app.post("/sections/generate", response_model=SectionScheduleResponse)
+async def generate_sections(request: SectionScheduleRequest, admin: bool = Depends(is_admin)):
+    """Generate combined CP + section schedule from JSON."""
+    _check_profile(request, admin)
+
+    async def payload() -> Dict[str, Any]:
+        response, result = await _generate_sections(request)
+        _add_section_rows(response, result, request.response_mode)
+        return _response_payload(response)
+
+    # Coalesced duplicates get the payload without running _response_header.
+    body = await admission.coalesce(_request_key("sections", request), payload)
+    note_result(body)
+    return ScheduleJSONResponse(body)
+
+
+@app.post("/sections/generate/stream", response_class=StreamingResponse)
+async def stream_sections(request: SectionScheduleRequest, admin: bool = Depends(is_admin)):
+    """/sections/generate as NDJSON; each row record names its part (cp or sections)."""
+    _check_profile(request, admin)
+    response, result = await admission.coalesce(
+        _request_key("sections/stream", request), lambda: _generate_sections(request)
+    )
+    return _ndjson_response(_response_header(response), _section_stream_parts(result))
+
+
+async def _generate_sections_from_files(
+    request: SectionFileScheduleRequest,
+) -> tuple[SectionScheduleResponse, SectionScheduleResult]:
+    timings = Timings(trace_memory=request.trace_memory)
+    with profiling(request.profile, "/sections/generate-from-files") as profile:
+        try:
+            start_time = time.time()
+            cp_path = _resolve_path(request.cp_output_path, DEFAULT_CP_OUTPUT_PATH)
+            sdata_path = _resolve_workbook(
+                request.sdata_path, request.sdata_upload_id, DEFAULT_SDATA_PATH, "sdata"
+            )
+            data_path = _resolve_workbook(
+                request.data_path, request.data_upload_id, DEFAULT_DATA_PATH, "data"
+            )
+
+            # A preceding request may still be writing the CP output in the background.
+            await run_in_threadpool(output_writer.wait_for_path, cp_path)
+            for label, path in [("CP output", cp_path), ("SData", sdata_path), ("Data", data_path)]:
+                if not path.exists():
+                    raise HTTPException(status_code=404, detail=f"{label} file not found: {path}")
+
+            loader = SectionDataLoader(timings)
+            if not await run_profiled(
+                lambda: loader.load_from_excel(
+                    cp_output_path=cp_path,
+                    sdata_path=sdata_path,
+                    data_path=data_path,
+                )
+            ):
+                raise HTTPException(status_code=400, detail="Failed to load section Excel data")
+
+            if request.previous_output_path:
+                previous_path = _resolve_path(request.previous_output_path, DEFAULT_OUTPUT_PATH)
+                await run_in_threadpool(output_writer.wait_for_path, previous_path)
+                if not previous_path.exists():
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Previous output file not found: {previous_path}",
+                    )
+                if not await run_profiled(loader.load_previous_schedule, previous_path):
+                    raise HTTPException(
+                        status_code=400, detail="Failed to load previous section schedule"
+                    )
+
+            output_path = None
+            if request.write_output:
+                output_path = _resolve_output(
+                    request.output_path, DEFAULT_OUTPUT_PATH, request.output_format
+                )
+
+            scheduler = _build_section_scheduler(loader, request.time_grid, timings)
+            result = await _run_sections(
+                scheduler,
+                output_path=None if request.background_write else output_path,
+                previous_schedule=loader.previous_schedule,
+            )
+            elapsed = time.time() - start_time
+
+            stats = loader.get_stats()
+            message = (
+                f"Section schedule from files in {elapsed:.2f}s "
+                f"(CP rows: {stats['cp_rows']}, sections: {stats['sections_rows']})"
+            )
+            if result.moved_sections is not None:
+                message += (
+                    f". Incremental: {result.unchanged_sections} unchanged, "
+                    f"{result.moved_sections} re-placed"
+                )
+            if result.written_path:
+                message += f". Written to {result.written_path.resolve()}"
+
+            response = _build_section_response(result, elapsed, message, loader.cache_status)
+            if request.validate_result or request.quality_metrics:
+                await run_profiled(
+                    _add_reports,
+                    response,
+                    result.combined_schedule,
+                    loader.rooms,
+                    loader.doctors,
+                    loader.courses,
+                    request.time_grid,
+                    timings,
+                    request.validate_result,
+                    request.quality_metrics,
+                )
+            if output_path is not None and request.background_write:
+                _submit_output(
+                    response, output_path, lambda: scheduler.save_result(result, output_path)
+                )
+            response.timings = timings.finish()
+            response.profile_id = profile.profile_id if profile else None
+            return response, result
+
+        except HTTPException:
+            raise
+        except Exception as exc:
+            print(f"Error generating section schedule from files: {exc}")
+            print(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            timings.finish()
+            timings.log("request_timings", route="/sections/generate-from-files")
 
 
 @app.post("/sections/generate-from-files", response_model=SectionScheduleResponse)
-async def generate_sections_from_files(request: SectionFileScheduleRequest):
+async def generate_sections_from_files(
+    request: SectionFileScheduleRequest, admin: bool = Depends(is_admin)
+):
     """Generate section schedule from Excel (Final S Cp notebook)."""
-    try:
-        start_time = time.time()
-        cp_path = _resolve_path(request.cp_output_path, DEFAULT_CP_OUTPUT_PATH)
-        sdata_path = _resolve_path(request.sdata_path, DEFAULT_SDATA_PATH)
-        data_path = _resolve_path(request.data_path, DEFAULT_DATA_PATH)
-
-        for label, path in [("CP output", cp_path), ("SData", sdata_path), ("Data", data_path)]:
-            if not path.exists():
-                raise HTTPException(status_code=404, detail=f"{label} file not found: {path}")
-
-        loader = SectionDataLoader()
-        if not loader.load_from_excel(
-            cp_output_path=cp_path,
-            sdata_path=sdata_path,
-            data_path=data_path,
-        ):
-            raise HTTPException(status_code=400, detail="Failed to load section Excel data")
-
-        output_path = None
-        if request.write_output:
-            output_path = _resolve_path(request.output_path, DEFAULT_OUTPUT_PATH)
-
-        scheduler = SectionScheduler(
-            cp_schedule=loader.cp_schedule,
-            rooms=loader.rooms,
-            sections=loader.sections,
-            assistants=loader.assistants,
-            divisions=loader.divisions,
-            courses=loader.courses,
-            doctors=loader.doctors,
-        )
-        result = scheduler.run(output_path=output_path)
-        elapsed = time.time() - start_time
+    _check_profile(request, admin)
+
+    async def payload() -> Dict[str, Any]:
+        response, result = await _generate_sections_from_files(request)
+        _add_section_rows(response, result, request.response_mode)
+        return _response_payload(response)
+
+    # Coalesced duplicates get the payload without running _response_header.
+    body = await admission.coalesce(_request_key("sections-files", request), payload)
+    note_result(body)
+    return ScheduleJSONResponse(body)
+
+
+@app.post("/sections/generate-from-files/stream", response_class=StreamingResponse)
+async def stream_sections_from_files(
+    request: SectionFileScheduleRequest, admin: bool = Depends(is_admin)
+):
+    """/sections/generate-from-files as NDJSON."""
+    _check_profile(request, admin)
+    response, result = await admission.coalesce(
+        _request_key("sections-files/stream", request),
+        lambda: _generate_sections_from_files(request),
+    )
+    return _ndjson_response(_response_header(response), _section_stream_parts(result))
 
-        stats = loader.get_stats()
-        message = (
-            f"Section schedule from files in {elapsed:.2f}s "
-            f"(CP rows: {stats['cp_rows']}, sections: {stats['sections_rows']})"
-        )
-        if result.written_path:
-            message += f". Written to {result.written_path.resolve()}"
 
-        return _build_section_response(result, elapsed, message)
+async def _generate_full_schedule(
+    request: FullScheduleFileRequest, with_rows: bool = True
+) -> tuple[ScheduleResponse, SectionScheduleResponse, SectionScheduleResult, Dict[str, Any]]:
+    """CP and section responses, the section result, and the top-level extras.
 
-    except HTTPException:
-        raise
-    except Exception as exc:
-        print(f"Error generating section schedule from files: {exc}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    Without ``with_rows`` the CP response carries no rows; streams send the
+    section result's combined rows instead.
+    """
+    config = request.cp_config or CPConfig()
+    timings = Timings(trace_memory=request.trace_memory)
+
+    with profiling(request.profile, "/schedule/full-from-files") as profile:
+        try:
+            start_time = time.time()
+            data_path = _resolve_workbook(
+                request.data_path, request.data_upload_id, DEFAULT_DATA_PATH, "data"
+            )
+            sdata_path = _resolve_workbook(
+                request.sdata_path, request.sdata_upload_id, DEFAULT_SDATA_PATH, "sdata"
+            )
+            cp_output_path = _resolve_output(
+                request.cp_output_path, DEFAULT_CP_OUTPUT_PATH, request.output_format
+            )
+            final_output_path = _resolve_output(
+                request.output_path, DEFAULT_OUTPUT_PATH, request.output_format
+            )
+
+            if not data_path.exists():
+                raise HTTPException(status_code=404, detail=f"Data file not found: {data_path}")
+            if not sdata_path.exists():
+                raise HTTPException(status_code=404, detail=f"SData file not found: {sdata_path}")
+
+            cp_loader = DataLoader(timings)
+            if not await run_profiled(cp_loader.load_from_excel, data_path):
+                raise HTTPException(status_code=400, detail="Failed to load Data.xlsx")
+
+            section_output_path = final_output_path if request.write_output else None
+            inline_output_path = None if request.background_write else section_output_path
+
+            if request.joint_solve:
+                # Sections are placed inside the lecture model, so no CP schedule
+                # is needed up front.
+                section_loader = SectionDataLoader(timings)
+                if not await run_profiled(
+                    lambda: section_loader.load_section_sheets(
+                        sdata_path=sdata_path,
+                        data_path=data_path,
+                        cp_schedule=pd.DataFrame(columns=FINAL_COLS),
+                    )
+                ):
+                    raise HTTPException(status_code=400, detail="Failed to load section data")
+                section_scheduler = _build_section_scheduler(
+                    section_loader, config.time_grid, timings
+                )
+
+                cp_response, cp, schedule_df, _ = await _run_cp(
+                    cp_loader,
+                    config,
+                    write_output=request.write_output,
+                    output_path=cp_output_path if request.write_output else None,
+                    section_scheduler=section_scheduler,
+                    background_write=request.background_write,
+                    validate_result=request.validate_result,
+                    quality_metrics=request.quality_metrics,
+                    with_rows=with_rows,
+                    need_frame=True,
+                )
+                section_result = await run_profiled(
+                    lambda: section_scheduler.build_result(
+                        cp.section_demands,
+                        cp.section_placements(),
+                        output_path=inline_output_path,
+                        cp_schedule=schedule_df,
+                    )
+                )
+                observe_sections("joint", section_result.unassigned_sections)
+            else:
+                cp_response, _, schedule_df, _ = await _run_cp(
+                    cp_loader,
+                    config,
+                    write_output=request.write_output,
+                    output_path=cp_output_path if request.write_output else None,
+                    background_write=request.background_write,
+                    validate_result=request.validate_result,
+                    quality_metrics=request.quality_metrics,
+                    with_rows=with_rows,
+                    need_frame=True,
+                )
+
+                section_loader = SectionDataLoader(timings)
+                if not await run_profiled(
+                    lambda: section_loader.load_section_sheets(
+                        sdata_path=sdata_path,
+                        data_path=data_path,
+                        cp_schedule=schedule_df,
+                    )
+                ):
+                    raise HTTPException(status_code=400, detail="Failed to load section data")
+
+                section_scheduler = _build_section_scheduler(
+                    section_loader, config.time_grid, timings
+                )
+                section_result = await _run_sections(
+                    section_scheduler, output_path=inline_output_path
+                )
+
+            elapsed = time.time() - start_time
+            cp_response.elapsed_seconds = elapsed
+            cp_response.workbook_cache = cp_loader.cache_status
+
+            section_message = (
+                f"Full pipeline completed in {elapsed:.2f}s "
+                f"({len(section_result.cp_formatted)} CP + "
+                f"{len(section_result.section_schedule)} sections)"
+            )
+            if section_result.written_path:
+                section_message += f". Written to {section_result.written_path.resolve()}"
+
+            section_response = _build_section_response(
+                section_result, elapsed, section_message, section_loader.cache_status
+            )
+            if request.validate_result or request.quality_metrics:
+                await run_profiled(
+                    _add_reports,
+                    section_response,
+                    section_result.combined_schedule,
+                    section_loader.rooms,
+                    section_loader.doctors,
+                    section_loader.courses,
+                    config.time_grid,
+                    timings,
+                    request.validate_result,
+                    request.quality_metrics,
+                )
+            if section_output_path is not None and request.background_write:
+                _submit_output(
+                    section_response,
+                    section_output_path,
+                    lambda: section_scheduler.save_result(section_result, section_output_path),
+                )
+
+            extras = {
+                "timings": timings.finish(),
+                "profile_id": profile.profile_id if profile else None,
+            }
+            return cp_response, section_response, section_result, extras
+
+        except HTTPException:
+            raise
+        except Exception as exc:
+            print(f"Error in full schedule pipeline: {exc}")
+            print(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            timings.finish()
+            timings.log("request_timings", route="/schedule/full-from-files")
 
 
 @app.post("/schedule/full-from-files", response_model=FullScheduleResponse)
-async def generate_full_schedule_from_files(request: FullScheduleFileRequest):
-    """Run Final CP then Final S Cp in one pipeline."""
-    config = request.cp_config or CPConfig()
+async def generate_full_schedule_from_files(
+    request: FullScheduleFileRequest, admin: bool = Depends(is_admin)
+):
+    """Run Final CP then Final S Cp in one pipeline (or one joint solve)."""
+    _check_profile(request, admin)
+
+    async def payload() -> Dict[str, Any]:
+        cp_response, section_response, section_result, extras = await _generate_full_schedule(
+            request
+        )
+        _add_section_rows(section_response, section_result, request.response_mode)
+        return {
+            "success": True,
+            "message": section_response.message,
+            "cp_result": _response_payload(cp_response),
+            "section_result": _response_payload(section_response),
+            **extras,
+        }
+
+    return ScheduleJSONResponse(await admission.coalesce(_request_key("full", request), payload))
+
+
+@app.post("/schedule/full-from-files/stream", response_class=StreamingResponse)
+async def stream_full_schedule_from_files(
+    request: FullScheduleFileRequest, admin: bool = Depends(is_admin)
+):
+    """/schedule/full-from-files as NDJSON.
+
+    The header holds both results without their rows; the rows are those of
+    the combined section-format schedule.
+    """
+    _check_profile(request, admin)
+    cp_response, section_response, section_result, extras = await admission.coalesce(
+        _request_key("full/stream", request),
+        lambda: _generate_full_schedule(request, with_rows=False),
+    )
+    header = {
+        "success": True,
+        "message": section_response.message,
+        "cp_result": _response_header(cp_response),
+        "section_result": _response_header(section_response),
+        **extras,
+    }
+    return _ndjson_response(header, _section_stream_parts(section_result))
+
+
+def _validate_request(request: ScheduleValidationRequest) -> ScheduleValidationResponse:
+    tables = [
+        pd.DataFrame(rows) if rows is not None else None
+        for rows in (request.rooms, request.doctors, request.courses)
+    ]
+    report = validate_schedule(
+        pd.DataFrame(request.schedule),
+        *tables,
+        time_grid=TimeGrid.from_config(request.time_grid),
+        max_findings=request.max_findings,
+    )
+    total = sum(report["counts"].values())
+    message = (
+        f"Schedule valid ({report['checked_rows']} rows checked)"
+        if report["valid"]
+        else f"{total} conflicts in {report['checked_rows']} rows"
+    )
+    return ScheduleValidationResponse(success=True, message=message, **report)
+
 
+@app.post("/schedule/validate", response_model=ScheduleValidationResponse)
+async def validate_schedule_rows(request: ScheduleValidationRequest):
+    """Check any schedule for double bookings, capacity, availability and opening hours."""
     try:
-        start_time = time.time()
-        data_path = _resolve_path(request.data_path, DEFAULT_DATA_PATH)
-        sdata_path = _resolve_path(request.sdata_path, DEFAULT_SDATA_PATH)
-        cp_output_path = _resolve_path(request.cp_output_path, DEFAULT_CP_OUTPUT_PATH)
-        final_output_path = _resolve_path(request.output_path, DEFAULT_OUTPUT_PATH)
-
-        if not data_path.exists():
-            raise HTTPException(status_code=404, detail=f"Data file not found: {data_path}")
-        if not sdata_path.exists():
-            raise HTTPException(status_code=404, detail=f"SData file not found: {sdata_path}")
-
-        cp_loader = DataLoader()
-        if not cp_loader.load_from_excel(data_path):
-            raise HTTPException(status_code=400, detail="Failed to load Data.xlsx")
-
-        cp_response, _, schedule_df = _run_cp(
-            cp_loader,
-            config,
-            write_output=request.write_output,
-            output_path=cp_output_path if request.write_output else None,
-        )
+        return await run_in_threadpool(_validate_request, request)
+    except Exception as exc:
+        print(f"Error validating schedule: {exc}")
+        print(traceback.format_exc())
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-        section_loader = SectionDataLoader()
-        if not section_loader.load_section_sheets(
-            sdata_path=sdata_path,
-            data_path=data_path,
-            cp_schedule=schedule_df,
-        ):
-            raise HTTPException(status_code=400, detail="Failed to load section data")
-
-        section_scheduler = SectionScheduler(
-            cp_schedule=section_loader.cp_schedule,
-            rooms=section_loader.rooms,
-            sections=section_loader.sections,
-            assistants=section_loader.assistants,
-            divisions=section_loader.divisions,
-            courses=section_loader.courses,
-            doctors=section_loader.doctors,
-        )
-        section_result = section_scheduler.run(
-            output_path=final_output_path if request.write_output else None
-        )
 
-        elapsed = time.time() - start_time
-        cp_response.elapsed_seconds = elapsed
+def _quality_request(request: ScheduleQualityRequest) -> ScheduleQualityResponse:
+    report = schedule_quality(
+        pd.DataFrame(request.schedule),
+        pd.DataFrame(request.rooms) if request.rooms is not None else None,
+        pd.DataFrame(request.courses) if request.courses is not None else None,
+        time_grid=TimeGrid.from_config(request.time_grid),
+        late_minutes=request.late_minutes,
+    )
+    summary = report["summary"]
+    message = (
+        f"Quality metrics for {summary['meetings']} meetings, {summary['divisions']} divisions "
+        f"and {summary['rooms_used']} rooms"
+    )
+    return ScheduleQualityResponse(success=True, message=message, **report)
 
-        section_message = (
-            f"Full pipeline completed in {elapsed:.2f}s "
-            f"({len(section_result.cp_formatted)} CP + {len(section_result.section_schedule)} sections)"
-        )
-        if section_result.written_path:
-            section_message += f". Written to {section_result.written_path.resolve()}"
-
-        return FullScheduleResponse(
-            success=True,
-            message=section_message,
-            cp_result=cp_response,
-            section_result=_build_section_response(section_result, elapsed, section_message),
-        )
 
-    except HTTPException:
-        raise
+@app.post("/schedule/quality", response_model=ScheduleQualityResponse)
+async def schedule_quality_metrics(request: ScheduleQualityRequest):
+    """Idle gaps, loads, room utilization and late slots of any schedule."""
+    try:
+        return await run_in_threadpool(_quality_request, request)
     except Exception as exc:
-        print(f"Error in full schedule pipeline: {exc}")
+        print(f"Error computing schedule quality: {exc}")
         print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 if __name__ == "__main__":
@@ -0,0 +1,366 @@
+"""In-process service metrics rendered in the Prometheus text exposition format."""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .admission import admission
+from .compression import compression_stats
+from .workbook_cache import workbook_cache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+SIZE_BUCKETS = (1e3, 3e3, 1e4, 3e4, 1e5, 3e5, 1e6, 3e6, 1e7)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 5, 6, 7)
+UNASSIGNED_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# (labels, value) pairs of one metric family.
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+class _Metric:
+    """A named family of labelled series; subclasses define the value kept per series."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            lines.extend(self._render_series(dict(zip(self.labelnames, key)), value))
+        return lines
+
+    def _render_series(self, labels: Dict[str, str], value: Any) -> List[str]:
+        return [_sample(self.name, labels, value)]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative buckets plus ``_sum`` and ``_count`` per series."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][idx] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def _render_series(self, labels: Dict[str, str], value: Any) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, value["buckets"]):
+            cumulative += count
+            bucket_labels = {**labels, "le": _number(bound)}
+            lines.append(_sample(f"{self.name}_bucket", bucket_labels, cumulative))
+        lines.append(_sample(f"{self.name}_bucket", {**labels, "le": "+Inf"}, value["count"]))
+        lines.append(_sample(f"{self.name}_sum", labels, value["sum"]))
+        lines.append(_sample(f"{self.name}_count", labels, value["count"]))
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics updated as events happen, plus collectors read at scrape time."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        # Each collector returns (name, kind, help, samples) families.
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def collector(
+        self, collect: Callable[[], Iterable[Tuple[str, str, str, Samples]]]
+    ) -> Callable[[], Iterable[Tuple[str, str, str, Samples]]]:
+        self._collectors.append(collect)
+        return collect
+
+    def _add(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, kind, help_text, samples in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(_sample(name, labels, value) for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return f"{name}{{{rendered}}} {_number(value)}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+        if value.is_integer():
+            return str(int(value))
+    return repr(value)
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "scheduler_http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_seconds = registry.histogram(
+    "scheduler_http_request_duration_seconds",
+    "Time from request start until the last response byte was sent.",
+    ("method", "route"),
+)
+http_in_progress = registry.gauge(
+    "scheduler_http_requests_in_progress",
+    "Requests currently being handled.",
+    ("route",),
+)
+solver_runs = registry.counter(
+    "scheduler_solver_runs_total",
+    "CP-SAT runs by engine (cp or joint) and final solver status.",
+    ("engine", "status"),
+)
+solve_seconds = registry.histogram(
+    "scheduler_solver_solve_seconds",
+    "CP-SAT wall time per run, summed over relaxation attempts.",
+    ("engine",),
+)
+first_solution_seconds = registry.histogram(
+    "scheduler_solver_first_solution_seconds",
+    "CP-SAT wall time until the first feasible solution, including failed attempts.",
+    ("engine",),
+)
+relaxation_attempts = registry.histogram(
+    "scheduler_solver_relaxation_attempts",
+    "Models solved per run (1 means max_days_per_year was not relaxed).",
+    ("engine",),
+    ATTEMPT_BUCKETS,
+)
+model_variables = registry.histogram(
+    "scheduler_model_variables",
+    "Variables in the last model built per run.",
+    ("engine",),
+    SIZE_BUCKETS,
+)
+model_constraints = registry.histogram(
+    "scheduler_model_constraints",
+    "Constraints (including intervals) in the last model built per run.",
+    ("engine",),
+    SIZE_BUCKETS,
+)
+unassigned_sections = registry.histogram(
+    "scheduler_unassigned_sections",
+    "Sections left UNASSIGNED per section schedule.",
+    ("engine",),
+    UNASSIGNED_BUCKETS,
+)
+
+
+def observe_solve(engine: str, status: Optional[str], stats: Dict[str, Any]) -> None:
+    """Record one ``SchedulingCP.solve`` call from its ``solve_stats``."""
+    solver_runs.inc(engine=engine, status=status or "UNKNOWN")
+    if not stats.get("attempts"):
+        return
+    solve_seconds.observe(stats["solve_seconds"], engine=engine)
+    if stats.get("first_solution_seconds") is not None:
+        first_solution_seconds.observe(stats["first_solution_seconds"], engine=engine)
+    relaxation_attempts.observe(stats["attempts"], engine=engine)
+    model_variables.observe(stats["variables"], engine=engine)
+    model_constraints.observe(stats["constraints"], engine=engine)
+
+
+def observe_sections(engine: str, unassigned: int) -> None:
+    unassigned_sections.observe(unassigned, engine=engine)
+
+
+@registry.collector
+def _admission_metrics() -> Iterable[Tuple[str, str, str, Samples]]:
+    state = admission.snapshot()
+    yield "scheduler_admission_running", "gauge", "Solver runs holding budget.", [
+        ({}, state["running"])
+    ]
+    yield "scheduler_admission_queued", "gauge", "Solver runs waiting for budget.", [
+        ({}, state["queued"])
+    ]
+    yield "scheduler_admission_max_concurrent", "gauge", "Concurrent solver run limit.", [
+        ({}, state["max_concurrent"])
+    ]
+    yield "scheduler_admission_memory_budget_bytes", "gauge", "Solver memory budget.", [
+        ({}, state["memory_budget_bytes"])
+    ]
+    yield "scheduler_admission_memory_reserved_bytes", "gauge", (
+        "Estimated memory of running solver runs."
+    ), [({}, state["memory_reserved_bytes"])]
+    yield "scheduler_admission_estimated", "gauge", (
+        "Summed model-size estimates of running and queued runs."
+    ), [
+        ({"state": key.split("_")[0], "quantity": quantity}, sum(e[quantity] for e in state[key]))
+        for key in ("running_estimates", "queued_estimates")
+        for quantity in ("variables", "constraints", "memory_bytes")
+    ]
+    for counter in ("admitted", "queued", "rejected", "coalesced"):
+        yield f"scheduler_admission_{counter}_total", "counter", (
+            f"Solver runs {counter} since start."
+        ), [({}, state[f"{counter}_total"])]
+
+
+@registry.collector
+def _cache_metrics() -> Iterable[Tuple[str, str, str, Samples]]:
+    yield "scheduler_workbook_cache_lookups_total", "counter", (
+        "Workbook loads by source: memory or disk (hits) and miss (parsed)."
+    ), [({"result": result}, count) for result, count in workbook_cache.lookups().items()]
+
+    totals = compression_stats.snapshot()
+    by_key = [(key.split("/", 1), value) for key, value in totals.items()]
+    yield "scheduler_compression_bodies_total", "counter", (
+        "Request bodies decoded and response bodies encoded."
+    ), [({"direction": d, "encoding": e}, value["count"]) for (d, e), value in by_key]
+    yield "scheduler_compression_bytes_total", "counter", (
+        "Body bytes before (raw) and after (encoded) compression."
+    ), [
+        ({"direction": d, "encoding": e, "form": form}, value[f"{form}_bytes"])
+        for (d, e), value in by_key
+        for form in ("raw", "encoded")
+    ]
+    yield "scheduler_compression_seconds_total", "counter", (
+        "Time spent compressing and decompressing bodies."
+    ), [({"direction": d, "encoding": e}, value["seconds"]) for (d, e), value in by_key]
+
+
+class MetricsMiddleware:
+    """Count requests and time them until the last response byte is sent.
+
+    Requests are labelled with the route template (``/datasets/{campus}``)
+    so the number of series stays bounded; unknown paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Sequence[Any]) -> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route(scope)
+        method = scope["method"]
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_progress.inc(route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_progress.dec(route=route)
+            http_requests.inc(method=method, route=route, status=status)
+            http_request_seconds.observe(time.perf_counter() - start, method=method, route=route)
+
+    def _route(self, scope: Scope) -> str:
+        partial = "unmatched"
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+            if match == Match.PARTIAL and partial == "unmatched":
+                # Path matched but not the method (a 405).
+                partial = getattr(route, "path", "unmatched")
+        return partial
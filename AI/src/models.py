@@ -1,9 +1,19 @@
 """Pydantic models for the CP Scheduler API."""
 
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Type
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, create_model, field_validator, model_validator
+
+from .quality import LATE_MINUTES
+from .recorder import (
+    DEFAULT_ANONYMIZE_FIELDS,
+    DEFAULT_ROUTES,
+    MAX_ARCHIVE_BYTES,
+    MAX_BACKUP_COUNT,
+    MAX_BODY_BYTES,
+)
+from .utils import time_to_minutes
 
 
 class RoomType(str, Enum):
@@ -11,11 +21,95 @@ class RoomType(str, Enum):
     LECTURE = "Lecture"
 
 
+class OutputFormat(str, Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+class ResponseMode(str, Enum):
+    FULL = "full"
+    COMBINED = "combined"
+    INDEXED = "indexed"
+
+
+class SolverEngine(str, Enum):
+    CP = "cp"
+    GA = "ga"
+
+
+class DayHours(BaseModel):
+    start: str = "08:00"
+    end: str = "17:00"
+
+
+class TimeGridConfig(BaseModel):
+    """Time grid shared by the CP and section schedulers."""
+    granularity_minutes: int = Field(default=60, description="Slot size: 30 or 60 minutes")
+    day_start: str = "08:00"
+    day_end: str = "17:00"
+    opening_hours: Dict[str, DayHours] = Field(
+        default_factory=dict, description="Per-day opening hours overriding day_start/day_end"
+    )
+    durations: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Minutes per course type (e.g. Lecture, Lab, Section); "
+        "lectures default to Hours_per_day, sections to 120",
+    )
+    section_start: str = Field(default="09:00", description="First section block start")
+
+    @field_validator("granularity_minutes")
+    @classmethod
+    def validate_granularity(cls, value: int) -> int:
+        if value not in (30, 60):
+            raise ValueError(f"granularity_minutes must be 30 or 60, got {value}")
+        return value
+
+    @model_validator(mode="after")
+    def validate_hours(self) -> "TimeGridConfig":
+        hours = {"default": DayHours(start=self.day_start, end=self.day_end), **self.opening_hours}
+        for day, window in hours.items():
+            if time_to_minutes(window.start) >= time_to_minutes(window.end):
+                raise ValueError(f"Opening hours for {day} must end after they start")
+        return self
+
+
+class GAConfig(BaseModel):
+    """Settings of the genetic algorithm engine."""
+    population_size: int = Field(default=100, ge=10, le=2000)
+    generations: int = Field(default=1000, ge=1, le=100000, description="Per relaxation attempt")
+    mutation_rate: float = Field(
+        default=0.1, gt=0, le=1, description="Chance that a conflicting meeting is moved"
+    )
+    crossover_rate: float = Field(default=0.8, ge=0, le=1)
+    tournament_size: int = Field(default=3, ge=2, le=20)
+    elite_count: int = Field(default=1, ge=0, le=50)
+    islands: int = Field(
+        default=1,
+        ge=1,
+        le=16,
+        description="Independent populations; with more than one, each runs in a worker "
+        "process (up to the CPU count)",
+    )
+    seed: int = Field(default=0, description="Same seed and settings give the same schedule")
+
+
 class CPConfig(BaseModel):
-    """Configuration for the CP-SAT scheduler."""
+    """Configuration for the lecture scheduler (CP-SAT or genetic algorithm)."""
     time_limit_seconds: int = Field(default=300, ge=10, le=3600)
     max_days_per_year: int = Field(default=3, ge=1, le=7)
     relax_if_infeasible: bool = Field(default=True)
+    time_grid: Optional[TimeGridConfig] = None
+    capture_solver_log: bool = Field(
+        default=False, description="Keep the CP-SAT search log; read it from /solves/{solve_id}"
+    )
+    engine: SolverEngine = Field(
+        default=SolverEngine.CP,
+        description="cp: CP-SAT; ga: genetic algorithm with the ga settings. Both use "
+        "time_limit_seconds per max_days_per_year attempt",
+    )
+    ga: Optional[GAConfig] = None
 
 
 class ScheduleEntry(BaseModel):
@@ -82,15 +176,227 @@ class SchedulingDataInput(BaseModel):
     divisions: List[DivisionInput]
 
 
-class ScheduleRequest(BaseModel):
+# --- Columnar payloads: one array per field instead of one object per row ---
+
+
+class ColumnTable(BaseModel):
+    """A table sent as one array per field, all of the same length.
+
+    Subclasses are derived from a row model (see ``_column_table``), so the
+    two payload formats always accept the same fields and types.
+    """
+
+    row_model: ClassVar[Type[BaseModel]]
+
+    @model_validator(mode="after")
+    def validate_lengths(self) -> "ColumnTable":
+        lengths = {name: len(values) for name, values in self if values is not None}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Columns must all have the same length, got {lengths}")
+        return self
+
+    def num_rows(self) -> int:
+        return max((len(values) for _, values in self if values is not None), default=0)
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """Field -> values, with row-model defaults for omitted columns.
+
+        Omitted columns whose default is None are left out, as
+        ``model_dump(exclude_none=True)`` would for row payloads.
+        """
+        num_rows = self.num_rows()
+        columns: Dict[str, List[Any]] = {}
+        for name, field in self.row_model.model_fields.items():
+            values = getattr(self, name)
+            if values is None:
+                if field.default is None:
+                    continue
+                values = [field.default] * num_rows
+            columns[name] = values
+        return columns
+
+
+def _column_table(row_model: Type[BaseModel], name: str) -> Type[ColumnTable]:
+    """Columnar counterpart of ``row_model``: every field becomes a list."""
+    fields: Dict[str, Any] = {}
+    for field_name, field in row_model.model_fields.items():
+        if field.is_required():
+            fields[field_name] = (List[field.annotation], ...)
+        else:
+            fields[field_name] = (Optional[List[field.annotation]], None)
+    table = create_model(name, __base__=ColumnTable, **fields)
+    table.row_model = row_model
+    return table
+
+
+RoomColumns = _column_table(RoomInput, "RoomColumns")
+DoctorColumns = _column_table(DoctorInput, "DoctorColumns")
+DivisionColumns = _column_table(DivisionInput, "DivisionColumns")
+
+
+class CourseColumns(_column_table(CourseInput, "CourseColumnsBase")):
+    @field_validator("Days")
+    @classmethod
+    def validate_days(cls, values: List[int]) -> List[int]:
+        invalid = sorted({value for value in values if value < 1 or value > 6})
+        if invalid:
+            raise ValueError(f"Days must be between 1 and 6, got {invalid}")
+        return values
+
+
+class ColumnarTables(BaseModel):
+    def to_tables(self) -> Dict[str, Dict[str, List[Any]]]:
+        """Table name -> column dict, ready for ``pd.DataFrame``."""
+        return {name: table.to_columns() for name, table in self if table is not None}
+
+
+class ColumnarSchedulingData(ColumnarTables):
+    rooms: RoomColumns
+    courses: CourseColumns
+    doctors: DoctorColumns
+    divisions: DivisionColumns
+
+
+# --- Dataset snapshots (PUT/PATCH /datasets/{campus}) ---
+
+
+class DatasetRef(BaseModel):
+    campus: str
+    version: Optional[int] = Field(default=None, description="Snapshot version; latest if omitted")
+
+
+class DoctorKey(BaseModel):
+    Instructor_ID: str
+    Day: str
+    Start_Time: str
+
+
+class RoomChanges(BaseModel):
+    upsert: List[RoomInput] = Field(default_factory=list, description="Rows matched by Room_ID")
+    delete: List[str] = Field(default_factory=list, description="Room_IDs to remove")
+
+
+class CourseChanges(BaseModel):
+    upsert: List[CourseInput] = Field(
+        default_factory=list, description="Rows matched by Course_ID"
+    )
+    delete: List[str] = Field(default_factory=list, description="Course_IDs to remove")
+
+
+class DoctorChanges(BaseModel):
+    upsert: List[DoctorInput] = Field(
+        default_factory=list, description="Rows matched by Instructor_ID, Day and Start_Time"
+    )
+    delete: List[DoctorKey] = Field(default_factory=list)
+
+
+class DivisionChanges(BaseModel):
+    upsert: List[DivisionInput] = Field(default_factory=list, description="Rows matched by Num_ID")
+    delete: List[str] = Field(default_factory=list, description="Num_IDs to remove")
+
+
+class DatasetChanges(BaseModel):
+    rooms: Optional[RoomChanges] = None
+    courses: Optional[CourseChanges] = None
+    doctors: Optional[DoctorChanges] = None
+    divisions: Optional[DivisionChanges] = None
+
+
+class DatasetPutRequest(BaseModel):
+    data: Optional[SchedulingDataInput] = None
+    columns: Optional[ColumnarSchedulingData] = None
+
+    @model_validator(mode="after")
+    def validate_payload(self) -> "DatasetPutRequest":
+        if (self.data is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of 'data' or 'columns'")
+        return self
+
+
+class DatasetPatchRequest(BaseModel):
+    base_version: Optional[int] = Field(
+        default=None, description="Rejected with 409 unless this is the latest version"
+    )
+    changes: DatasetChanges
+
+
+class DatasetResponse(BaseModel):
+    success: bool
+    message: str
+    campus: str
+    version: int
+    versions: List[int] = Field(default_factory=list, description="Versions still retained")
+    rows: Dict[str, int] = Field(default_factory=dict, description="Rows per table")
+    changes: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict, description="Inserted/updated/deleted rows per table (PATCH)"
+    )
+    elapsed_seconds: float = 0.0
+
+
+class RequestOptions(BaseModel):
+    """Output and diagnostics options shared by the scheduling requests."""
+
+    output_format: Optional[OutputFormat] = Field(
+        default=None, description="Output file format; defaults to the output_path extension"
+    )
+    background_write: bool = Field(
+        default=False,
+        description="Respond before the output file is written; poll /outputs/{output_job_id}",
+    )
+    trace_memory: bool = Field(
+        default=False,
+        description="Record the tracemalloc peak per phase in timings (slower)",
+    )
+    profile: bool = Field(
+        default=False,
+        description="Run under cProfile; download from /debug/profiles/{profile_id}",
+    )
+    validate_result: bool = Field(
+        default=False,
+        description="Check the result with the schedule validator; see validation",
+    )
+    quality_metrics: bool = Field(
+        default=False,
+        description="Compute schedule quality metrics for the result; see quality",
+    )
+
+
+class SectionRequestOptions(RequestOptions):
+    """Also picks which schedule lists a section or combined response carries."""
+
+    response_mode: ResponseMode = Field(
+        default=ResponseMode.FULL,
+        description="full: schedule, cp_schedule and sections_schedule; combined: schedule "
+        "only; indexed: schedule plus cp_range/sections_range into it",
+    )
+
+
+class ScheduleRequest(RequestOptions):
     config: Optional[CPConfig] = None
-    data: SchedulingDataInput = Field(..., description="Scheduling data as JSON")
+    data: Optional[SchedulingDataInput] = Field(
+        default=None, description="Scheduling data as JSON, one object per row"
+    )
+    columns: Optional[ColumnarSchedulingData] = Field(
+        default=None, description="Scheduling data as JSON, one array per field"
+    )
+    dataset: Optional[DatasetRef] = Field(
+        default=None, description="Snapshot stored with PUT /datasets/{campus}"
+    )
     write_output: bool = Field(default=False)
     output_path: Optional[str] = None
 
+    @model_validator(mode="after")
+    def validate_payload(self) -> "ScheduleRequest":
+        if sum(source is not None for source in (self.data, self.columns, self.dataset)) != 1:
+            raise ValueError("Provide exactly one of 'data', 'columns' or 'dataset'")
+        return self
 
-class CPFileScheduleRequest(BaseModel):
+
+class CPFileScheduleRequest(RequestOptions):
     data_path: Optional[str] = Field(default=None, description="Path to Data.xlsx")
+    data_upload_id: Optional[str] = Field(
+        default=None, description="Id from /uploads/data; takes precedence over data_path"
+    )
     output_path: Optional[str] = Field(
         default=None,
         description="Path for Schedule_Output_CP.xlsx",
@@ -106,14 +412,115 @@ class ScheduleResponse(BaseModel):
     total_assignments: int = 0
     solver_status: Optional[str] = None
     max_days_per_year_used: Optional[int] = None
+    solve_id: Optional[str] = Field(
+        default=None, description="Solver statistics and log; see /solves/{solve_id}"
+    )
+    solver_stats: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Last attempt: branches, conflicts, wall time, model size before/after "
+        "presolve (GA: generations and violations by kind)",
+    )
     output_path: Optional[str] = None
+    output_job_id: Optional[str] = Field(
+        default=None, description="Background write job; see /outputs/{output_job_id}"
+    )
+    output_status: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    workbook_cache: Optional[Dict[str, str]] = Field(
+        default=None, description="Parsed-workbook cache status per file (hit/miss)"
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None, description="Seconds (and peak_bytes when traced) per phase"
+    )
+    profile_id: Optional[str] = Field(
+        default=None, description="cProfile capture; see /debug/profiles/{profile_id}"
+    )
+    validation: Optional[Dict[str, Any]] = Field(
+        default=None, description="Validator report, when validate_result was set"
+    )
+    quality: Optional[Dict[str, Any]] = Field(
+        default=None, description="Quality metrics, when quality_metrics was set"
+    )
+
+
+class UploadResponse(BaseModel):
+    success: bool
+    message: str
+    upload_id: str
+    filename: Optional[str] = None
+    size_bytes: int = 0
+    sheets: Dict[str, int] = Field(default_factory=dict, description="Rows per sheet")
     elapsed_seconds: float = 0.0
 
 
+class OutputJobResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="pending, writing, done or failed")
+    requested_path: str
+    output_path: Optional[str] = Field(
+        default=None, description="Path actually written (may be a timestamped fallback)"
+    )
+    error: Optional[str] = None
+    write_seconds: Optional[float] = None
+
+
+class SolveResponse(BaseModel):
+    solve_id: str
+    engine: str = Field(..., description="cp, joint or ga")
+    status: Optional[str] = None
+    created_at: float
+    attempts: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Statistics per max_days_per_year attempt"
+    )
+    log: Optional[List[str]] = Field(
+        default=None,
+        description="CP-SAT search log (GA: progress per migration), when capture_solver_log "
+        "was set",
+    )
+    log_dropped_lines: int = Field(default=0, description="Lines cut from the middle of the log")
+
+
+class RecorderConfig(BaseModel):
+    enabled: bool
+    directory: str = Field(
+        default="", description="Archive directory, relative to data/Processed Data/recordings"
+    )
+    routes: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_ROUTES), description="POST routes to record"
+    )
+    anonymize_fields: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_ANONYMIZE_FIELDS),
+        description="Fields replaced by a salted hash wherever they appear, in addition to "
+        "the default names and ids",
+    )
+    keep_default_anonymize: bool = Field(
+        default=True,
+        description="False hashes only anonymize_fields, leaving instructor and assistant "
+        "names and ids in the archive",
+    )
+    max_bytes: int = Field(
+        default=50 * 1024 * 1024,
+        ge=1024,
+        le=MAX_ARCHIVE_BYTES,
+        description="Rotate after this size",
+    )
+    backup_count: int = Field(
+        default=5, ge=0, le=MAX_BACKUP_COUNT, description="Rotated files kept"
+    )
+    max_body_bytes: int = Field(
+        default=20 * 1024 * 1024,
+        ge=0,
+        le=MAX_BODY_BYTES,
+        description="Larger bodies are recorded without the request",
+    )
+
+
 class HealthResponse(BaseModel):
     status: str
     message: str
     version: str = "2.0.0"
+    # Solver queue depth, reserved budget and recent model-size estimates.
+    admission: Optional[Dict[str, Any]] = None
 
 
 # --- Section scheduling models (Final S Cp) ---
@@ -160,30 +567,86 @@ class SectionDataInput(BaseModel):
     divisions: List[DivisionInput]
     courses: List[CourseInput]
     doctors: List[DoctorInput]
+    previous_schedule: Optional[List[CPScheduleEntryInput]] = Field(
+        default=None,
+        description="Previous combined schedule; unaffected sections keep their slots",
+    )
+
 
+CPScheduleColumns = _column_table(CPScheduleEntryInput, "CPScheduleColumns")
+SectionRoomColumns = _column_table(SectionRoomInput, "SectionRoomColumns")
+SectionColumns = _column_table(SectionInput, "SectionColumns")
+AssistantColumns = _column_table(AssistantInput, "AssistantColumns")
 
-class SectionScheduleRequest(BaseModel):
-    data: SectionDataInput = Field(..., description="CP schedule and section data as JSON")
+
+class ColumnarSectionData(ColumnarTables):
+    cp_schedule: CPScheduleColumns
+    rooms: SectionRoomColumns
+    sections: SectionColumns
+    assistants: AssistantColumns
+    divisions: DivisionColumns
+    courses: CourseColumns
+    doctors: DoctorColumns
+    previous_schedule: Optional[CPScheduleColumns] = Field(
+        default=None,
+        description="Previous combined schedule; unaffected sections keep their slots",
+    )
+
+
+class SectionScheduleRequest(SectionRequestOptions):
+    data: Optional[SectionDataInput] = Field(
+        default=None, description="CP schedule and section data as JSON, one object per row"
+    )
+    columns: Optional[ColumnarSectionData] = Field(
+        default=None, description="CP schedule and section data as JSON, one array per field"
+    )
     write_output: bool = Field(default=False)
     output_path: Optional[str] = None
+    time_grid: Optional[TimeGridConfig] = None
+
+    @model_validator(mode="after")
+    def validate_payload(self) -> "SectionScheduleRequest":
+        if (self.data is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of 'data' or 'columns'")
+        return self
 
 
-class SectionFileScheduleRequest(BaseModel):
+class SectionFileScheduleRequest(SectionRequestOptions):
     cp_output_path: Optional[str] = None
     sdata_path: Optional[str] = None
     data_path: Optional[str] = None
+    sdata_upload_id: Optional[str] = Field(default=None, description="Id from /uploads/sdata")
+    data_upload_id: Optional[str] = Field(default=None, description="Id from /uploads/data")
     output_path: Optional[str] = None
+    previous_output_path: Optional[str] = Field(
+        default=None,
+        description="Previous Schedule_Output_S.xlsx for incremental re-placement",
+    )
     write_output: bool = Field(default=True)
+    time_grid: Optional[TimeGridConfig] = None
 
 
-class FullScheduleFileRequest(BaseModel):
+class FullScheduleFileRequest(SectionRequestOptions):
     """Run CP then section scheduling from Excel files."""
     data_path: Optional[str] = None
     sdata_path: Optional[str] = None
+    data_upload_id: Optional[str] = Field(default=None, description="Id from /uploads/data")
+    sdata_upload_id: Optional[str] = Field(default=None, description="Id from /uploads/sdata")
     cp_output_path: Optional[str] = None
     output_path: Optional[str] = None
     write_output: bool = Field(default=True)
     cp_config: Optional[CPConfig] = None
+    joint_solve: bool = Field(
+        default=False,
+        description="Place lectures and sections in one CP-SAT model "
+        "(sections are optional, lower-priority intervals)",
+    )
+
+    @model_validator(mode="after")
+    def validate_engine(self) -> "FullScheduleFileRequest":
+        if self.joint_solve and self.cp_config and self.cp_config.engine != SolverEngine.CP:
+            raise ValueError("joint_solve needs cp_config.engine 'cp'")
+        return self
 
 
 class SectionScheduleEntry(BaseModel):
@@ -204,12 +667,39 @@ class SectionScheduleResponse(BaseModel):
     schedule: List[SectionScheduleEntry] = []
     cp_schedule: List[SectionScheduleEntry] = []
     sections_schedule: List[SectionScheduleEntry] = []
+    cp_range: Optional[List[int]] = Field(
+        default=None, description="[start, end) of the CP rows in schedule (indexed mode)"
+    )
+    sections_range: Optional[List[int]] = Field(
+        default=None, description="[start, end) of the section rows in schedule (indexed mode)"
+    )
     cp_rows: int = 0
     section_rows: int = 0
     total_rows: int = 0
     unassigned_sections: int = 0
+    moved_sections: Optional[int] = None
+    unchanged_sections: Optional[int] = None
     output_path: Optional[str] = None
+    output_job_id: Optional[str] = Field(
+        default=None, description="Background write job; see /outputs/{output_job_id}"
+    )
+    output_status: Optional[str] = None
     elapsed_seconds: float = 0.0
+    workbook_cache: Optional[Dict[str, str]] = Field(
+        default=None, description="Parsed-workbook cache status per file (hit/miss)"
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None, description="Seconds (and peak_bytes when traced) per phase"
+    )
+    profile_id: Optional[str] = Field(
+        default=None, description="cProfile capture; see /debug/profiles/{profile_id}"
+    )
+    validation: Optional[Dict[str, Any]] = Field(
+        default=None, description="Validator report, when validate_result was set"
+    )
+    quality: Optional[Dict[str, Any]] = Field(
+        default=None, description="Quality metrics, when quality_metrics was set"
+    )
 
 
 class FullScheduleResponse(BaseModel):
@@ -217,3 +707,66 @@ class FullScheduleResponse(BaseModel):
     message: str
     cp_result: ScheduleResponse
     section_result: SectionScheduleResponse
+    timings: Optional[Dict[str, Any]] = Field(
+        default=None, description="Seconds (and peak_bytes when traced) per phase"
+    )
+    profile_id: Optional[str] = Field(
+        default=None, description="cProfile capture; see /debug/profiles/{profile_id}"
+    )
+
+
+class ScheduleValidationRequest(BaseModel):
+    """Any lecture, section or combined schedule, in API or workbook row shape."""
+    schedule: List[Dict[str, Any]]
+    rooms: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Room rows (Room, Capacity) for the capacity check"
+    )
+    doctors: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Availability rows for the instructor-hours check"
+    )
+    courses: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Course rows; fill in the year of rows without one"
+    )
+    time_grid: Optional[TimeGridConfig] = None
+    max_findings: int = Field(default=100, ge=0, le=10000, description="Findings listed per kind")
+
+
+class ScheduleValidationResponse(BaseModel):
+    success: bool
+    message: str
+    valid: bool
+    rows: int = 0
+    checked_rows: int = Field(default=0, description="Rows with a day and time")
+    unassigned_rows: int = 0
+    counts: Dict[str, int] = Field(default_factory=dict, description="Conflicts per kind")
+    conflicts: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+class ScheduleQualityRequest(BaseModel):
+    """Any lecture, section or combined schedule, in API or workbook row shape."""
+    schedule: List[Dict[str, Any]]
+    rooms: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Room rows (Room, Capacity) for capacity fill and unused rooms"
+    )
+    courses: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Course rows; fill in the year of rows without one"
+    )
+    time_grid: Optional[TimeGridConfig] = None
+    late_minutes: int = Field(
+        default=LATE_MINUTES, ge=0, le=24 * 60, description="Late slots: start this close to closing"
+    )
+
+
+class ScheduleQualityResponse(BaseModel):
+    success: bool
+    message: str
+    summary: Dict[str, Any] = Field(default_factory=dict, description="Scalar figures")
+    divisions: List[Dict[str, Any]] = []
+    instructors: List[Dict[str, Any]] = []
+    assistants: List[Dict[str, Any]] = []
+    rooms: List[Dict[str, Any]] = []
+    utilization_by_day_hour: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Share of room time in use, per day and hour"
+    )
+    elapsed_seconds: float = 0.0
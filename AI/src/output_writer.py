@@ -0,0 +1,83 @@
+"""Background pool that persists schedule outputs after the response is sent."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+class OutputWriter:
+    """Run output writes on a dedicated thread pool and track them by job id.
+
+    Writers are expected to be atomic (``write_schedule`` renames a temp file
+    into place), so a reader never sees a half-written file.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 256) -> None:
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="schedule-writer"
+        )
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, requested_path: Path, write: Callable[[], Path]) -> str:
+        """Queue ``write`` (which returns the path it wrote) and return a job id."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "pending",
+            "requested_path": str(Path(requested_path).resolve()),
+            "output_path": None,
+            "error": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                old_id, _ = self._jobs.popitem(last=False)
+                self._futures.pop(old_id, None)
+            self._futures[job_id] = self._executor.submit(self._run, job, write)
+        return job_id
+
+    def _run(self, job: Dict[str, Any], write: Callable[[], Path]) -> None:
+        with self._lock:
+            job["status"] = "writing"
+            job["started_at"] = time.time()
+        try:
+            written_path = write()
+            update = {"status": "done", "output_path": str(Path(written_path).resolve())}
+        except Exception as exc:
+            print(f"Error writing schedule output {job['requested_path']}: {exc}")
+            update = {"status": "failed", "error": str(exc)}
+        with self._lock:
+            job.update(update, finished_at=time.time())
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait_for_path(self, path: Path, timeout: Optional[float] = None) -> None:
+        """Block until queued writes to ``path`` have finished."""
+        target = str(Path(path).resolve())
+        with self._lock:
+            pending = [
+                self._futures[job_id]
+                for job_id, job in self._jobs.items()
+                if job["requested_path"] == target and job_id in self._futures
+            ]
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def shutdown(self, wait_for_jobs: bool = True) -> None:
+        self._executor.shutdown(wait=wait_for_jobs)
+
+
+output_writer = OutputWriter()
@@ -0,0 +1,148 @@
+"""On-demand cProfile capture for single requests and the CLIs."""
+
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls")
+
+
+class RequestProfile:
+    """cProfile data for one request, merged from every profiled call.
+
+    cProfile only sees the thread it is enabled in, so each threadpool call
+    of the request gets its own profiler and the results are added up here.
+    Time spent inside CP-SAT shows as the ``Solve`` call itself.
+    """
+
+    def __init__(self, route: str) -> None:
+        self.profile_id = uuid.uuid4().hex
+        self.route = route
+        self.created_at = time.time()
+        self.profiled_seconds = 0.0
+        self.calls = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func`` under a fresh profiler and merge its stats."""
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            self._add(profiler, time.perf_counter() - started)
+
+    def _add(self, profiler: cProfile.Profile, seconds: float) -> None:
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler, stream=io.StringIO())
+            else:
+                self._stats.add(profiler)
+            self.profiled_seconds += seconds
+            self.calls += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "route": self.route,
+            "created_at": self.created_at,
+            "profiled_seconds": self.profiled_seconds,
+            "calls": self.calls,
+        }
+
+    def render(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """The ``pstats`` table of the top ``limit`` functions."""
+        with self._lock:
+            if self._stats is None:
+                return "No profiled calls.\n"
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats(sort).print_stats(limit)
+            return stream.getvalue()
+
+    def dump(self) -> bytes:
+        """Stats in the ``pstats`` file format (``Stats(path)``, snakeviz)."""
+        with self._lock:
+            if self._stats is None:
+                return marshal.dumps({})
+            return marshal.dumps(self._stats.stats)
+
+
+class ProfileStore:
+    """The last ``max_profiles`` request profiles, by profile id."""
+
+    def __init__(self, max_profiles: int = 32) -> None:
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+_active: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def profiling(enabled: bool, route: str) -> Iterator[Optional[RequestProfile]]:
+    """Profile ``run_profiled`` calls made inside the block; stored when it exits."""
+    if not enabled:
+        yield None
+        return
+    profile = RequestProfile(route)
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+        profile_store.save(profile)
+
+
+async def run_profiled(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """``run_in_threadpool``, profiled when the request asked for it.
+
+    The worker thread inherits the caller's context, so the active profile
+    is visible there.
+    """
+    profile = _active.get()
+    if profile is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await run_in_threadpool(profile.call, func, *args, **kwargs)
+
+
+def print_profile(profiler: cProfile.Profile, path: Optional[str], limit: int = 25) -> None:
+    """CLI helper: write the pstats file (if ``path``) and print the top functions."""
+    stats = pstats.Stats(profiler)
+    if path:
+        stats.dump_stats(path)
+        print(f"Profile written to {path}")
+    stats.sort_stats("cumulative").print_stats(limit)
+
+
+profile_store = ProfileStore()
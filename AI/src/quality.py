@@ -0,0 +1,269 @@
+"""Quality metrics of a lecture, section or combined schedule.
+
+Everything is a group-by over the integer-coded columns of
+``validator.normalize_schedule``, so large schedules stay cheap:
+
+- divisions (major, year): days on campus, busy minutes, and idle gaps
+  between meetings on the same day. Parallel sections of a division count
+  once, so a gap is time when nothing of the division runs.
+- instructors (lectures) and assistants (sections): load in meetings and
+  minutes, spread as days taught and the busiest day.
+- rooms: used share of the opening hours, per room and per day and hour,
+  and students over seats (needs ``rooms``).
+- late slots: meetings that start in the last ``late_minutes`` of their day.
+
+``summary`` holds the scalar figures, for comparing schedules or engines.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .instance import DEFAULT_DAYS
+from .section_utils import find_column
+from .time_grid import TimeGrid
+from .validator import group_codes, normalize_schedule, room_seats
+
+# Meetings starting this close to closing time use a late slot.
+LATE_MINUTES = 120
+
+# Minutes reserved per (entity, day) group when sorting; more than a day.
+_DAY_SPAN = 1 << 11
+
+_ACTIVITY_COLUMNS = [
+    "meetings",
+    "minutes",
+    "busy_minutes",
+    "days",
+    "busiest_day_minutes",
+    "idle_minutes",
+    "gaps",
+]
+
+
+def schedule_quality(
+    schedule: pd.DataFrame,
+    rooms: Optional[pd.DataFrame] = None,
+    courses: Optional[pd.DataFrame] = None,
+    time_grid: Optional[TimeGrid] = None,
+    late_minutes: int = LATE_MINUTES,
+) -> Dict[str, Any]:
+    """Summary figures plus per-division, per-person and per-room tables.
+
+    ``rooms`` adds capacity fill and counts unused rooms in utilization;
+    ``courses`` fills in the year of rows without one, as in the validator.
+    """
+    started = time.perf_counter()
+    grid = time_grid or TimeGrid()
+    frame, codes = normalize_schedule(schedule, courses)
+    keep = frame["placed"].to_numpy()
+    rows = frame[keep].reset_index(drop=True)
+    codes = {name: values[keep] for name, values in codes.items()}
+    lecture = (rows["assistant"] == "").to_numpy()
+    opens, closes = _day_hours(rows["day"], grid)
+
+    divisions = _activity(
+        rows, codes, ["major", "year"], ((rows["major"] != "") & (rows["year"] != "")).to_numpy()
+    )
+    instructors = _activity(
+        rows, codes, ["instructor"], lecture & (rows["instructor"] != "").to_numpy()
+    )
+    assistants = _activity(rows, codes, ["assistant"], ~lecture)
+
+    seats = room_seats(rows, rooms)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fill = np.where(seats > 0, rows["students"].to_numpy() / seats, np.nan)
+    room_table, room_count, open_minutes = _room_usage(rows, fill, rooms, opens, closes)
+    by_hour = _usage_by_hour(rows, opens, closes, room_count)
+
+    late = rows["start"].to_numpy() >= closes - late_minutes
+    used = room_table["used_minutes"].sum()
+    summary = {
+        "meetings": len(rows),
+        "unassigned_rows": int((~keep).sum()),
+        "divisions": len(divisions),
+        **_describe(divisions["days"], "division_days"),
+        "division_idle_minutes": int(divisions["idle_minutes"].sum()),
+        "division_gaps": int(divisions["gaps"].sum()),
+        **_describe(instructors["minutes"], "instructor_minutes"),
+        **_describe(instructors["days"], "instructor_days"),
+        **_describe(assistants["minutes"], "assistant_minutes"),
+        "rooms_used": int((room_table["meetings"] > 0).sum()),
+        "room_utilization": _number(used / (room_count * open_minutes))
+        if room_count and open_minutes
+        else None,
+        **_describe(pd.Series(fill).dropna(), "capacity_fill"),
+        "late_meetings": int(late.sum()),
+        "late_share": _number(late.mean()) if len(rows) else None,
+        "late_lectures": int((late & lecture).sum()),
+        "late_sections": int((late & ~lecture).sum()),
+    }
+    return {
+        "summary": summary,
+        "divisions": _records(divisions),
+        "instructors": _records(instructors),
+        "assistants": _records(assistants),
+        "rooms": _records(room_table),
+        "utilization_by_day_hour": by_hour,
+        "elapsed_seconds": time.perf_counter() - started,
+    }
+
+
+def _day_hours(days: pd.Series, grid: TimeGrid) -> tuple[np.ndarray, np.ndarray]:
+    hours = {day: grid.hours_for(day) for day in days.unique()}
+    opens = days.map({day: value[0] for day, value in hours.items()})
+    closes = days.map({day: value[1] for day, value in hours.items()})
+    return opens.to_numpy(dtype=np.int64), closes.to_numpy(dtype=np.int64)
+
+
+def _activity(
+    rows: pd.DataFrame, codes: Dict[str, np.ndarray], keys: List[str], mask: np.ndarray
+) -> pd.DataFrame:
+    """One row per value of ``keys`` among the ``mask`` rows, with ``_ACTIVITY_COLUMNS``."""
+    idx = np.flatnonzero(mask)
+    if not len(idx):
+        return pd.DataFrame(columns=[*keys, *_ACTIVITY_COLUMNS])
+    subset = {name: codes[name][idx] for name in [*keys, "day"]}
+    entity = group_codes(subset, keys)
+    entity_day = group_codes(subset, [*keys, "day"])
+    start = rows["start"].to_numpy()[idx]
+    end = rows["end"].to_numpy()[idx]
+
+    # Sweep each (entity, day) in start order; a gap is a start after
+    # everything before it on that day has ended. Group codes rank their key
+    # combinations, so the sort also makes each entity's rows contiguous.
+    order = np.argsort(entity_day * _DAY_SPAN + start, kind="stable")
+    entity_day, entity, start, end = entity_day[order], entity[order], start[order], end[order]
+    base = entity_day * _DAY_SPAN
+    reach = np.maximum.accumulate(base + end)
+    before = np.concatenate(([-1], reach[:-1]))
+    gap = np.where(before >= base, np.maximum(base + start - before, 0), 0)
+
+    day_first = np.flatnonzero(np.diff(entity_day, prepend=-1))
+    day_idle = np.add.reduceat(gap, day_first)
+    # Starts are sorted, so the first start is the day's earliest.
+    day_busy = np.maximum.reduceat(end, day_first) - start[day_first] - day_idle
+    entity_first = np.flatnonzero(np.diff(entity[day_first], prepend=-1))
+    meetings = np.diff(np.append(day_first, len(start)))
+
+    def per_entity(values: np.ndarray, ufunc: np.ufunc = np.add) -> np.ndarray:
+        return ufunc.reduceat(values, entity_first)
+
+    table = pd.DataFrame(
+        {
+            key: rows[key].to_numpy()[idx][order][day_first][entity_first]
+            for key in keys
+        }
+    )
+    table["meetings"] = per_entity(meetings)
+    table["minutes"] = per_entity(np.add.reduceat(end - start, day_first))
+    table["busy_minutes"] = per_entity(day_busy)
+    table["days"] = np.diff(np.append(entity_first, len(day_first)))
+    table["busiest_day_minutes"] = per_entity(day_busy, np.maximum)
+    table["idle_minutes"] = per_entity(day_idle)
+    table["gaps"] = per_entity(np.add.reduceat((gap > 0).astype(np.int64), day_first))
+    return table
+
+
+def _room_usage(
+    rows: pd.DataFrame,
+    fill: np.ndarray,
+    rooms: Optional[pd.DataFrame],
+    opens: np.ndarray,
+    closes: np.ndarray,
+) -> tuple[pd.DataFrame, int, int]:
+    """Per-room usage, the number of rooms, and the opening minutes of the scheduled days."""
+    booked = (rows["room"] != "").to_numpy()
+    days = pd.DataFrame({"day": rows["day"], "open": closes - opens}).drop_duplicates("day")
+    open_minutes = int(days["open"].sum())
+
+    table = (
+        pd.DataFrame(
+            {
+                "room": rows["room"].to_numpy()[booked],
+                "minutes": (rows["end"] - rows["start"]).to_numpy()[booked],
+                "fill": fill[booked],
+            }
+        )
+        .groupby("room", sort=False)
+        .agg(
+            meetings=("minutes", "size"),
+            used_minutes=("minutes", "sum"),
+            mean_fill=("fill", "mean"),
+        )
+    )
+    if rooms is not None and len(rooms):
+        room_col = find_column(rooms, ["Room"], required=False)
+        if room_col:
+            names = rooms[room_col].dropna().astype(str).str.strip().drop_duplicates()
+            table = table.reindex(table.index.union(pd.Index(names), sort=False))
+            counts = ["meetings", "used_minutes"]
+            table[counts] = table[counts].fillna(0).astype(np.int64)
+    table["utilization"] = table["used_minutes"] / open_minutes if open_minutes else np.nan
+    table = table.rename_axis("room").reset_index()
+    return table, len(table), open_minutes
+
+
+def _usage_by_hour(
+    rows: pd.DataFrame, opens: np.ndarray, closes: np.ndarray, room_count: int
+) -> Dict[str, Dict[str, float]]:
+    """Share of room-minutes in use for each opening hour of each scheduled day."""
+    booked = np.flatnonzero((rows["room"] != "").to_numpy())
+    if not room_count or not len(rows):
+        return {}
+    day_codes, day_names = pd.factorize(rows["day"])
+    start = rows["start"].to_numpy()[booked]
+    end = rows["end"].to_numpy()[booked]
+
+    # Split each meeting into the clock hours it touches.
+    first = start // 60
+    spans = (end - 1) // 60 - first + 1
+    meeting = np.repeat(np.arange(len(booked)), spans)
+    hour = first[meeting] + np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    minutes = np.minimum(end[meeting], (hour + 1) * 60) - np.maximum(start[meeting], hour * 60)
+    used = np.bincount(
+        day_codes[booked][meeting] * 24 + hour, weights=minutes, minlength=len(day_names) * 24
+    ).reshape(len(day_names), 24)
+
+    hours_by_day = pd.DataFrame({"code": day_codes, "open": opens, "close": closes})
+    hours_by_day = hours_by_day.drop_duplicates("code").set_index("code")
+    week = {day: position for position, day in enumerate(DEFAULT_DAYS)}
+    result = {}
+    for code in sorted(range(len(day_names)), key=lambda code: week.get(day_names[code], 99)):
+        open_hour = hours_by_day.at[code, "open"] // 60
+        close_hour = -(-hours_by_day.at[code, "close"] // 60)
+        result[day_names[code]] = {
+            f"{hour:02d}:00": round(float(used[code, hour]) / (room_count * 60), 4)
+            for hour in range(open_hour, close_hour)
+        }
+    return result
+
+
+def _describe(values: pd.Series, prefix: str) -> Dict[str, Optional[float]]:
+    values = values.astype(float)
+    if not len(values):
+        return {f"{prefix}_mean": None, f"{prefix}_max": None, f"{prefix}_std": None}
+    return {
+        f"{prefix}_mean": _number(values.mean()),
+        f"{prefix}_max": _number(values.max()),
+        f"{prefix}_std": _number(values.std(ddof=0)),
+    }
+
+
+def _number(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+def _records(table: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as JSON-ready dicts, with None for NaN."""
+    columns = []
+    for name in table.columns:
+        values = table[name].to_numpy()
+        if values.dtype.kind == "f":
+            values = np.where(np.isnan(values), None, values.round(4))
+        columns.append(values.tolist())
+    names = list(table.columns)
+    return [dict(zip(names, values)) for values in zip(*columns)]
@@ -0,0 +1,291 @@
+"""Opt-in recording of scheduling requests to a rotating JSONL archive.
+
+Each line holds one request body (with the configured fields anonymized),
+its route and HTTP status, and the result figures the route noted:
+solver status, counts, timings and solver statistics. ``benchmarks.replay``
+re-runs archived requests against the current code.
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ARCHIVE_NAME = "requests.jsonl"
+
+# Archives are only written below this directory.
+RECORDINGS_DIR = Path("data/Processed Data/recordings")
+MAX_ARCHIVE_BYTES = 500 * 1024 * 1024
+MAX_BACKUP_COUNT = 20
+MAX_BODY_BYTES = 100 * 1024 * 1024
+
+DEFAULT_ROUTES = (
+    "/cp/generate",
+    "/cp/generate/stream",
+    "/sections/generate",
+    "/sections/generate/stream",
+)
+# Names and ids of people. Values are replaced by a salted hash, so rows
+# that refer to the same instructor still match after anonymization. These
+# are always anonymized; configured fields are added to them.
+DEFAULT_ANONYMIZE_FIELDS = ("Instructor_Name", "Instructor_ID", "Assistant_Name", "Assistant_ID")
+
+# Response fields kept with the recorded request.
+RESULT_FIELDS = (
+    "success",
+    "solver_status",
+    "max_days_per_year_used",
+    "total_assignments",
+    "cp_rows",
+    "section_rows",
+    "total_rows",
+    "unassigned_sections",
+    "elapsed_seconds",
+    "timings",
+    "solver_stats",
+)
+
+_result: ContextVar[Optional[Dict[str, Any]]] = ContextVar("recorded_result", default=None)
+
+
+class RequestRecorder:
+    """Writes recorded requests to ``directory``; disabled while ``directory`` is None.
+
+    The archive rotates like ``RotatingFileHandler``: ``requests.jsonl`` is
+    current, ``requests.jsonl.1`` the previous file, and so on up to
+    ``backup_count``.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        routes: Sequence[str] = DEFAULT_ROUTES,
+        anonymize_fields: Sequence[str] = DEFAULT_ANONYMIZE_FIELDS,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_body_bytes: int = 20 * 1024 * 1024,
+        keep_default_anonymize: bool = True,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._handler: Optional[RotatingFileHandler] = None
+        self._salt = secrets.token_hex(8)
+        self.recorded = 0
+        self.failed = 0
+        self.configure(
+            directory,
+            routes,
+            anonymize_fields,
+            max_bytes,
+            backup_count,
+            max_body_bytes,
+            keep_default_anonymize,
+        )
+
+    def configure(
+        self,
+        directory: Optional[str],
+        routes: Sequence[str] = DEFAULT_ROUTES,
+        anonymize_fields: Sequence[str] = DEFAULT_ANONYMIZE_FIELDS,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_body_bytes: int = 20 * 1024 * 1024,
+        keep_default_anonymize: bool = True,
+    ) -> None:
+        """Start recording to ``directory`` under ``RECORDINGS_DIR`` (or stop, with None).
+
+        ``anonymize_fields`` are hashed on top of ``DEFAULT_ANONYMIZE_FIELDS``
+        unless ``keep_default_anonymize`` is False. Raises ValueError for a
+        directory outside ``RECORDINGS_DIR`` or limits above the ``MAX_*`` caps.
+        """
+        if not 0 < max_bytes <= MAX_ARCHIVE_BYTES:
+            raise ValueError(f"max_bytes must be between 1 and {MAX_ARCHIVE_BYTES}")
+        if not 0 <= backup_count <= MAX_BACKUP_COUNT:
+            raise ValueError(f"backup_count must be between 0 and {MAX_BACKUP_COUNT}")
+        if not 0 <= max_body_bytes <= MAX_BODY_BYTES:
+            raise ValueError(f"max_body_bytes must be between 0 and {MAX_BODY_BYTES}")
+        handler = None
+        if directory is not None:
+            directory = str(recording_directory(directory))
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                Path(directory) / ARCHIVE_NAME,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+        with self._lock:
+            if self._handler is not None:
+                self._handler.close()
+            self._handler = handler
+            self.directory = directory
+            self.routes = frozenset(routes)
+            self.anonymize_fields = frozenset(anonymize_fields)
+            if keep_default_anonymize:
+                self.anonymize_fields |= frozenset(DEFAULT_ANONYMIZE_FIELDS)
+            self.max_bytes = max_bytes
+            self.backup_count = backup_count
+            self.max_body_bytes = max_body_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self._handler is not None
+
+    def should_record(self, method: str, path: str) -> bool:
+        return self.enabled and method == "POST" and path in self.routes
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "routes": sorted(self.routes),
+            "anonymize_fields": sorted(self.anonymize_fields),
+            "max_bytes": self.max_bytes,
+            "backup_count": self.backup_count,
+            "max_body_bytes": self.max_body_bytes,
+            "recorded": self.recorded,
+            "failed": self.failed,
+        }
+
+    def anonymize(self, value: Any) -> Any:
+        """``value`` with every configured field replaced by a stable token.
+
+        Works on row tables (lists of objects) and column tables (a list of
+        values per field) alike.
+        """
+        if isinstance(value, dict):
+            return {
+                key: self._token_all(item) if key in self.anonymize_fields else self.anonymize(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.anonymize(item) for item in value]
+        return value
+
+    def _token_all(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._token_all(item) for item in value]
+        if isinstance(value, str) and value:
+            digest = hashlib.sha256(f"{self._salt}:{value}".encode()).hexdigest()
+            return f"anon-{digest[:12]}"
+        return value
+
+    def write(self, record: Dict[str, Any], body: Optional[bytes]) -> None:
+        """Anonymize ``body`` into ``record`` and append it to the archive."""
+        handler = self._handler
+        if handler is None:
+            return
+        try:
+            request = None
+            if body is not None:
+                request = self.anonymize(json.loads(body))
+            line = json.dumps({**record, "request": request}, default=str)
+            with self._lock:
+                handler.emit(logging.makeLogRecord({"msg": line}))
+                self.recorded += 1
+        except Exception as exc:
+            self.failed += 1
+            print(f"Request recording failed for {record.get('route')}: {exc}")
+
+
+def note_result(fields: Dict[str, Any]) -> None:
+    """Keep the ``RESULT_FIELDS`` of a response for the request being recorded, if any."""
+    result = _result.get()
+    if result is not None:
+        result.update({name: fields[name] for name in RESULT_FIELDS if name in fields})
+
+
+class RecorderMiddleware:
+    """Buffers the body of recorded routes and archives it once the response is sent.
+
+    The body is read up front and handed to the app unchanged; bodies over
+    ``max_body_bytes`` are recorded without the request.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: "RequestRecorder") -> None:
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.recorder.should_record(
+            scope["method"], scope["path"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        messages = []
+        size = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            size += len(message.get("body", b""))
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                break
+        pending = iter(messages)
+
+        async def replay_receive() -> Message:
+            return next(pending, None) or await receive()
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        result: Dict[str, Any] = {}
+        token = _result.set(result)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        finally:
+            _result.reset(token)
+            record = {
+                "recorded_at": time.time(),
+                "route": scope["path"],
+                "status": status,
+                "duration_seconds": time.perf_counter() - started,
+                "body_bytes": size,
+                "result": result,
+            }
+            body = _join(messages) if size <= self.recorder.max_body_bytes else None
+            await run_in_threadpool(self.recorder.write, record, body)
+
+
+def _join(messages: Iterable[Message]) -> bytes:
+    return b"".join(message.get("body", b"") for message in messages)
+
+
+def recording_directory(directory: str) -> Path:
+    """``directory`` resolved under ``RECORDINGS_DIR``; ValueError if it leads outside."""
+    base = RECORDINGS_DIR.resolve()
+    path = (base / directory).resolve()
+    if path != base and base not in path.parents:
+        raise ValueError(f"Recording directory must be inside {RECORDINGS_DIR}")
+    return path
+
+
+def read_archive(directory: Path) -> Iterable[Dict[str, Any]]:
+    """Archived records, oldest file first."""
+    files = sorted(
+        Path(directory).glob(f"{ARCHIVE_NAME}*"),
+        key=lambda path: -int(path.suffix[1:]) if path.suffix[1:].isdigit() else 0,
+    )
+    for path in files:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+request_recorder = RequestRecorder()
@@ -1,17 +1,21 @@
 """CLI entry point for CP scheduling (Final CP notebook equivalent)."""
 
 import argparse
+import cProfile
 from pathlib import Path
 
 from .data_loader import DEFAULT_CP_OUTPUT_PATH, DEFAULT_DATA_PATH, DataLoader
-from .models import CPConfig
+from .ga_scheduler import SchedulingGA
+from .models import CPConfig, GAConfig, SolverEngine, TimeGridConfig
+from .profiling import print_profile
 from .scheduler import SchedulingCP
+from .time_grid import TimeGrid
 
 
 def main() -> None:
     project_root = Path(__file__).resolve().parent.parent
     parser = argparse.ArgumentParser(
-        description="Generate lecture schedule using OR-Tools CP-SAT."
+        description="Generate lecture schedule using OR-Tools CP-SAT or the genetic algorithm."
     )
     parser.add_argument(
         "--data",
@@ -42,8 +46,47 @@ def main() -> None:
         action="store_true",
         help="Do not relax max_days_per_year if infeasible",
     )
+    parser.add_argument(
+        "--granularity",
+        type=int,
+        choices=[30, 60],
+        default=60,
+        help="Time grid slot size in minutes",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=[engine.value for engine in SolverEngine],
+        default=SolverEngine.CP.value,
+        help="cp: CP-SAT; ga: genetic algorithm",
+    )
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=1,
+        help="GA populations; more than one run in worker processes",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="GA random seed")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Run under cProfile and print the top functions; also write a pstats file to PATH",
+    )
     args = parser.parse_args()
 
+    if args.profile is None:
+        _run(args)
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(_run, args)
+    finally:
+        print_profile(profiler, args.profile or None)
+
+
+def _run(args: argparse.Namespace) -> None:
     loader = DataLoader()
     if not loader.load_from_excel(args.data):
         raise SystemExit("Failed to load Data.xlsx")
@@ -52,17 +95,21 @@ def main() -> None:
         time_limit_seconds=args.time_limit,
         max_days_per_year=args.max_days_per_year,
         relax_if_infeasible=not args.no_relax,
+        time_grid=TimeGridConfig(granularity_minutes=args.granularity),
+        engine=args.engine,
+        ga=GAConfig(islands=args.islands, seed=args.seed),
     )
 
-    cp = SchedulingCP(
-        courses_df=loader.courses_df,
-        rooms_df=loader.rooms_df,
-        doctors_df=loader.doctors_df,
-        divisions_df=loader.divisions_df,
+    cp_kwargs = dict(
         time_limit_seconds=config.time_limit_seconds,
         max_days_per_year=config.max_days_per_year,
         relax_if_infeasible=config.relax_if_infeasible,
+        time_grid=TimeGrid.from_config(config.time_grid),
     )
+    if config.engine == SolverEngine.GA:
+        cp = SchedulingGA(loader.instance, **cp_kwargs, **config.ga.model_dump())
+    else:
+        cp = SchedulingCP(loader.instance, **cp_kwargs)
 
     best_schedule = cp.solve()
     if not best_schedule:
@@ -71,7 +118,7 @@ def main() -> None:
             "Try increasing --time-limit or --max-days-per-year."
         )
 
-    _, schedule_df = cp.format_schedule(best_schedule)
+    schedule_df = cp.schedule_frame(best_schedule)
     written_path = cp.save_schedule(schedule_df, args.output)
 
     print(f"Created: {written_path.resolve()}")
@@ -1,8 +1,10 @@
 """CLI entry point for section scheduling (notebook equivalent)."""
 
 import argparse
+import cProfile
 from pathlib import Path
 
+from .profiling import print_profile
 from .section_loader import (
     DEFAULT_CP_OUTPUT_PATH,
     DEFAULT_DATA_PATH,
@@ -11,6 +13,7 @@ from .section_loader import (
     SectionDataLoader,
 )
 from .section_scheduler import SectionScheduler
+from .time_grid import TimeGrid
 
 
 def main() -> None:
@@ -42,8 +45,40 @@ def main() -> None:
         default=project_root / DEFAULT_OUTPUT_PATH,
         help="Path for Schedule_Output_S.xlsx",
     )
+    parser.add_argument(
+        "--previous",
+        type=Path,
+        default=None,
+        help="Previous Schedule_Output_S.xlsx; only conflicting sections are re-placed",
+    )
+    parser.add_argument(
+        "--granularity",
+        type=int,
+        choices=[30, 60],
+        default=60,
+        help="Time grid slot size in minutes",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Run under cProfile and print the top functions; also write a pstats file to PATH",
+    )
     args = parser.parse_args()
 
+    if args.profile is None:
+        _run(args)
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(_run, args)
+    finally:
+        print_profile(profiler, args.profile or None)
+
+
+def _run(args: argparse.Namespace) -> None:
     loader = SectionDataLoader()
     if not loader.load_from_excel(
         cp_output_path=args.cp_output,
@@ -51,6 +86,8 @@ def main() -> None:
         data_path=args.data,
     ):
         raise SystemExit("Failed to load section scheduling data.")
+    if args.previous is not None and not loader.load_previous_schedule(args.previous):
+        raise SystemExit("Failed to load previous section schedule.")
 
     scheduler = SectionScheduler(
         cp_schedule=loader.cp_schedule,
@@ -60,16 +97,24 @@ def main() -> None:
         divisions=loader.divisions,
         courses=loader.courses,
         doctors=loader.doctors,
+        time_grid=TimeGrid(granularity_minutes=args.granularity),
+    )
+    result = scheduler.run(
+        output_path=args.output, previous_schedule=loader.previous_schedule
     )
-    result = scheduler.run(output_path=args.output)
 
     print(f"Created: {result.written_path.resolve() if result.written_path else args.output}")
     print(
         f"CP rows: {len(result.cp_formatted)} | "
         f"Section rows: {len(result.section_schedule)} | "
-        f"Total rows: {len(result.combined_schedule)} | "
+        f"Total rows: {result.total_rows} | "
         f"Unassigned: {result.unassigned_sections}"
     )
+    if result.moved_sections is not None:
+        print(
+            f"Unchanged: {result.unchanged_sections} | "
+            f"Re-placed: {result.moved_sections}"
+        )
 
 
 if __name__ == "__main__":
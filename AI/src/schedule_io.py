@@ -0,0 +1,226 @@
+"""Streaming schedule writers (xlsx, CSV, JSONL, Parquet) and matching readers."""
+
+import csv
+import importlib.util
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from .workbook_cache import read_workbook
+
+OUTPUT_FORMATS = ("xlsx", "csv", "jsonl", "parquet")
+
+SUFFIX_FORMATS = {
+    ".xlsx": "xlsx",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+# Sheet name -> (columns, rows). Rows are consumed once, in order.
+Sheet = Tuple[Sequence[str], Iterable[Sequence[Any]]]
+
+
+def output_format_for(path: Path) -> str:
+    """Format implied by the file extension; unknown extensions mean xlsx."""
+    return SUFFIX_FORMATS.get(Path(path).suffix.lower(), "xlsx")
+
+
+def with_format(path: Path, output_format: Optional[str]) -> Path:
+    """``path`` with its extension switched to ``output_format`` when given."""
+    path = Path(path)
+    if output_format is None or output_format_for(path) == output_format:
+        return path
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return path.with_suffix(f".{output_format}")
+
+
+def check_output_format(path: Path) -> None:
+    """Raise ValueError if the format implied by ``path`` cannot be written here."""
+    if output_format_for(path) != "parquet":
+        return
+    for engine in ("pyarrow", "fastparquet"):
+        if importlib.util.find_spec(engine) is not None:
+            return
+    raise ValueError("Parquet output requires pyarrow or fastparquet")
+
+
+def frame_rows(frame: pd.DataFrame, columns: Sequence[str]) -> Iterable[Tuple[Any, ...]]:
+    """Row tuples of ``frame`` in ``columns`` order, without copying the frame."""
+    return frame[list(columns)].itertuples(index=False, name=None)
+
+
+def concat_rows(*parts: Iterable[Sequence[Any]]) -> Iterable[Sequence[Any]]:
+    return chain.from_iterable(parts)
+
+
+def sheet_path(path: Path, sheet_name: str, index: int) -> Path:
+    """File holding ``sheet_name`` for single-sheet formats.
+
+    The first sheet is written to ``path`` itself, later ones next to it as
+    ``<stem>_<sheet><suffix>``.
+    """
+    if index == 0:
+        return path
+    return path.with_name(f"{path.stem}_{sheet_name}{path.suffix}")
+
+
+def write_schedule(path: Path, sheets: Dict[str, Sheet]) -> Path:
+    """Write ``sheets`` in the format implied by ``path``; returns the path used.
+
+    If the target is locked (e.g. open in Excel) a timestamped copy is written
+    instead, as the schedulers always did.
+    """
+    path = Path(path)
+    check_output_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Rows stream straight into the file, so the target has to be chosen
+    # before any row is consumed. Locks that only show when renaming (Excel
+    # on Windows) move the finished temp file to the timestamped name.
+    if not all(_is_writable(target) for target in _targets(path, sheets)):
+        path = _timestamped(path)
+    return _write(path, sheets)
+
+
+def _targets(path: Path, sheets: Dict[str, Sheet]) -> List[Path]:
+    if output_format_for(path) == "xlsx":
+        return [path]
+    return [sheet_path(path, name, index) for index, name in enumerate(sheets)]
+
+
+def _timestamped(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_{pd.Timestamp.now():%Y%m%d_%H%M%S}{path.suffix}")
+
+
+def _is_writable(path: Path) -> bool:
+    """Whether ``path`` can be replaced, checked without creating it."""
+    if path.exists():
+        return os.access(path, os.W_OK)
+    return os.access(path.parent, os.W_OK)
+
+
+def _write(path: Path, sheets: Dict[str, Sheet]) -> Path:
+    output_format = output_format_for(path)
+    if output_format == "xlsx":
+        with _atomic(path) as target:
+            _write_xlsx(target.tmp_path, sheets)
+        return target.path
+
+    writer = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}[output_format]
+    fallback = _timestamped(path)
+    for index, (name, (columns, rows)) in enumerate(sheets.items()):
+        with _atomic(sheet_path(path, name, index), sheet_path(fallback, name, index)) as target:
+            writer(target.tmp_path, columns, rows)
+        if target.path != sheet_path(path, name, index):
+            # Later sheets follow, so read_schedule finds them all beside it.
+            path = fallback
+    return path
+
+
+class _Target:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.tmp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+
+@contextmanager
+def _atomic(path: Path, fallback: Optional[Path] = None) -> Iterator[_Target]:
+    """Yield a temp path beside ``path`` and rename it into place on success.
+
+    If ``path`` cannot be replaced, the file goes to ``fallback`` (by default
+    a timestamped name); ``path`` on the yielded target is the one used.
+    """
+    target = _Target(path)
+    try:
+        yield target
+        try:
+            target.tmp_path.replace(path)
+        except PermissionError:
+            target.path = fallback or _timestamped(path)
+            target.tmp_path.replace(target.path)
+    finally:
+        target.tmp_path.unlink(missing_ok=True)
+
+
+def _write_xlsx(path: Path, sheets: Dict[str, Sheet]) -> None:
+    workbook = openpyxl.Workbook(write_only=True)
+    for name, (columns, rows) in sheets.items():
+        worksheet = workbook.create_sheet(title=name)
+        worksheet.append(list(columns))
+        for row in rows:
+            worksheet.append([_cell(value) for value in row])
+    workbook.save(path)
+
+
+def _write_csv(path: Path, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in map(_cell, row)])
+
+
+def _write_jsonl(path: Path, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            record = dict(zip(columns, map(_cell, row)))
+            handle.write(json.dumps(record, ensure_ascii=False, default=str))
+            handle.write("\n")
+
+
+def _write_parquet(path: Path, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    # Parquet is columnar, so each sheet is materialised once here.
+    frame = pd.DataFrame.from_records(
+        [[_cell(value) for value in row] for row in rows], columns=list(columns)
+    )
+    for col in frame.columns:
+        values = frame[col].dropna()
+        if frame[col].dtype == object and values.map(type).nunique() > 1:
+            frame[col] = frame[col].map(lambda v: None if v is None else str(v))
+    frame.to_parquet(path, index=False)
+
+
+def _cell(value: Any) -> Any:
+    """Native Python value for a writer; missing values become None."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def read_schedule(path: Path, sheet_names: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Read sheets written by ``write_schedule``; missing sheets are skipped."""
+    path = Path(path)
+    output_format = output_format_for(path)
+    if output_format == "xlsx":
+        return read_workbook(path)
+
+    sheets: Dict[str, pd.DataFrame] = {}
+    for index, name in enumerate(sheet_names):
+        target = sheet_path(path, name, index)
+        if not target.exists():
+            continue
+        if output_format == "csv":
+            sheets[name] = pd.read_csv(target, keep_default_na=False, na_values=[""])
+        elif output_format == "jsonl":
+            sheets[name] = pd.read_json(target, lines=True, convert_dates=False, dtype=False)
+        else:
+            sheets[name] = pd.read_parquet(target)
+    return sheets
@@ -1,12 +1,18 @@
 """Constraint Programming scheduler using OR-Tools CP-SAT (Final CP notebook)."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from ortools.sat.python import cp_model
 
-from .utils import minutes_to_time_str, time_to_minutes
+from .instance import SchedulingInstance
+from .schedule_io import frame_rows, write_schedule
+from .solver_log import SolverLog, attempt_stats
+from .time_grid import TimeGrid
+from .timings import Timings
+from .utils import minutes_to_time_str
 
 
 class SolutionCollector(cp_model.CpSolverSolutionCallback):
@@ -19,7 +25,6 @@ class SolutionCollector(cp_model.CpSolverSolutionCallback):
         days: List[str],
         rooms: List[str],
         time_slots: List[int],
-        courses_df: pd.DataFrame,
     ) -> None:
         cp_model.CpSolverSolutionCallback.__init__(self)
         self.assignment_vars = assignment_vars
@@ -27,10 +32,12 @@ class SolutionCollector(cp_model.CpSolverSolutionCallback):
         self.days = days
         self.rooms = rooms
         self.time_slots = time_slots
-        self.courses_df = courses_df
         self.solutions: List[List[Dict[str, Any]]] = []
+        self.first_solution_seconds: Optional[float] = None
 
     def on_solution_callback(self) -> None:
+        if self.first_solution_seconds is None:
+            self.first_solution_seconds = self.WallTime()
         solution: List[Dict[str, Any]] = []
 
         for pair_idx, assignments in self.assignment_vars.items():
@@ -41,24 +48,20 @@ class SolutionCollector(cp_model.CpSolverSolutionCallback):
                 day = self.days[self.Value(assignment["day"])]
                 room = self.rooms[self.Value(assignment["room"])]
                 start_time = self.time_slots[self.Value(assignment["time"])]
-
-                course_info = self.courses_df[
-                    self.courses_df["Course_ID"] == course_id
-                ].iloc[0]
-                hours_per_day = int(course_info["Hours_per_day"])
-                end_time = start_time + (hours_per_day * 60)
+                duration_minutes = int(pair_info["duration_minutes"])
+                end_time = start_time + duration_minutes
 
                 solution.append(
                     {
                         "Day": day,
                         "Course_ID": course_id,
-                        "Instructor_ID": course_info["Instructor_ID"],
+                        "Instructor_ID": pair_info["instructor_id"],
                         "Group_ID": pair_info["div_id"],
                         "Room_ID": room,
                         "Time_Slot": f"{day}_{start_time}_{end_time}",
                         "Start_Time": start_time,
                         "End_Time": end_time,
-                        "Duration": hours_per_day * 60,
+                        "Duration": duration_minutes,
                     }
                 )
 
@@ -82,24 +85,26 @@ class SchedulingCP:
 
     def __init__(
         self,
-        courses_df: pd.DataFrame,
-        rooms_df: pd.DataFrame,
-        doctors_df: pd.DataFrame,
-        divisions_df: pd.DataFrame,
+        instance: SchedulingInstance,
         time_limit_seconds: int = 300,
         use_optimization: bool = True,
         max_days_per_year: int = 3,
         relax_if_infeasible: bool = True,
+        time_grid: Optional[TimeGrid] = None,
+        timings: Optional[Timings] = None,
+        capture_solver_log: bool = False,
+        solver_log_lines: int = 2000,
     ) -> None:
-        self.courses_df = courses_df.copy()
-        self.rooms_df = rooms_df.copy()
-        self.doctors_df = doctors_df.copy()
-        self.divisions_df = divisions_df.copy()
+        self.instance = instance
         self.time_limit_seconds = time_limit_seconds
         self.use_optimization = use_optimization
         self.max_days_per_year = int(max_days_per_year)
         self.initial_max_days_per_year = int(max_days_per_year)
         self.relax_if_infeasible = bool(relax_if_infeasible)
+        self.time_grid = time_grid or TimeGrid()
+        self.timings = timings or Timings()
+        self.capture_solver_log = bool(capture_solver_log)
+        self.solver_log_lines = solver_log_lines
         self.last_solver_status: Optional[str] = None
 
         self.courses: List[str] = []
@@ -108,111 +113,150 @@ class SchedulingCP:
         self.all_rooms: List[str] = []
         self.lecture_rooms: List[str] = []
         self.lab_rooms: List[str] = []
-        self.room_capacity: Dict[str, int] = {}
         self.time_slots: List[int] = []
-        self.doctor_availability: Dict[str, Dict[str, List[tuple]]] = {}
 
         self.assignment_vars: Dict = {}
         self.year_day_active: Dict = {}
-
-        self.prepare_data()
+        self.resource_intervals: Dict[str, Dict[Any, List]] = {}
+        self.day_stride = 0
+        self.last_solver: Optional[cp_model.CpSolver] = None
+        # Filled by solve(): attempts, solve_seconds, first_solution_seconds,
+        # variables and constraints of the last model.
+        self.solve_stats: Dict[str, Any] = {}
+        # One ``attempt_stats`` dict per relaxation attempt of the last solve().
+        self.solver_attempts: List[Dict[str, Any]] = []
+        # Search log of the last solve(); lines are only kept with capture_solver_log.
+        self.solver_log: Optional[SolverLog] = None
+
+        with self.timings.span("prepare_data"):
+            self.prepare_data()
+
+    @classmethod
+    def from_frames(
+        cls,
+        courses_df: pd.DataFrame,
+        rooms_df: pd.DataFrame,
+        doctors_df: pd.DataFrame,
+        divisions_df: pd.DataFrame,
+        **kwargs: Any,
+    ) -> "SchedulingCP":
+        """Build a scheduler straight from the Data.xlsx sheets."""
+        instance = SchedulingInstance.from_frames(rooms_df, courses_df, doctors_df, divisions_df)
+        return cls(instance, **kwargs)
 
     def prepare_data(self) -> None:
         """Prepare data structures for CP solver."""
-        self.courses = self.courses_df["Course_ID"].tolist()
-
-        self.doctor_availability = {}
-        for _, row in self.doctors_df.iterrows():
-            inst_id = row["Instructor_ID"]
-            day = row["Day"]
-            start_minutes = time_to_minutes(row["Start_Time"])
-            end_minutes = time_to_minutes(row["End_Time"])
-
-            if inst_id not in self.doctor_availability:
-                self.doctor_availability[inst_id] = {}
-            if day not in self.doctor_availability[inst_id]:
-                self.doctor_availability[inst_id][day] = []
-            self.doctor_availability[inst_id][day].append((start_minutes, end_minutes))
+        inst = self.instance
+        self.courses = list(inst.course_ids)
+        self.days = list(inst.days)
 
         self.divisions = []
-        for _, course_row in self.courses_df.iterrows():
-            course_id = course_row["Course_ID"]
-            year = course_row["Year"]
-            major = course_row["Major"]
-            dept = course_row["Department"]
-
-            matching_divs = self.divisions_df[
-                (self.divisions_df["Year"] == year)
-                & (self.divisions_df["Major"] == major)
-                & (self.divisions_df["Department"] == dept)
-            ]
+        for course_idx, course_id in enumerate(inst.course_ids):
+            year = inst.course_year[course_idx]
+            major = inst.course_majors[course_idx]
+            dept = inst.course_departments[course_idx]
+
+            same_year_dept = (inst.division_year == year) & np.array(
+                [value == dept for value in inst.division_departments], dtype=bool
+            )
+            matching = same_year_dept & np.array(
+                [value == major for value in inst.division_majors], dtype=bool
+            )
 
-            if matching_divs.empty:
-                fallback_divs = self.divisions_df[
-                    (self.divisions_df["Year"] == year)
-                    & (self.divisions_df["Department"] == dept)
-                ]
-                if fallback_divs.empty:
+            if not matching.any():
+                if not same_year_dept.any():
                     print(
                         f"Warning: No matching division for course {course_id} "
                         f"(Year={year}, Major={major}, Dept={dept})"
                     )
                     continue
-                matching_divs = fallback_divs
+                matching = same_year_dept
+
+            duration_minutes = self.time_grid.duration_for(
+                inst.course_types[course_idx], inst.course_hours[course_idx]
+            )
+            if not any(
+                self.time_grid.allowed_start_indices(day, duration_minutes)
+                for day in self.days
+            ):
+                print(
+                    f"Warning: Course {course_id} needs {duration_minutes} minutes, "
+                    "which does not fit any day's opening hours"
+                )
+                continue
 
-            best_div = matching_divs.sort_values("StudentNum", ascending=False).iloc[0]
+            # Largest matching division; ties keep the first row.
+            candidates = np.flatnonzero(matching)
+            div_idx = int(candidates[np.argmax(inst.division_students[candidates])])
+            div_id = inst.division_ids[div_idx]
+            instructor_code = int(inst.course_instructor[course_idx])
             self.divisions.append(
                 {
                     "course_id": course_id,
-                    "div_id": best_div["Num_ID"],
+                    "course_idx": course_idx,
+                    "div_id": div_id,
+                    "div_idx": div_idx,
+                    "instructor_id": inst.instructor_ids[instructor_code],
+                    "instructor_code": instructor_code,
                     "group_idx": 0,
-                    "group_key": str(best_div["Num_ID"]),
-                    "required_days": int(course_row["Days"]),
+                    "group_key": str(div_id),
+                    "required_days": int(inst.course_days[course_idx]),
                     "year": int(year),
+                    "duration_minutes": duration_minutes,
                 }
             )
 
-        if len(self.doctors_df) > 0 and "Day" in self.doctors_df.columns:
-            self.days = self.doctors_df["Day"].unique().tolist()
-        else:
-            self.days = [
-                "Sunday",
-                "Monday",
-                "Tuesday",
-                "Wednesday",
-                "Thursday",
-                "Saturday",
-            ]
-
-        self.all_rooms = self.rooms_df["Room_ID"].tolist()
-        self.lecture_rooms = self.rooms_df[
-            self.rooms_df["Type"] == "Lecture"
-        ]["Room_ID"].tolist()
-        self.lab_rooms = self.rooms_df[self.rooms_df["Type"] == "Lab"]["Room_ID"].tolist()
-
-        self.room_capacity = {
-            row["Room_ID"]: int(row["Capacity"]) for _, row in self.rooms_df.iterrows()
-        }
-        self.time_slots = list(range(8 * 60, 17 * 60 + 1, 60))
+        self.all_rooms = list(inst.room_ids)
+        self.lecture_rooms = inst.rooms_of_type("Lecture")
+        self.lab_rooms = inst.rooms_of_type("Lab")
+        self.time_slots = self.time_grid.slot_starts()
 
     def build_model(self) -> cp_model.CpModel:
-        """Build the CP-SAT model with all constraints."""
+        """Build the CP-SAT model with all constraints.
+
+        Each meeting is an interval on a single timeline of ``day * stride +
+        start slot``, so room, instructor and division clashes are NoOverlap
+        constraints per resource rather than pairwise conflict booleans.
+        """
         model = cp_model.CpModel()
         self.assignment_vars = {}
+        self.day_stride = len(self.time_slots)
+        horizon = self.day_stride * len(self.days)
 
         for pair_idx, pair_info in enumerate(self.divisions):
             days_needed = int(pair_info["required_days"])
+            duration_minutes = int(pair_info["duration_minutes"])
+            slots = self.time_grid.slots_for(duration_minutes)
             self.assignment_vars[pair_idx] = {}
 
+            # Time vars index grid starts, so finer grids widen domains
+            # instead of adding variables.
+            starts_by_day = [
+                self.time_grid.allowed_start_indices(day, duration_minutes)
+                for day in self.days
+            ]
+            all_starts = sorted({idx for starts in starts_by_day for idx in starts})
+
             for day_idx in range(days_needed):
                 day_var = model.NewIntVar(0, len(self.days) - 1, f"day_{pair_idx}_{day_idx}")
                 room_var = model.NewIntVar(0, len(self.all_rooms) - 1, f"room_{pair_idx}_{day_idx}")
-                time_var = model.NewIntVar(0, len(self.time_slots) - 1, f"time_{pair_idx}_{day_idx}")
+                time_var = model.NewIntVarFromDomain(
+                    cp_model.Domain.FromValues(all_starts), f"time_{pair_idx}_{day_idx}"
+                )
+                start_var = model.NewIntVar(0, horizon, f"start_{pair_idx}_{day_idx}")
+                model.Add(start_var == day_var * self.day_stride + time_var)
+                interval = model.NewIntervalVar(
+                    start_var, slots, start_var + slots, f"interval_{pair_idx}_{day_idx}"
+                )
 
                 self.assignment_vars[pair_idx][day_idx] = {
                     "day": day_var,
                     "room": room_var,
                     "time": time_var,
+                    "start": start_var,
+                    "interval": interval,
+                    "slots": slots,
+                    "starts_by_day": starts_by_day,
                     "course_id": pair_info["course_id"],
                     "div_id": pair_info["div_id"],
                     "group_idx": pair_info["group_idx"],
@@ -220,65 +264,40 @@ class SchedulingCP:
                 }
 
         self._add_constraints(model)
+        self._add_resource_constraints(model)
         return model
 
     def _add_constraints(self, model: cp_model.CpModel) -> None:
         """Add all constraints to the model."""
-        day_indices = {day: i for i, day in enumerate(self.days)}
-        room_indices = {room: i for i, room in enumerate(self.all_rooms)}
+        inst = self.instance
+        room_intervals: Dict[int, List] = {}
+        instructor_intervals: Dict[Any, List] = {}
+        group_intervals: Dict[str, List] = {}
 
         for pair_idx, assignments in self.assignment_vars.items():
             pair_info = self.divisions[pair_idx]
             course_id = pair_info["course_id"]
             div_id = pair_info["div_id"]
-            course_info = self.courses_df[self.courses_df["Course_ID"] == course_id].iloc[0]
-            div_info = self.divisions_df[self.divisions_df["Num_ID"] == div_id].iloc[0]
 
-            instructor_id = course_info["Instructor_ID"]
-            course_type = course_info["Type"]
-            hours_per_day = int(course_info["Hours_per_day"])
-            duration_minutes = hours_per_day * 60
-            students_requiring_room = int(div_info["StudentNum"]) // 2
-
-            candidate_rooms = (
-                self.lecture_rooms if course_type == "Lecture" else self.lab_rooms
-            )
-            suitable_rooms = [
-                room_indices[r]
-                for r in candidate_rooms
-                if self.room_capacity.get(r, 0) >= students_requiring_room
-            ]
-
-            if not suitable_rooms:
-                sorted_by_capacity = sorted(
-                    candidate_rooms,
-                    key=lambda r: self.room_capacity.get(r, 0),
-                    reverse=True,
+            instructor_id = pair_info["instructor_id"]
+            suitable_rooms, fallback_capacity = self._suitable_rooms(pair_info)
+            if fallback_capacity is not None:
+                print(
+                    f"Warning: No room fits "
+                    f"{int(inst.division_students[pair_info['div_idx']]) // 2} students for "
+                    f"{course_id}/{div_id}. Using largest capacity {fallback_capacity}."
                 )
-                if sorted_by_capacity:
-                    largest_cap = self.room_capacity.get(sorted_by_capacity[0], 0)
-                    suitable_rooms = [
-                        room_indices[r]
-                        for r in sorted_by_capacity
-                        if self.room_capacity.get(r, 0) == largest_cap
-                    ]
-                    print(
-                        f"Warning: No room fits {students_requiring_room} students for "
-                        f"{course_id}/{div_id}. Using largest capacity {largest_cap}."
-                    )
 
-            available_day_indices = []
-            if instructor_id in self.doctor_availability:
-                for day in self.doctor_availability[instructor_id]:
-                    if day in day_indices:
-                        available_day_indices.append(day_indices[day])
+            available_day_indices = list(
+                inst.instructor_days.get(pair_info["instructor_code"], [])
+            )
 
             if not available_day_indices or len(available_day_indices) < int(
                 pair_info["required_days"]
             ):
                 available_day_indices = list(range(len(self.days)))
 
-            for assignment in assignments.values():
+            for day_idx, assignment in assignments.items():
                 model.AddAllowedAssignments(
                     [assignment["room"]], [(room_idx,) for room_idx in suitable_rooms]
                 )
@@ -286,72 +305,32 @@ class SchedulingCP:
                     [assignment["day"]], [(day_idx,) for day_idx in available_day_indices]
                 )
 
-                for time_idx, start_time in enumerate(self.time_slots):
-                    end_time = start_time + duration_minutes
-                    if end_time > 17 * 60:
-                        model.Add(assignment["time"] != time_idx)
-
-        for pair_idx1, assignments1 in self.assignment_vars.items():
-            pair_info1 = self.divisions[pair_idx1]
-            course_info1 = self.courses_df[
-                self.courses_df["Course_ID"] == pair_info1["course_id"]
-            ].iloc[0]
-            instructor_id1 = course_info1["Instructor_ID"]
-            group_key1 = pair_info1["group_key"]
-
-            for day_idx1, assignment1 in assignments1.items():
-                for pair_idx2, assignments2 in self.assignment_vars.items():
-                    if pair_idx1 >= pair_idx2:
-                        continue
-
-                    pair_info2 = self.divisions[pair_idx2]
-                    course_info2 = self.courses_df[
-                        self.courses_df["Course_ID"] == pair_info2["course_id"]
-                    ].iloc[0]
-                    instructor_id2 = course_info2["Instructor_ID"]
-                    group_key2 = pair_info2["group_key"]
-
-                    for day_idx2, assignment2 in assignments2.items():
-                        room_conflict = model.NewBoolVar(
-                            f"room_conflict_{pair_idx1}_{day_idx1}_{pair_idx2}_{day_idx2}"
-                        )
-                        model.Add(assignment1["room"] == assignment2["room"]).OnlyEnforceIf(
-                            room_conflict
-                        )
-                        model.Add(assignment1["room"] != assignment2["room"]).OnlyEnforceIf(
-                            room_conflict.Not()
-                        )
-
-                        same_day = model.NewBoolVar(
-                            f"same_day_{pair_idx1}_{day_idx1}_{pair_idx2}_{day_idx2}"
-                        )
-                        model.Add(assignment1["day"] == assignment2["day"]).OnlyEnforceIf(
-                            same_day
-                        )
-                        model.Add(assignment1["day"] != assignment2["day"]).OnlyEnforceIf(
-                            same_day.Not()
-                        )
-
-                        both_room_day = model.NewBoolVar(
-                            f"both_rd_{pair_idx1}_{day_idx1}_{pair_idx2}_{day_idx2}"
-                        )
-                        model.AddBoolAnd([room_conflict, same_day]).OnlyEnforceIf(both_room_day)
-                        model.AddBoolOr([room_conflict.Not(), same_day.Not()]).OnlyEnforceIf(
-                            both_room_day.Not()
-                        )
-                        model.Add(assignment1["time"] != assignment2["time"]).OnlyEnforceIf(
-                            both_room_day
+                room_choices = []
+                for room_idx in suitable_rooms:
+                    in_room = model.NewBoolVar(f"in_room_{pair_idx}_{day_idx}_{room_idx}")
+                    model.Add(assignment["room"] == room_idx).OnlyEnforceIf(in_room)
+                    room_intervals.setdefault(room_idx, []).append(
+                        model.NewOptionalIntervalVar(
+                            assignment["start"],
+                            assignment["slots"],
+                            assignment["start"] + assignment["slots"],
+                            in_room,
+                            f"room_interval_{pair_idx}_{day_idx}_{room_idx}",
                         )
+                    )
+                    room_choices.append(in_room)
+                model.AddExactlyOne(room_choices)
 
-                        if instructor_id1 == instructor_id2:
-                            model.Add(assignment1["time"] != assignment2["time"]).OnlyEnforceIf(
-                                same_day
-                            )
+                instructor_intervals.setdefault(instructor_id, []).append(assignment["interval"])
+                group_intervals.setdefault(pair_info["group_key"], []).append(
+                    assignment["interval"]
+                )
 
-                        if group_key1 == group_key2:
-                            model.Add(assignment1["time"] != assignment2["time"]).OnlyEnforceIf(
-                                same_day
-                            )
+        self.resource_intervals = {
+            "room": room_intervals,
+            "instructor": instructor_intervals,
+            "group": group_intervals,
+        }
 
         years = sorted({pair_info["year"] for pair_info in self.divisions})
         self.year_day_active = {}
@@ -367,30 +346,130 @@ class SchedulingCP:
         for pair_idx, assignments in self.assignment_vars.items():
             year = self.divisions[pair_idx]["year"]
             for assignment in assignments.values():
-                for day_idx in range(len(self.days)):
+                all_starts = {idx for starts in assignment["starts_by_day"] for idx in starts}
+                for day_idx, starts in enumerate(assignment["starts_by_day"]):
                     day_is_idx = model.NewBoolVar(f"pair_{pair_idx}_is_day_{day_idx}")
                     model.Add(assignment["day"] == day_idx).OnlyEnforceIf(day_is_idx)
                     model.Add(assignment["day"] != day_idx).OnlyEnforceIf(day_is_idx.Not())
                     model.AddImplication(day_is_idx, self.year_day_active[(year, day_idx)])
 
+                    # Per-day opening hours narrow the start domain on that day
+                    if not starts:
+                        model.Add(day_is_idx == 0)
+                    elif len(starts) < len(all_starts):
+                        model.AddLinearExpressionInDomain(
+                            assignment["time"], cp_model.Domain.FromValues(starts)
+                        ).OnlyEnforceIf(day_is_idx)
+
         for assignments in self.assignment_vars.values():
             if len(assignments) > 1:
                 day_vars = [assignment["day"] for assignment in assignments.values()]
                 model.AddAllDifferent(day_vars)
 
-    def solve(self) -> Optional[List[Dict[str, Any]]]:
-        """Solve the constraint programming problem."""
-        limits_to_try = [self.max_days_per_year]
+    def _suitable_rooms(self, pair_info: Dict[str, Any]) -> Tuple[List[int], Optional[int]]:
+        """Room codes that fit the division, and the fallback capacity if none did.
+
+        When no room of the right type is big enough, the largest ones are used.
+        """
+        inst = self.instance
+        course_type = inst.course_types[pair_info["course_idx"]]
+        students_requiring_room = int(inst.division_students[pair_info["div_idx"]]) // 2
+
+        candidate_rooms = self.lecture_rooms if course_type == "Lecture" else self.lab_rooms
+        suitable_rooms = [
+            r for r in candidate_rooms if inst.room_capacity[r] >= students_requiring_room
+        ]
+        if suitable_rooms or not candidate_rooms:
+            return suitable_rooms, None
+
+        largest_cap = int(max(inst.room_capacity[r] for r in candidate_rooms))
+        return [r for r in candidate_rooms if inst.room_capacity[r] == largest_cap], largest_cap
+
+    def estimate_size(self) -> Dict[str, int]:
+        """Variables and constraints ``build_model`` will create, without building it.
+
+        Counts follow ``build_model`` and ``_add_constraints`` (intervals are
+        constraints in CP-SAT); resource NoOverlaps are counted per distinct
+        room, instructor and division, an upper bound.
+        """
+        num_days = len(self.days)
+        variables = 0
+        constraints = 0
+        rooms_used = set()
+
+        for pair_info in self.divisions:
+            duration_minutes = int(pair_info["duration_minutes"])
+            starts_by_day = [
+                self.time_grid.allowed_start_indices(day, duration_minutes) for day in self.days
+            ]
+            num_starts = len({idx for starts in starts_by_day for idx in starts})
+            narrowed_days = sum(1 for starts in starts_by_day if len(starts) < num_starts)
+            suitable_rooms, _ = self._suitable_rooms(pair_info)
+            rooms_used.update(suitable_rooms)
+            num_rooms = len(suitable_rooms)
+
+            meetings = int(pair_info["required_days"])
+            # day, room, time, start + in-room and is-day booleans
+            variables += meetings * (4 + num_rooms + num_days)
+            # start link, interval, room/day tables, exactly-one, per-room
+            # link and optional interval, per-day link pair and implication
+            constraints += meetings * (5 + 2 * num_rooms + 3 * num_days + narrowed_days)
+            if meetings > 1:
+                constraints += 1
+
+        years = {pair_info["year"] for pair_info in self.divisions}
+        variables += len(years) * num_days
+        constraints += len(years)
+        constraints += len(rooms_used)
+        constraints += len({pair_info["instructor_id"] for pair_info in self.divisions})
+        constraints += len({pair_info["group_key"] for pair_info in self.divisions})
+
+        return {
+            "variables": variables,
+            "constraints": constraints,
+            "meetings": sum(int(pair_info["required_days"]) for pair_info in self.divisions),
+        }
+
+    def _add_resource_constraints(self, model: cp_model.CpModel) -> None:
+        """One NoOverlap per room, instructor and division timeline."""
+        for intervals_by_resource in self.resource_intervals.values():
+            for intervals in intervals_by_resource.values():
+                if len(intervals) > 1:
+                    model.AddNoOverlap(intervals)
+
+    def relaxation_limits(self) -> List[int]:
+        """``max_days_per_year`` values ``solve`` tries, in order."""
+        limits = [self.max_days_per_year]
         if self.relax_if_infeasible:
-            for limit in range(self.max_days_per_year + 1, len(self.days) + 1):
-                limits_to_try.append(limit)
+            limits.extend(range(self.max_days_per_year + 1, len(self.days) + 1))
+        return limits
 
-        for limit in limits_to_try:
+    def solve(self) -> Optional[List[Dict[str, Any]]]:
+        """Solve the constraint programming problem."""
+        self.solve_stats = {
+            "attempts": 0,
+            "solve_seconds": 0.0,
+            "first_solution_seconds": None,
+            "variables": 0,
+            "constraints": 0,
+        }
+        self.solver_attempts = []
+        # The log is always parsed for presolve sizes; lines are kept only on request.
+        self.solver_log = SolverLog(self.solver_log_lines if self.capture_solver_log else 0)
+        for limit in self.relaxation_limits():
             self.max_days_per_year = limit
-            model = self.build_model()
+            with self.timings.span("build_model"):
+                model = self.build_model()
+            proto = model.Proto()
+            self.solve_stats["variables"] = len(proto.variables)
+            self.solve_stats["constraints"] = len(proto.constraints)
 
             solver = cp_model.CpSolver()
             solver.parameters.max_time_in_seconds = self.time_limit_seconds
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = self.solver_log.write
+            self.solver_log.start_attempt(f"max_days_per_year={limit}")
 
             collector = SolutionCollector(
                 self.assignment_vars,
@@ -398,11 +477,24 @@ class SchedulingCP:
                 self.days,
                 self.all_rooms,
                 self.time_slots,
-                self.courses_df,
             )
 
-            status = solver.Solve(model, collector)
+            with self.timings.span("search"):
+                status = solver.Solve(model, collector)
+            self.last_solver = solver
             self.last_solver_status = self.STATUS_NAMES.get(status, str(status))
+            self.solver_attempts.append(
+                attempt_stats(solver, self.last_solver_status, limit, self.solver_log)
+            )
+
+            stats = self.solve_stats
+            if collector.first_solution_seconds is not None:
+                # Failed attempts before this one count towards the first solution.
+                stats["first_solution_seconds"] = (
+                    stats["solve_seconds"] + collector.first_solution_seconds
+                )
+            stats["attempts"] += 1
+            stats["solve_seconds"] += solver.WallTime()
 
             if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
                 return collector.get_best_solution()
@@ -416,76 +508,74 @@ class SchedulingCP:
         self, schedule: List[Dict[str, Any]]
     ) -> tuple[List[Dict[str, Any]], pd.DataFrame]:
         """Format raw CP solution into API rows and a DataFrame."""
+        with self.timings.span("format_schedule"):
+            return self._format_schedule(schedule)
+
+    def _format_schedule(
+        self, schedule: List[Dict[str, Any]]
+    ) -> tuple[List[Dict[str, Any]], pd.DataFrame]:
         formatted: List[Dict[str, Any]] = []
         rows: List[Dict[str, Any]] = []
-
         for assignment in schedule:
-            course_id = assignment["Course_ID"]
-            instructor_id = assignment["Instructor_ID"]
-            division_id = str(assignment["Group_ID"])
-            room_id = assignment["Room_ID"]
-            day = assignment["Day"]
-
-            course_info = self.courses_df[self.courses_df["Course_ID"] == course_id].iloc[0]
-            instructor_match = self.doctors_df[
-                self.doctors_df["Instructor_ID"] == instructor_id
-            ]
-            instructor_name = (
-                instructor_match.iloc[0]["Instructor_Name"]
-                if not instructor_match.empty
-                else f"Unknown ({instructor_id})"
-            )
-            division_info = self.divisions_df[
-                self.divisions_df["Num_ID"] == division_id
-            ].iloc[0]
-            room_info = self.rooms_df[self.rooms_df["Room_ID"] == room_id].iloc[0]
-
-            start_time_str = minutes_to_time_str(int(assignment.get("Start_Time", 0)))
-            end_time_str = minutes_to_time_str(int(assignment.get("End_Time", 0)))
-            students = int(division_info["StudentNum"]) // 2
-
-            row = {
-                "Day": day,
-                "Course_Name": course_info["Course_Name"],
-                "Instructor_Name": instructor_name,
-                "Students": students,
-                "Room": room_info["Room"],
-                "Start_Time": start_time_str,
-                "End_Time": end_time_str,
-                "Department": course_info["Department"],
-                "Major": course_info["Major"],
-            }
+            row, entry = self._format_assignment(assignment)
             rows.append(row)
+            formatted.append(entry)
+        return formatted, pd.DataFrame(rows)
 
-            formatted.append(
-                {
-                    "day": day,
-                    "course_name": course_info["Course_Name"],
-                    "instructor_name": instructor_name,
-                    "students": students,
-                    "room": room_info["Room"],
-                    "start_time": start_time_str,
-                    "end_time": end_time_str,
-                    "department": course_info["Department"],
-                    "major": course_info["Major"],
-                    "year": int(course_info["Year"]),
-                }
-            )
+    def schedule_frame(self, schedule: List[Dict[str, Any]]) -> pd.DataFrame:
+        """The DataFrame of ``format_schedule`` alone, without the API rows."""
+        with self.timings.span("format_schedule"):
+            return pd.DataFrame([self._format_assignment(assignment)[0] for assignment in schedule])
 
-        return formatted, pd.DataFrame(rows)
+    def iter_schedule_entries(self, schedule: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """API rows of ``format_schedule``, formatted one at a time as they are read."""
+        for assignment in schedule:
+            yield self._format_assignment(assignment)[1]
+
+    def _format_assignment(
+        self, assignment: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Output-file row and API row of one solved meeting."""
+        inst = self.instance
+        course_idx = inst.course_index[assignment["Course_ID"]]
+        div_idx = inst.division_index[assignment["Group_ID"]]
+        room_idx = inst.room_index[assignment["Room_ID"]]
+        day = assignment["Day"]
+
+        instructor_name = inst.instructor_name(int(inst.course_instructor[course_idx]))
+        start_time_str = minutes_to_time_str(int(assignment.get("Start_Time", 0)))
+        end_time_str = minutes_to_time_str(int(assignment.get("End_Time", 0)))
+        students = int(inst.division_students[div_idx]) // 2
+
+        row = {
+            "Day": day,
+            "Course_Name": inst.course_names[course_idx],
+            "Instructor_Name": instructor_name,
+            "Students": students,
+            "Room": inst.room_names[room_idx],
+            "Start_Time": start_time_str,
+            "End_Time": end_time_str,
+            "Department": inst.course_departments[course_idx],
+            "Major": inst.course_majors[course_idx],
+        }
+        entry = {
+            "day": day,
+            "course_name": row["Course_Name"],
+            "instructor_name": instructor_name,
+            "students": students,
+            "room": row["Room"],
+            "start_time": start_time_str,
+            "end_time": end_time_str,
+            "department": row["Department"],
+            "major": row["Major"],
+            "year": int(inst.course_year[course_idx]),
+        }
+        return row, entry
 
     def save_schedule(self, schedule_df: pd.DataFrame, output_path: Path) -> Path:
-        """Save CP schedule to Excel."""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        written_path = output_path
-
-        try:
-            schedule_df.to_excel(written_path, sheet_name="Schedule", index=False)
-        except PermissionError:
-            fallback_path = output_path.with_name(
-                f"{output_path.stem}_{pd.Timestamp.now():%Y%m%d_%H%M%S}{output_path.suffix}"
+        """Save CP schedule; the format follows the file extension (xlsx by default)."""
+        columns = list(schedule_df.columns)
+        with self.timings.span("write_output"):
+            return write_schedule(
+                output_path, {"Schedule": (columns, frame_rows(schedule_df, columns))}
             )
-            schedule_df.to_excel(fallback_path, sheet_name="Schedule", index=False)
-            written_path = fallback_path
-
-        return written_path
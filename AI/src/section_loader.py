@@ -5,6 +5,10 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from .schedule_io import output_format_for, read_schedule
+from .timings import Timings
+from .workbook_cache import workbook_cache
+
 
 DEFAULT_CP_OUTPUT_PATH = Path("data/Processed Data/Schedule_Output_CP.xlsx")
 DEFAULT_SDATA_PATH = Path("data/Raw Data/SData.xlsx")
@@ -15,7 +19,8 @@ DEFAULT_OUTPUT_PATH = Path("data/Processed Data/Schedule_Output_S.xlsx")
 class SectionDataLoader:
     """Load CP schedule and section-related workbooks."""
 
-    def __init__(self) -> None:
+    def __init__(self, timings: Optional[Timings] = None) -> None:
+        self.timings = timings or Timings()
         self.cp_schedule: pd.DataFrame = pd.DataFrame()
         self.rooms: pd.DataFrame = pd.DataFrame()
         self.sections: pd.DataFrame = pd.DataFrame()
@@ -23,6 +28,8 @@ class SectionDataLoader:
         self.divisions: pd.DataFrame = pd.DataFrame()
         self.courses: pd.DataFrame = pd.DataFrame()
         self.doctors: pd.DataFrame = pd.DataFrame()
+        self.previous_schedule: Optional[pd.DataFrame] = None
+        self.cache_status: Dict[str, str] = {}
         self._is_loaded = False
 
     def load_section_sheets(
@@ -35,24 +42,39 @@ class SectionDataLoader:
         """Load section data, optionally using an in-memory CP schedule."""
         try:
             if cp_schedule is not None:
-                self.cp_schedule = cp_schedule.copy()
+                self.cp_schedule = cp_schedule
             elif cp_output_path is not None:
-                self.cp_schedule = pd.read_excel(cp_output_path, sheet_name="Schedule")
+                self.cp_schedule = self._load_schedule(cp_output_path, ["Schedule"])["Schedule"]
             else:
                 raise ValueError("Provide cp_schedule or cp_output_path")
 
-            self.rooms = pd.read_excel(sdata_path, sheet_name="Rooms")
-            self.sections = pd.read_excel(sdata_path, sheet_name="Section")
-            self.assistants = pd.read_excel(sdata_path, sheet_name="Assistant")
-            self.divisions = pd.read_excel(sdata_path, sheet_name="Division")
-            self.courses = pd.read_excel(data_path, sheet_name="Courses")
-            self.doctors = pd.read_excel(data_path, sheet_name="Doctors")
+            sdata = self._load_workbook(sdata_path)
+            data = self._load_workbook(data_path)
+            self.rooms = sdata["Rooms"]
+            self.sections = sdata["Section"]
+            self.assistants = sdata["Assistant"]
+            self.divisions = sdata["Division"]
+            self.courses = data["Courses"]
+            self.doctors = data["Doctors"]
             self._is_loaded = True
             return True
         except Exception as exc:
             print(f"Error loading section sheets: {exc}")
             return False
 
+    def _load_workbook(self, path: Path) -> Dict[str, pd.DataFrame]:
+        with self.timings.span("read_workbook"):
+            sheets, status = workbook_cache.load(path)
+        self.cache_status[Path(path).name] = status
+        return sheets
+
+    def _load_schedule(self, path: Path, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """Sheets of a schedule output in any format ``write_schedule`` produces."""
+        if output_format_for(path) == "xlsx":
+            return self._load_workbook(path)
+        with self.timings.span("read_schedule"):
+            return read_schedule(path, sheet_names)
+
     def load_from_excel(
         self,
         cp_output_path: Path = DEFAULT_CP_OUTPUT_PATH,
@@ -66,22 +88,40 @@ class SectionDataLoader:
             cp_output_path=cp_output_path,
         )
 
-    def load_from_json(self, data: Dict[str, List[Dict[str, Any]]]) -> bool:
-        """Load section scheduling data from a JSON payload."""
+    def load_from_json(self, data: Dict[str, Any]) -> bool:
+        """Load section scheduling data from a JSON payload.
+
+        Each table is either a list of row dicts or a dict of columns.
+        """
         try:
-            self.cp_schedule = pd.DataFrame(data.get("cp_schedule", []))
-            self.rooms = pd.DataFrame(data.get("rooms", []))
-            self.sections = pd.DataFrame(data.get("sections", []))
-            self.assistants = pd.DataFrame(data.get("assistants", []))
-            self.divisions = pd.DataFrame(data.get("divisions", []))
-            self.courses = pd.DataFrame(data.get("courses", []))
-            self.doctors = pd.DataFrame(data.get("doctors", []))
+            with self.timings.span("build_frames"):
+                self.cp_schedule = pd.DataFrame(data.get("cp_schedule", []))
+                self.rooms = pd.DataFrame(data.get("rooms", []))
+                self.sections = pd.DataFrame(data.get("sections", []))
+                self.assistants = pd.DataFrame(data.get("assistants", []))
+                self.divisions = pd.DataFrame(data.get("divisions", []))
+                self.courses = pd.DataFrame(data.get("courses", []))
+                self.doctors = pd.DataFrame(data.get("doctors", []))
+                if data.get("previous_schedule") is not None:
+                    self.previous_schedule = pd.DataFrame(data["previous_schedule"])
             self._is_loaded = True
             return True
         except Exception as exc:
             print(f"Error loading section data from JSON: {exc}")
             return False
 
+    def load_previous_schedule(self, output_path: Path) -> bool:
+        """Load a previous section output for incremental re-placement."""
+        try:
+            with self.timings.span("read_previous_schedule"):
+                sheets = read_schedule(output_path, ["Schedule", "CP_Only", "Sections_Only"])
+            sheet = "Sections_Only" if "Sections_Only" in sheets else "Schedule"
+            self.previous_schedule = sheets[sheet]
+            return True
+        except Exception as exc:
+            print(f"Error loading previous section schedule: {exc}")
+            return False
+
     def is_loaded(self) -> bool:
         return self._is_loaded
 
@@ -1,12 +1,17 @@
 """Section scheduler — refactored from Final S Cp.ipynb."""
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
-from .section_utils import find_column
+from .schedule_io import concat_rows, frame_rows, write_schedule
+from .section_utils import OccupancyIndex, find_column
+from .time_grid import TimeGrid
+from .timings import Timings
+from .utils import minutes_to_time_str, times_to_minutes
 
 
 FINAL_COLS = [
@@ -21,15 +26,32 @@ FINAL_COLS = [
     "Major",
 ]
 
+DEFAULT_DAYS = ["Saturday", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
+
 
 @dataclass
 class SectionScheduleResult:
     """Result of section scheduling."""
 
-    combined_schedule: pd.DataFrame
     cp_formatted: pd.DataFrame
     section_schedule: pd.DataFrame
     written_path: Optional[Path] = None
+    moved_sections: Optional[int] = None
+    unchanged_sections: Optional[int] = None
+    _combined_schedule: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    @property
+    def combined_schedule(self) -> pd.DataFrame:
+        """CP rows followed by section rows, built on first access."""
+        if self._combined_schedule is None:
+            self._combined_schedule = pd.concat(
+                [self.cp_formatted, self.section_schedule[FINAL_COLS]], ignore_index=True
+            )
+        return self._combined_schedule
+
+    @property
+    def total_rows(self) -> int:
+        return len(self.cp_formatted) + len(self.section_schedule)
 
     @property
     def unassigned_sections(self) -> int:
@@ -50,93 +72,178 @@ class SectionScheduler:
         divisions: pd.DataFrame,
         courses: pd.DataFrame,
         doctors: pd.DataFrame,
+        time_grid: Optional[TimeGrid] = None,
+        timings: Optional[Timings] = None,
     ) -> None:
-        self.cp_schedule = cp_schedule.copy()
-        self.rooms = rooms.copy()
-        self.sections = sections.copy()
-        self.assistants = assistants.copy()
-        self.divisions = divisions.copy()
-        self.courses = courses.copy()
-        self.doctors = doctors.copy()
-
-    def run(self, output_path: Optional[Path] = None) -> SectionScheduleResult:
-        """Build combined CP + section schedule."""
-        cp_slots = self._prepare_cp_slots()
-        assistant_pool, assistant_id_to_name = self._build_assistant_pool()
-        division_students = self._build_division_students()
-        course_instructor_from_data = self._build_course_instructor_map()
-        course_defaults = self._build_course_defaults(cp_slots)
+        # Inputs are only read, so cached workbook frames are used without copies.
+        self.cp_schedule = cp_schedule
+        self.rooms = rooms
+        self.sections = sections
+        self.assistants = assistants
+        self.divisions = divisions
+        self.courses = courses
+        self.doctors = doctors
+        self.time_grid = time_grid or TimeGrid()
+        self.timings = timings or Timings()
+
+    def run(
+        self,
+        output_path: Optional[Path] = None,
+        previous_schedule: Optional[pd.DataFrame] = None,
+    ) -> SectionScheduleResult:
+        """Build combined CP + section schedule.
+
+        When ``previous_schedule`` is given, sections whose previous slot is
+        still conflict-free keep it and only the rest are re-placed.
+        """
+        with self.timings.span("lecture_occupancy"):
+            cp_slots = self._prepare_cp_slots()
+
+            # Determine available days from CP slots, or default
+            days = list(DEFAULT_DAYS)
+            if "Day" in cp_slots.columns and not cp_slots["Day"].empty:
+                days = cp_slots["Day"].unique().tolist()
+
+            occupancy = self._build_lecture_occupancy(cp_slots)
+
+        with self.timings.span("section_demands"):
+            room_capacities, room_types = self._build_room_info()
+            demands = self._build_section_demands(cp_slots)
+
+        placed: List[Optional[Tuple[str, int, int, str]]] = [None] * len(demands)
+        unchanged = 0
+
+        if previous_schedule is not None:
+            with self.timings.span("keep_previous"):
+                previous = self._match_previous_sections(demands, previous_schedule)
+                for idx, demand in enumerate(demands):
+                    slot = previous.get(idx)
+                    if slot is None:
+                        continue
+                    day, start_m, end_m, room = slot
+                    if day not in days or room not in self._candidate_rooms(
+                        demand, room_capacities, room_types
+                    ):
+                        continue
+                    if not self._slot_is_free(occupancy, demand, day, start_m, end_m, room):
+                        continue
+                    self._reserve(occupancy, demand, day, start_m, end_m, room)
+                    placed[idx] = slot
+                    unchanged += 1
+
+        with self.timings.span("place_sections"):
+            for idx, demand in enumerate(demands):
+                if placed[idx] is not None:
+                    continue
+                placed[idx] = self._find_slot(
+                    demand, days, occupancy, room_capacities, room_types
+                )
+
+        return self.build_result(
+            demands,
+            placed,
+            output_path=output_path,
+            moved_sections=(
+                len(demands) - unchanged if previous_schedule is not None else None
+            ),
+            unchanged_sections=unchanged if previous_schedule is not None else None,
+        )
 
-        sec_course_col = find_column(self.sections, ["Course_Name", "Course", "Subject"], required=False)
-        sec_div_col = find_column(self.sections, ["Division", "Num_ID", "Division_ID", "Group_ID", "Group", "Major"], required=False)
-        sec_name_col = find_column(self.sections, ["Section", "Section_Name", "Sec", "Name"], required=False)
-        sec_inst_col = find_column(self.sections, ["Instructor_Name", "Instructor", "Doctor", "Assistant", "Assistant_Name", "TA"], required=False)
+    def build_result(
+        self,
+        demands: List[Dict[str, Any]],
+        placed: List[Optional[Tuple[str, int, int, str]]],
+        output_path: Optional[Path] = None,
+        moved_sections: Optional[int] = None,
+        unchanged_sections: Optional[int] = None,
+        cp_schedule: Optional[pd.DataFrame] = None,
+    ) -> SectionScheduleResult:
+        """Combine CP rows with placed sections and optionally write them."""
+        with self.timings.span("build_result"):
+            section_rows = [
+                self._section_row(demand, slot) for demand, slot in zip(demands, placed)
+            ]
+
+            section_schedule = pd.DataFrame(section_rows, columns=FINAL_COLS)
+            cp_formatted = self._format_cp_output(
+                self.cp_schedule if cp_schedule is None else cp_schedule
+            )
 
-        def normalize_instructor_name(value: Any) -> str:
-            raw = "" if value is None else str(value).strip()
-            return assistant_id_to_name.get(raw, raw)
+        written_path: Optional[Path] = None
+        if output_path is not None:
+            with self.timings.span("write_output"):
+                written_path = self._write_output(output_path, cp_formatted, section_schedule)
+
+        return SectionScheduleResult(
+            cp_formatted=cp_formatted,
+            section_schedule=section_schedule,
+            written_path=written_path,
+            moved_sections=moved_sections,
+            unchanged_sections=unchanged_sections,
+        )
 
-        from .utils import time_to_minutes, minutes_to_time_str
-        
-        # Determine available days from CP slots, or default
-        days = ["Saturday", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
-        if "Day" in cp_slots.columns and not cp_slots["Day"].empty:
-            days = cp_slots["Day"].unique().tolist()
-        
-        # Standard time blocks (2 hours)
-        blocks = [
-            (9 * 60, 11 * 60),
-            (11 * 60, 13 * 60),
-            (13 * 60, 15 * 60),
-            (15 * 60, 17 * 60),
+    def prepare_sections(
+        self, course_catalog: pd.DataFrame
+    ) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+        """Section demands and their candidate room names.
+
+        ``course_catalog`` supplies per-course ``Instructor_Name`` and
+        ``Major`` defaults, as the CP output does in the sequential pipeline.
+        """
+        room_capacities, room_types = self._build_room_info()
+        demands = self._build_section_demands(course_catalog)
+        candidate_rooms = [
+            self._candidate_rooms(demand, room_capacities, room_types) for demand in demands
         ]
-        
-        # Initialize busy tracking from CP lectures
-        room_busy: List[Tuple[str, int, int, str]] = []  # day, start, end, room
-        div_busy: List[Tuple[str, int, int, str]] = []   # day, start, end, division
-        inst_busy: List[Tuple[str, int, int, str]] = []  # day, start, end, instructor
-
-        for _, row in cp_slots.iterrows():
-            day = str(row.get("Day", "")).strip()
-            room = str(row.get("Room", "")).strip()
-            major = str(row.get("Major", "")).strip()
-            inst = str(row.get("Instructor_Name", "")).strip()
-            
-            try:
-                start_m = time_to_minutes(str(row.get("Start_Time", "")))
-                end_m = time_to_minutes(str(row.get("End_Time", "")))
-            except (ValueError, TypeError):
-                continue
-                
+        return demands, candidate_rooms
+
+    def estimate_size(self) -> Dict[str, int]:
+        """Section and room counts in ``SchedulingCP.estimate_size()`` terms.
+
+        Greedy placement has no solver model: each section may try every room
+        (the "variables"), and the occupancy index holds one entry per lecture
+        row and placed section (the "constraints").
+        """
+        sections = len(self.sections)
+        rooms = len(self.rooms)
+        return {
+            "variables": sections * rooms,
+            "constraints": len(self.cp_schedule) + sections,
+            "sections": sections,
+            "rooms": rooms,
+        }
+
+    def _build_lecture_occupancy(self, cp_slots: pd.DataFrame) -> Dict[str, OccupancyIndex]:
+        """Index CP lectures by room, division (major) and instructor."""
+        occupancy = {
+            "room": OccupancyIndex(),
+            "division": OccupancyIndex(),
+            "instructor": OccupancyIndex(),
+        }
+
+        lectures = zip(
+            _str_column(cp_slots, "Day"),
+            _str_column(cp_slots, "Room"),
+            _str_column(cp_slots, "Major"),
+            _str_column(cp_slots, "Instructor_Name"),
+            times_to_minutes(cp_slots["Start_Time"].astype(str)).tolist(),
+            times_to_minutes(cp_slots["End_Time"].astype(str)).tolist(),
+        )
+        for day, room, major, inst, start_m, end_m in lectures:
             if day and start_m < end_m:
                 if room:
-                    room_busy.append((day, start_m, end_m, room))
+                    occupancy["room"].add(day, room, start_m, end_m)
                 if major:
-                    div_busy.append((day, start_m, end_m, major))
+                    occupancy["division"].add(day, major, start_m, end_m)
                 if inst:
-                    inst_busy.append((day, start_m, end_m, inst))
-
-        def is_overlap(start1, end1, start2, end2):
-            return max(start1, start2) < min(end1, end2)
-
-        import math
-        
-        section_rows: List[Dict[str, Any]] = []
-        auto_instructor_idx = 0
-
-        # Count sections per division+course to divide students
-        section_counts = {}
-        for _, sec in self.sections.iterrows():
-            c_name = str(sec[sec_course_col]).strip() if sec_course_col else ""
-            d_name = str(sec[sec_div_col]).strip() if sec_div_col else ""
-            key = (c_name, d_name)
-            section_counts[key] = section_counts.get(key, 0) + 1
+                    occupancy["instructor"].add(day, inst, start_m, end_m)
 
-        course_section_idx = {}
+        return occupancy
 
-        # Pre-calculate room capacities and types
-        room_capacities = {}
-        room_types = {}
+    def _build_room_info(self) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """Pre-calculate room capacities and types keyed by room name."""
+        room_capacities: Dict[str, int] = {}
+        room_types: Dict[str, str] = {}
         room_name_col = find_column(self.rooms, ["Room", "Room_Name"])
         room_cap_col = find_column(self.rooms, ["Capacity", "Cap", "Size"], required=False)
         room_type_col = find_column(self.rooms, ["Type", "Room_Type"], required=False)
@@ -151,8 +258,35 @@ class SectionScheduler:
                     room_types[rname] = str(r.get(room_type_col, "")).strip().lower()
                 else:
                     room_types[rname] = "lab"
-                    
-        all_rooms_list = list(room_capacities.keys())
+        return room_capacities, room_types
+
+    def _build_section_demands(self, cp_slots: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Resolve each section row to its course, group, assistant and size."""
+        assistant_pool, assistant_id_to_name = self._build_assistant_pool()
+        division_students = self._build_division_students()
+        course_instructor_from_data = self._build_course_instructor_map()
+        course_defaults = self._build_course_defaults(cp_slots)
+
+        sec_course_col = find_column(self.sections, ["Course_Name", "Course", "Subject"], required=False)
+        sec_div_col = find_column(self.sections, ["Division", "Num_ID", "Division_ID", "Group_ID", "Group", "Major"], required=False)
+        sec_name_col = find_column(self.sections, ["Section", "Section_Name", "Sec", "Name"], required=False)
+        sec_inst_col = find_column(self.sections, ["Instructor_Name", "Instructor", "Doctor", "Assistant", "Assistant_Name", "TA"], required=False)
+
+        def normalize_instructor_name(value: Any) -> str:
+            raw = "" if value is None else str(value).strip()
+            return assistant_id_to_name.get(raw, raw)
+
+        # Count sections per division+course to divide students
+        section_counts: Dict[Tuple[str, str], int] = {}
+        for _, sec in self.sections.iterrows():
+            c_name = str(sec[sec_course_col]).strip() if sec_course_col else ""
+            d_name = str(sec[sec_div_col]).strip() if sec_div_col else ""
+            key = (c_name, d_name)
+            section_counts[key] = section_counts.get(key, 0) + 1
+
+        course_section_idx: Dict[Tuple[str, str], int] = {}
+        auto_instructor_idx = 0
+        demands: List[Dict[str, Any]] = []
 
         for i, sec in self.sections.iterrows():
             course_name = str(sec[sec_course_col]).strip() if sec_course_col else ""
@@ -171,7 +305,7 @@ class SectionScheduler:
 
             defaults = course_defaults.get(course_name, {})
             section_instructor_name = course_instructor_from_data.get(course_name) or defaults.get("Instructor_Name", "")
-            
+
             raw_students = division_students.get(division_name, "")
             divided_students = raw_students
             try:
@@ -182,125 +316,195 @@ class SectionScheduler:
 
             major = division_name if division_name else defaults.get("Major", "")
 
-            assigned = False
-            
-            # Find an available slot
-            for day in days:
-                for start_m, end_m in blocks:
-                    # Check division overlap (lectures block the whole division, sections block only the specific sub-group)
-                    div_conflict = any(
-                        db_day == day and (db_div == division_name or db_div == student_group_id) and is_overlap(start_m, end_m, db_start, db_end)
-                        for db_day, db_start, db_end, db_div in div_busy
-                    )
-                    if div_conflict:
-                        continue
-                        
-                    # Check assistant overlap
-                    inst_conflict = any(
-                        ib_day == day and ib_inst == section_assistant and is_overlap(start_m, end_m, ib_start, ib_end)
-                        for ib_day, ib_start, ib_end, ib_inst in inst_busy
-                    )
-                    if inst_conflict:
-                        continue
-                        
-                    # Find a free room
-                    chosen_room = ""
-                    
-                    if "lab" in major.lower() or "practical" in major.lower() or "lab" in course_name.lower():
-                        needed_type = "lab"
-                    else:
-                        needed_type = "lecture"
-                        
-                    # Filter rooms by type
-                    target_rooms = [
-                        r for r in all_rooms_list
-                        if (needed_type == "lab" and "lab" in room_types.get(r, "lab")) or
-                           (needed_type == "lecture" and "lecture" in room_types.get(r, "lecture"))
-                    ]
-                    # Fallback to all rooms if no specific ones match
-                    if not target_rooms:
-                        target_rooms = all_rooms_list
-
-                    for room in target_rooms:
-                        # Capacity check
-                        cap = room_capacities.get(room, 30)
-                        try:
-                            if int(divided_students) > cap:
-                                continue
-                        except (ValueError, TypeError):
-                            pass
-
-                        room_conflict = any(
-                            rb_day == day and rb_room == room and is_overlap(start_m, end_m, rb_start, rb_end)
-                            for rb_day, rb_start, rb_end, rb_room in room_busy
-                        )
-                        if not room_conflict:
-                            chosen_room = room
-                            break
-                            
-                    if chosen_room:
-                        room_busy.append((day, start_m, end_m, chosen_room))
-                        div_busy.append((day, start_m, end_m, student_group_id))
-                        inst_busy.append((day, start_m, end_m, section_assistant))
-                        
-                        section_rows.append({
-                            "Day": day,
-                            "Course_Name": course_name,
-                            "Instructor_Name": section_instructor_name,
-                            "Assistant_Name": section_assistant,
-                            "Students": divided_students,
-                            "Room": chosen_room,
-                            "Start_Time": minutes_to_time_str(start_m),
-                            "End_Time": minutes_to_time_str(end_m),
-                            "Major": major,
-                        })
-                        assigned = True
-                        break
-                        
-                if assigned:
-                    break
-
-            if not assigned:
-                section_rows.append({
-                    "Day": "UNASSIGNED",
-                    "Course_Name": course_name,
-                    "Instructor_Name": section_instructor_name,
-                    "Assistant_Name": section_assistant,
-                    "Students": divided_students,
-                    "Room": "",
-                    "Start_Time": "",
-                    "End_Time": "",
-                    "Major": major,
-                })
-
-        section_schedule = pd.DataFrame(section_rows)
-        cp_formatted = self._format_cp_output(self.cp_schedule)
-        combined_schedule = pd.concat([cp_formatted, section_schedule[FINAL_COLS]], ignore_index=True)
+            if "lab" in major.lower() or "practical" in major.lower() or "lab" in course_name.lower():
+                needed_type = "lab"
+            else:
+                needed_type = "lecture"
+
+            demands.append(
+                {
+                    "course_name": course_name,
+                    "division_name": division_name,
+                    "section_name": section_name,
+                    "student_group_id": student_group_id,
+                    "assistant": section_assistant,
+                    "instructor_name": section_instructor_name,
+                    "students": divided_students,
+                    "major": major,
+                    "room_type": needed_type,
+                }
+            )
 
-        written_path: Optional[Path] = None
-        if output_path is not None:
-            written_path = self._write_output_excel(
-                output_path, combined_schedule, cp_formatted, section_schedule
+        return demands
+
+    @staticmethod
+    def _candidate_rooms(
+        demand: Dict[str, Any],
+        room_capacities: Dict[str, int],
+        room_types: Dict[str, str],
+    ) -> List[str]:
+        """Rooms of the needed type that can seat the section."""
+        all_rooms_list = list(room_capacities.keys())
+        needed_type = demand["room_type"]
+
+        # Filter rooms by type
+        target_rooms = [
+            r for r in all_rooms_list
+            if (needed_type == "lab" and "lab" in room_types.get(r, "lab")) or
+               (needed_type == "lecture" and "lecture" in room_types.get(r, "lecture"))
+        ]
+        # Fallback to all rooms if no specific ones match
+        if not target_rooms:
+            target_rooms = all_rooms_list
+
+        fitting_rooms = []
+        for room in target_rooms:
+            # Capacity check
+            cap = room_capacities.get(room, 30)
+            try:
+                if int(demand["students"]) > cap:
+                    continue
+            except (ValueError, TypeError):
+                pass
+            fitting_rooms.append(room)
+        return fitting_rooms
+
+    @staticmethod
+    def _slot_is_free(
+        occupancy: Dict[str, OccupancyIndex],
+        demand: Dict[str, Any],
+        day: str,
+        start_m: int,
+        end_m: int,
+        room: Optional[str] = None,
+    ) -> bool:
+        # Lectures block the whole division, sections block only the specific sub-group
+        if not occupancy["division"].is_free(day, demand["division_name"], start_m, end_m):
+            return False
+        if not occupancy["division"].is_free(day, demand["student_group_id"], start_m, end_m):
+            return False
+        if not occupancy["instructor"].is_free(day, demand["assistant"], start_m, end_m):
+            return False
+        if room is not None and not occupancy["room"].is_free(day, room, start_m, end_m):
+            return False
+        return True
+
+    @staticmethod
+    def _reserve(
+        occupancy: Dict[str, OccupancyIndex],
+        demand: Dict[str, Any],
+        day: str,
+        start_m: int,
+        end_m: int,
+        room: str,
+    ) -> None:
+        occupancy["room"].add(day, room, start_m, end_m)
+        occupancy["division"].add(day, demand["student_group_id"], start_m, end_m)
+        occupancy["instructor"].add(day, demand["assistant"], start_m, end_m)
+
+    def _find_slot(
+        self,
+        demand: Dict[str, Any],
+        days: List[str],
+        occupancy: Dict[str, OccupancyIndex],
+        room_capacities: Dict[str, int],
+        room_types: Dict[str, str],
+    ) -> Optional[Tuple[str, int, int, str]]:
+        """Greedily pick the first free (day, block, room) for a section."""
+        candidate_rooms = self._candidate_rooms(demand, room_capacities, room_types)
+
+        for day in days:
+            for start_m, end_m in self.time_grid.section_blocks(day):
+                if not self._slot_is_free(occupancy, demand, day, start_m, end_m):
+                    continue
+                for room in candidate_rooms:
+                    if occupancy["room"].is_free(day, room, start_m, end_m):
+                        self._reserve(occupancy, demand, day, start_m, end_m, room)
+                        return day, start_m, end_m, room
+        return None
+
+    @staticmethod
+    def _section_row(
+        demand: Dict[str, Any], slot: Optional[Tuple[str, int, int, str]]
+    ) -> Dict[str, Any]:
+        row = {
+            "Day": "UNASSIGNED",
+            "Course_Name": demand["course_name"],
+            "Instructor_Name": demand["instructor_name"],
+            "Assistant_Name": demand["assistant"],
+            "Students": demand["students"],
+            "Room": "",
+            "Start_Time": "",
+            "End_Time": "",
+            "Major": demand["major"],
+        }
+        if slot is not None:
+            day, start_m, end_m, room = slot
+            row.update(
+                {
+                    "Day": day,
+                    "Room": room,
+                    "Start_Time": minutes_to_time_str(start_m),
+                    "End_Time": minutes_to_time_str(end_m),
+                }
             )
+        return row
 
-        return SectionScheduleResult(
-            combined_schedule=combined_schedule,
-            cp_formatted=cp_formatted,
-            section_schedule=section_schedule,
-            written_path=written_path,
+    @staticmethod
+    def _match_previous_sections(
+        demands: List[Dict[str, Any]], previous_schedule: pd.DataFrame
+    ) -> Dict[int, Tuple[str, int, int, str]]:
+        """Map demand index -> previous (day, start, end, room) placement.
+
+        Section rows are recognised by a non-empty ``Assistant_Name`` (CP
+        lecture rows carry none) and matched to demands by course, major and
+        assistant in order of appearance.
+        """
+        if previous_schedule.empty or "Assistant_Name" not in previous_schedule.columns:
+            return {}
+
+        previous_slots: Dict[Tuple[str, str, str], List[Optional[Tuple[str, int, int, str]]]] = {}
+        rows = zip(
+            _clean_column(previous_schedule, "Assistant_Name"),
+            _clean_column(previous_schedule, "Course_Name"),
+            _clean_column(previous_schedule, "Major"),
+            _clean_column(previous_schedule, "Day"),
+            _clean_column(previous_schedule, "Room"),
+            times_to_minutes(_clean_column(previous_schedule, "Start_Time")).tolist(),
+            times_to_minutes(_clean_column(previous_schedule, "End_Time")).tolist(),
         )
+        for assistant, course, major, day, room, start_m, end_m in rows:
+            if not assistant:
+                continue
+            key = (course, major, assistant)
+            slot = None
+            if day and day != "UNASSIGNED" and room and start_m < end_m:
+                slot = (day, start_m, end_m, room)
+            previous_slots.setdefault(key, []).append(slot)
+
+        matched: Dict[int, Tuple[str, int, int, str]] = {}
+        seen: Dict[Tuple[str, str, str], int] = {}
+        for idx, demand in enumerate(demands):
+            key = (demand["course_name"], demand["major"], demand["assistant"])
+            occurrence = seen.get(key, 0)
+            seen[key] = occurrence + 1
+            candidates = previous_slots.get(key, [])
+            if occurrence < len(candidates) and candidates[occurrence] is not None:
+                matched[idx] = candidates[occurrence]
+        return matched
 
     def _prepare_cp_slots(self) -> pd.DataFrame:
-        cp_slots = self.cp_schedule.copy()
+        cp_slots = self.cp_schedule
         for col in ["Course_Name", "Day", "Start_Time", "End_Time"]:
             if col not in cp_slots.columns:
                 raise ValueError(f"CP output missing column: {col}")
 
-        for col in ["Assistant_Name", "Major", "Instructor_Name", "Students", "Room"]:
-            if col not in cp_slots.columns:
-                cp_slots[col] = ""
-
-        return cp_slots
+        missing = {
+            col: ""
+            for col in ["Assistant_Name", "Major", "Instructor_Name", "Students", "Room"]
+            if col not in cp_slots.columns
+        }
+        return cp_slots.assign(**missing) if missing else cp_slots
 
     def _get_lab_rooms(self) -> List[str]:
         room_name_col = find_column(self.rooms, ["Room", "Room_Name"])
@@ -415,67 +619,85 @@ class SectionScheduler:
         return course_defaults
 
     def _format_cp_output(self, cp_schedule: pd.DataFrame) -> pd.DataFrame:
-        cp_formatted = cp_schedule.copy()
-        if "Assistant_Name" not in cp_formatted.columns:
-            cp_formatted["Assistant_Name"] = ""
-        for col in FINAL_COLS:
-            if col not in cp_formatted.columns:
-                cp_formatted[col] = ""
-        return cp_formatted[FINAL_COLS]
-
-    def _write_output_excel(
-        self,
-        target_path: Path,
-        combined_schedule: pd.DataFrame,
-        cp_formatted: pd.DataFrame,
-        section_schedule: pd.DataFrame,
-    ) -> Path:
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        written_path = target_path
-
-        try:
-            self._save_workbook(
-                written_path, combined_schedule, cp_formatted, section_schedule
-            )
-        except PermissionError:
-            fallback_path = target_path.with_name(
-                f"{target_path.stem}_{pd.Timestamp.now():%Y%m%d_%H%M%S}{target_path.suffix}"
-            )
-            self._save_workbook(
-                fallback_path, combined_schedule, cp_formatted, section_schedule
-            )
-            written_path = fallback_path
+        return cp_schedule.reindex(columns=FINAL_COLS, fill_value="")
 
+    def save_result(self, result: SectionScheduleResult, output_path: Path) -> Path:
+        """Write a finished result; returns the path actually written."""
+        written_path = self._write_output(
+            output_path, result.cp_formatted, result.section_schedule
+        )
+        result.written_path = written_path
         return written_path
 
     @staticmethod
-    def _save_workbook(
-        target_path: Path,
-        combined_schedule: pd.DataFrame,
-        cp_formatted: pd.DataFrame,
-        section_schedule: pd.DataFrame,
-    ) -> None:
-        with pd.ExcelWriter(target_path, engine="openpyxl") as writer:
-            combined_schedule.to_excel(writer, sheet_name="Schedule", index=False)
-            cp_formatted.to_excel(writer, sheet_name="CP_Only", index=False)
-            section_schedule.to_excel(writer, sheet_name="Sections_Only", index=False)
+    def _write_output(
+        target_path: Path, cp_formatted: pd.DataFrame, section_schedule: pd.DataFrame
+    ) -> Path:
+        """Stream Schedule, CP_Only and Sections_Only without a combined frame."""
+        return write_schedule(
+            target_path,
+            {
+                "Schedule": (
+                    FINAL_COLS,
+                    concat_rows(
+                        frame_rows(cp_formatted, FINAL_COLS),
+                        frame_rows(section_schedule, FINAL_COLS),
+                    ),
+                ),
+                "CP_Only": (FINAL_COLS, frame_rows(cp_formatted, FINAL_COLS)),
+                "Sections_Only": (FINAL_COLS, frame_rows(section_schedule, FINAL_COLS)),
+            },
+        )
+
+
+def _clean(value: Any) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def _clean_column(frame: pd.DataFrame, column: str) -> List[str]:
+    if column not in frame.columns:
+        return [""] * len(frame)
+    return [_clean(value) for value in frame[column].tolist()]
+
+
+def _str_column(frame: pd.DataFrame, column: str) -> List[str]:
+    if column not in frame.columns:
+        return [""] * len(frame)
+    return [str(value).strip() for value in frame[column].tolist()]
+
+
+ENTRY_COLUMNS = (
+    ("day", "Day"),
+    ("course_name", "Course_Name"),
+    ("instructor_name", "Instructor_Name"),
+    ("assistant_name", "Assistant_Name"),
+    ("students", "Students"),
+    ("room", "Room"),
+    ("start_time", "Start_Time"),
+    ("end_time", "End_Time"),
+    ("major", "Major"),
+)
 
 
 def dataframe_to_schedule_entries(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    """Convert a schedule dataframe to API-friendly dicts."""
-    entries: List[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        entries.append(
-            {
-                "day": str(row.get("Day", "")),
-                "course_name": str(row.get("Course_Name", "")),
-                "instructor_name": str(row.get("Instructor_Name", "")),
-                "assistant_name": str(row.get("Assistant_Name", "")),
-                "students": row.get("Students", ""),
-                "room": str(row.get("Room", "")),
-                "start_time": str(row.get("Start_Time", "")),
-                "end_time": str(row.get("End_Time", "")),
-                "major": str(row.get("Major", "")),
-            }
-        )
-    return entries
+    """Convert a schedule dataframe to API-friendly dicts, one column at a time."""
+    keys = [key for key, _ in ENTRY_COLUMNS]
+    columns = [_entry_column(df, key, column) for key, column in ENTRY_COLUMNS]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
+def iter_schedule_entries(df: pd.DataFrame, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """``dataframe_to_schedule_entries`` one chunk of rows at a time."""
+    for start in range(0, len(df), chunk_size):
+        yield from dataframe_to_schedule_entries(df.iloc[start : start + chunk_size])
+
+
+def _entry_column(df: pd.DataFrame, key: str, column: str) -> List[Any]:
+    if column not in df.columns:
+        return [""] * len(df)
+    values = df[column].tolist()
+    if key == "students":
+        return values
+    return [str(value) for value in values]
@@ -1,6 +1,6 @@
 """Utilities for section scheduling."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -20,3 +20,19 @@ def find_column(
             f"Missing required column. Tried: {candidates}. Available: {list(df.columns)}"
         )
     return None
+
+
+class OccupancyIndex:
+    """Busy intervals grouped by (day, resource) for fast overlap checks."""
+
+    def __init__(self) -> None:
+        self._busy: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+
+    def add(self, day: str, key: str, start: int, end: int) -> None:
+        self._busy.setdefault((day, key), []).append((start, end))
+
+    def is_free(self, day: str, key: str, start: int, end: int) -> bool:
+        for busy_start, busy_end in self._busy.get((day, key), ()):
+            if max(start, busy_start) < min(end, busy_end):
+                return False
+        return True
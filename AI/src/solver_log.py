@@ -0,0 +1,156 @@
+"""CP-SAT search logs and per-attempt solver statistics, kept per solve."""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ortools.sat.python import cp_model
+
+_SIZE_LINE = re.compile(r"^#(Variables|k\w+): ([\d']+)")
+
+
+class SolverLog:
+    """Log sink for ``CpSolver.log_callback``.
+
+    Keeps the first ``max_lines // 4`` lines (model summary and presolve)
+    and the most recent rest, counting what was dropped in between; with
+    ``max_lines=0`` nothing is kept. The initial and presolved model
+    summaries are parsed either way, so their sizes are always known.
+    """
+
+    def __init__(self, max_lines: int = 2000) -> None:
+        self.max_lines = max_lines
+        self._head: List[str] = []
+        self._tail: Deque[str] = deque(maxlen=max_lines - max_lines // 4)
+        self.dropped_lines = 0
+        self._lock = threading.Lock()
+        self.start_attempt()
+
+    def start_attempt(self, title: Optional[str] = None) -> None:
+        """Reset the parsed summary; ``title`` is written to the buffer as a marker."""
+        self.sizes: Dict[str, Dict[str, int]] = {}
+        self.presolve_seconds: Optional[float] = None
+        self._block: Optional[str] = None
+        if title:
+            self._keep(f"=== {title} ===")
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            for line in message.splitlines():
+                self._parse(line)
+                self._keep(line)
+
+    def _keep(self, line: str) -> None:
+        if self.max_lines <= 0:
+            return
+        if len(self._head) < self.max_lines // 4:
+            self._head.append(line)
+            return
+        if len(self._tail) == self._tail.maxlen:
+            self.dropped_lines += 1
+        self._tail.append(line)
+
+    def _parse(self, line: str) -> None:
+        if line.startswith("Initial "):
+            self._block = "initial"
+        elif line.startswith("Presolved "):
+            self._block = "presolved"
+        elif line.startswith("Starting search at "):
+            self._block = None
+            self.presolve_seconds = float(line.split()[3].rstrip("s"))
+        elif self._block is not None:
+            match = _SIZE_LINE.match(line)
+            if match is None:
+                if not line.strip():
+                    self._block = None
+                return
+            sizes = self.sizes.setdefault(self._block, {"variables": 0, "constraints": 0})
+            count = int(match.group(2).replace("'", ""))
+            if match.group(1) == "Variables":
+                sizes["variables"] = count
+            else:
+                sizes["constraints"] += count
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            if self.dropped_lines:
+                gap = [f"... {self.dropped_lines} lines dropped ..."]
+                return self._head + gap + list(self._tail)
+            return self._head + list(self._tail)
+
+
+def attempt_stats(
+    solver: cp_model.CpSolver, status: str, max_days_per_year: int, log: SolverLog
+) -> Dict[str, Any]:
+    """``ResponseStats`` fields of one solve attempt plus the model sizes from its log."""
+    initial = log.sizes.get("initial", {})
+    presolved = log.sizes.get("presolved", {})
+    return {
+        "max_days_per_year": max_days_per_year,
+        "status": status,
+        "wall_seconds": solver.WallTime(),
+        "user_seconds": solver.UserTime(),
+        "deterministic_time": solver.deterministic_time,
+        "presolve_seconds": log.presolve_seconds,
+        "branches": solver.NumBranches(),
+        "conflicts": solver.NumConflicts(),
+        "booleans": solver.NumBooleans(),
+        "variables": initial.get("variables"),
+        "constraints": initial.get("constraints"),
+        "presolved_variables": presolved.get("variables"),
+        "presolved_constraints": presolved.get("constraints"),
+    }
+
+
+class SolveStore:
+    """Statistics and (when captured) search logs of the last ``max_solves`` solves."""
+
+    def __init__(self, max_solves: int = 64) -> None:
+        self.max_solves = max_solves
+        self._solves: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        engine: str,
+        status: Optional[str],
+        attempts: List[Dict[str, Any]],
+        log: Optional[SolverLog],
+    ) -> str:
+        solve_id = uuid.uuid4().hex
+        record = {
+            "solve_id": solve_id,
+            "engine": engine,
+            "status": status,
+            "created_at": time.time(),
+            "attempts": attempts,
+            "log": log.lines() if log is not None and log.max_lines > 0 else None,
+            "log_dropped_lines": log.dropped_lines if log is not None else 0,
+        }
+        with self._lock:
+            self._solves[solve_id] = record
+            while len(self._solves) > self.max_solves:
+                self._solves.popitem(last=False)
+        return solve_id
+
+    def get(self, solve_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._solves.get(solve_id)
+            return dict(record) if record is not None else None
+
+
+def summarize(attempts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The last attempt's statistics, with the attempt count and total wall time."""
+    if not attempts:
+        return None
+    return {
+        **attempts[-1],
+        "attempts": len(attempts),
+        "total_wall_seconds": sum(attempt["wall_seconds"] for attempt in attempts),
+    }
+
+
+solve_store = SolveStore()
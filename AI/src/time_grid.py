@@ -0,0 +1,119 @@
+"""Time grid shared by the CP lecture and section schedulers."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import time_to_minutes
+
+
+SUPPORTED_GRANULARITIES = (30, 60)
+
+DEFAULT_DAY_START = 8 * 60
+DEFAULT_DAY_END = 17 * 60
+DEFAULT_SECTION_START = 9 * 60
+DEFAULT_SECTION_DURATION = 2 * 60
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    """Discrete start times, opening hours and durations for scheduling.
+
+    Starts are indexed in ``granularity_minutes`` steps from the earliest
+    opening time, so a meeting is a single start index plus a duration in
+    slots regardless of how fine the grid is.
+    """
+
+    granularity_minutes: int = 60
+    day_start: int = DEFAULT_DAY_START
+    day_end: int = DEFAULT_DAY_END
+    opening_hours: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    durations: Dict[str, int] = field(default_factory=dict)
+    section_start: int = DEFAULT_SECTION_START
+
+    def __post_init__(self) -> None:
+        if self.granularity_minutes not in SUPPORTED_GRANULARITIES:
+            raise ValueError(
+                f"granularity_minutes must be one of {SUPPORTED_GRANULARITIES}, "
+                f"got {self.granularity_minutes}"
+            )
+        for day, (start, end) in {None: (self.day_start, self.day_end), **self.opening_hours}.items():
+            if start >= end:
+                raise ValueError(f"Opening hours for {day or 'default'} must end after they start")
+
+    @classmethod
+    def from_config(cls, config: Optional[Any]) -> "TimeGrid":
+        """Build a grid from a ``TimeGridConfig`` (or the defaults when None)."""
+        if config is None:
+            return cls()
+        return cls(
+            granularity_minutes=int(config.granularity_minutes),
+            day_start=time_to_minutes(config.day_start),
+            day_end=time_to_minutes(config.day_end),
+            opening_hours={
+                day: (time_to_minutes(hours.start), time_to_minutes(hours.end))
+                for day, hours in config.opening_hours.items()
+            },
+            durations={key: int(value) for key, value in config.durations.items()},
+            section_start=time_to_minutes(config.section_start),
+        )
+
+    def hours_for(self, day: str) -> Tuple[int, int]:
+        return self.opening_hours.get(day, (self.day_start, self.day_end))
+
+    @property
+    def origin(self) -> int:
+        return min([self.day_start] + [start for start, _ in self.opening_hours.values()])
+
+    @property
+    def horizon(self) -> int:
+        return max([self.day_end] + [end for _, end in self.opening_hours.values()])
+
+    def slot_starts(self) -> List[int]:
+        """Minutes since midnight for every slot index."""
+        return list(range(self.origin, self.horizon + 1, self.granularity_minutes))
+
+    def slots_for(self, duration_minutes: int) -> int:
+        """Number of grid slots a meeting of this length occupies."""
+        return max(1, -(-int(duration_minutes) // self.granularity_minutes))
+
+    def duration_for(self, course_type: Any, hours_per_day: Any = None) -> int:
+        """Meeting length in minutes: per-type override, else ``Hours_per_day``."""
+        override = self.durations.get(str(course_type))
+        if override is not None:
+            return int(override)
+        if hours_per_day is not None:
+            return int(hours_per_day) * 60
+        return self.granularity_minutes
+
+    def allowed_start_indices(self, day: str, duration_minutes: int) -> List[int]:
+        """Slot indices where a meeting starts and ends inside ``day``'s hours."""
+        open_m, close_m = self.hours_for(day)
+        return [
+            idx
+            for idx, start in enumerate(self.slot_starts())
+            if start >= open_m and start + duration_minutes <= close_m
+        ]
+
+    @property
+    def section_duration(self) -> int:
+        return int(self.durations.get("Section", DEFAULT_SECTION_DURATION))
+
+    def to_index(self, minutes: int) -> int:
+        """Slot index of a start time on this grid."""
+        return (int(minutes) - self.origin) // self.granularity_minutes
+
+    def section_blocks(self, day: str, duration_minutes: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Back-to-back section blocks inside ``day``'s hours."""
+        duration = duration_minutes or self.section_duration
+        open_m, close_m = self.hours_for(day)
+        start = max(self.section_start, open_m)
+        offset = (start - self.origin) % self.granularity_minutes
+        if offset:
+            start += self.granularity_minutes - offset
+
+        step = self.slots_for(duration) * self.granularity_minutes
+        blocks: List[Tuple[int, int]] = []
+        while start + duration <= close_m:
+            blocks.append((start, start + duration))
+            start += step
+        return blocks
@@ -0,0 +1,104 @@
+"""Per-request phase timings, optionally with tracemalloc peaks."""
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False  # True when tracing was started here rather than by the host
+
+
+class Timings:
+    """Wall time, and optionally Python heap peak, per named phase.
+
+    A span opened inside another is recorded as ``parent.child``; spans
+    with the same name (one per relaxation attempt, say) are summed with
+    a count. Memory peaks come from ``tracemalloc``: they cover Python and
+    NumPy allocations but not CP-SAT's C++ heap, and tracing is
+    process-wide, so concurrent traced requests see each other's
+    allocations.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._started = time.perf_counter()
+        self._phases: Dict[str, Dict[str, Any]] = {}
+        self._open: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if trace_memory:
+            _start_tracing()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        with self._lock:
+            frame = {
+                "name": ".".join([parent["name"] for parent in self._open[-1:]] + [name]),
+                "start": time.perf_counter(),
+            }
+            if self.trace_memory:
+                current, _ = self._memory_checkpoint()
+                frame["base"] = frame["peak"] = current
+            self._open.append(frame)
+        try:
+            yield
+        finally:
+            with self._lock:
+                seconds = time.perf_counter() - frame["start"]
+                if self.trace_memory:
+                    self._memory_checkpoint()
+                self._open.remove(frame)
+                phase = self._phases.setdefault(frame["name"], {"seconds": 0.0, "count": 0})
+                phase["seconds"] += seconds
+                phase["count"] += 1
+                if self.trace_memory:
+                    phase["peak_bytes"] = max(
+                        phase.get("peak_bytes", 0), frame["peak"] - frame["base"]
+                    )
+
+    def _memory_checkpoint(self) -> Tuple[int, int]:
+        """Fold the peak since the last checkpoint into every open span, then reset it."""
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._open:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+        return current, peak
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop memory tracing for this request and return ``to_dict()``."""
+        if self.trace_memory:
+            self.trace_memory = False
+            _stop_tracing()
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_seconds": time.perf_counter() - self._started,
+                "phases": {name: dict(phase) for name, phase in self._phases.items()},
+            }
+
+    def log(self, event: str, **fields: Any) -> None:
+        """Print the timings as one JSON line."""
+        print(json.dumps({"event": event, **fields, **self.to_dict()}, default=str), flush=True)
+
+
+def _start_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
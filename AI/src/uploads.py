@@ -0,0 +1,117 @@
+"""Uploaded Data.xlsx / SData.xlsx workbooks, referenced later by id."""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from .workbook_cache import Sheets, read_workbook, workbook_cache
+
+
+DEFAULT_UPLOAD_DIR = Path("data/Processed Data/.cache/uploads")
+
+REQUIRED_SHEETS = {
+    "data": ["Rooms", "Courses", "Doctors", "Division"],
+    "sdata": ["Rooms", "Section", "Assistant", "Division"],
+}
+
+UPLOAD_ID_PATTERN = re.compile(r"^(data|sdata)_[0-9a-f]{16}$")
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class UploadStore:
+    """Spool uploads to disk, parse them once and register them in the cache.
+
+    Uploads older than ``max_age_seconds`` are deleted and at most the
+    newest ``max_uploads`` are kept; uploading the same workbook again
+    renews it. The file's mtime is left alone otherwise, as the workbook
+    cache keys on it.
+    """
+
+    def __init__(
+        self,
+        upload_dir: Path,
+        chunk_size: int = 1 << 20,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+        max_uploads: int = 64,
+        max_age_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.upload_dir = upload_dir
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.max_uploads = max_uploads
+        self.max_age_seconds = max_age_seconds
+
+    def store(self, stream: BinaryIO, kind: str) -> Tuple[str, Path, Sheets]:
+        """Save an uploaded workbook; returns ``(upload_id, path, sheets)``."""
+        if kind not in REQUIRED_SHEETS:
+            raise ValueError(f"Unknown workbook kind: {kind}")
+
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(prefix=".upload-", suffix=".xlsx", dir=self.upload_dir)
+        tmp_path = Path(tmp_name)
+        try:
+            size = 0
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b""):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge(f"Upload is larger than {self.max_bytes} bytes")
+                    digest.update(chunk)
+                    handle.write(chunk)
+
+            try:
+                sheets = read_workbook(tmp_path)
+            except Exception as exc:
+                raise ValueError(f"Not a readable .xlsx workbook: {exc}") from exc
+            missing = [name for name in REQUIRED_SHEETS[kind] if name not in sheets]
+            if missing:
+                raise ValueError(f"Workbook is missing sheets: {missing}")
+
+            content_hash = digest.hexdigest()
+            upload_id = f"{kind}_{content_hash[:16]}"
+            final_path = self.upload_dir / f"{upload_id}.xlsx"
+            tmp_path.replace(final_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        workbook_cache.register(final_path, sheets, content_hash=content_hash)
+        self.expire(keep=final_path)
+        return upload_id, final_path, sheets
+
+    def expire(self, keep: Optional[Path] = None) -> int:
+        """Delete uploads past ``max_age_seconds`` or beyond ``max_uploads``; returns the count."""
+        uploads = []
+        for path in self.upload_dir.glob("*.xlsx"):
+            try:
+                uploads.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        uploads.sort(reverse=True)
+        cutoff = time.time() - self.max_age_seconds
+        removed = 0
+        for rank, (mtime, path) in enumerate(uploads):
+            if path != keep and (rank >= self.max_uploads or mtime < cutoff):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def resolve(self, upload_id: str, kind: str) -> Optional[Path]:
+        """Path of a stored upload of ``kind``, or None if unknown."""
+        if not UPLOAD_ID_PATTERN.match(upload_id) or not upload_id.startswith(f"{kind}_"):
+            return None
+        path = self.upload_dir / f"{upload_id}.xlsx"
+        return path if path.exists() else None
+
+
+upload_store = UploadStore(Path(__file__).resolve().parent.parent / DEFAULT_UPLOAD_DIR)
@@ -3,8 +3,13 @@ Utility functions for time parsing and conflict detection.
 Extracted from the GA notebook.
 """
 
+import math
 from datetime import time as dt_time
-from typing import Union, Tuple
+from functools import lru_cache
+from typing import Any, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 
 def parse_time(t: str) -> int:
@@ -85,13 +90,42 @@ def time_to_minutes(time_value: Union[int, float, str, dt_time]) -> int:
         return time_value.hour * 60 + time_value.minute
     
     if isinstance(time_value, str):
-        result = parse_time_extended(time_value)
-        if result > 0:
-            return result
-        
-        try:
-            return parse_time(time_value)
-        except:
-            return 0
+        return _string_to_minutes(time_value)
     
     return 0
+
+
+@lru_cache(maxsize=4096)
+def _string_to_minutes(time_str: str) -> int:
+    result = parse_time_extended(time_str)
+    if result > 0:
+        return result
+
+    try:
+        return parse_time(time_str)
+    except:
+        return 0
+
+
+def times_to_minutes(values: Union[pd.Series, Sequence[Any]]) -> np.ndarray:
+    """Vectorized ``time_to_minutes`` for a whole column.
+
+    Numeric columns are cast directly; otherwise each distinct value is parsed
+    once and broadcast back. Missing values become 0.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series.fillna(0).to_numpy(dtype=np.int64)
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = np.fromiter(
+        (_scalar_to_minutes(value) for value in uniques), dtype=np.int64, count=len(uniques)
+    )
+    # Sentinel -1 (missing) indexes the appended 0.
+    return np.append(parsed, 0)[codes]
+
+
+def _scalar_to_minutes(value: Any) -> int:
+    if isinstance(value, float) and math.isnan(value):
+        return 0
+    return time_to_minutes(value)
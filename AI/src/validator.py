@@ -0,0 +1,307 @@
+"""Independent checks of a lecture, section or combined schedule.
+
+Overlaps are found with one sort-and-sweep per resource kind over NumPy
+arrays: rows are sorted by (day, resource, start) and a row conflicts when
+it starts before the latest end seen so far in its group. Rows are
+recognised by their columns, case-insensitively, so ``Day``/``day`` and the
+API and workbook row shapes all work. A row with an ``Assistant_Name`` is a
+section; other rows are lectures.
+
+- room: any two rows in the same room
+- instructor: lectures with the same instructor
+- assistant: sections with the same assistant
+- division: a lecture against any row of the same major and year; sections
+  of one division may run side by side, as each serves its own group. Rows
+  whose year is neither given nor found in ``courses`` are not checked
+- capacity: more students than the room seats (needs ``rooms``)
+- availability: a lecture outside its instructor's hours that day
+  (needs ``doctors``; instructors without rows there are not checked)
+- opening_hours: a row outside the time grid's hours for its day
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .section_utils import find_column
+from .time_grid import TimeGrid
+from .utils import minutes_to_time_str, times_to_minutes
+
+CONFLICT_KINDS = (
+    "room",
+    "instructor",
+    "assistant",
+    "division",
+    "capacity",
+    "availability",
+    "opening_hours",
+)
+
+_COLUMNS = {
+    "day": ["Day"],
+    "course": ["Course_Name", "Course"],
+    "instructor": ["Instructor_Name", "Instructor"],
+    "assistant": ["Assistant_Name", "Assistant"],
+    "students": ["Students"],
+    "room": ["Room"],
+    "start": ["Start_Time"],
+    "end": ["End_Time"],
+    "major": ["Major"],
+    "year": ["Year"],
+}
+
+# Minutes reserved per sweep group; more than a day, so groups never touch.
+_GROUP_SPAN = 1 << 11
+
+
+def validate_schedule(
+    schedule: pd.DataFrame,
+    rooms: Optional[pd.DataFrame] = None,
+    doctors: Optional[pd.DataFrame] = None,
+    courses: Optional[pd.DataFrame] = None,
+    time_grid: Optional[TimeGrid] = None,
+    max_findings: int = 100,
+) -> Dict[str, Any]:
+    """Every conflict in ``schedule``, counted per kind.
+
+    ``courses`` fills in the year of rows without one (by course name), so
+    divisions of the same major in different years are told apart. At most
+    ``max_findings`` findings are listed per kind; counts are always complete.
+    """
+    started = time.perf_counter()
+    frame, codes = normalize_schedule(schedule, courses)
+    placed = frame["placed"]
+    rows = frame[placed]
+    cols = {name: rows[name].to_numpy() for name in rows.columns}
+    cols["row"] = rows.index.to_numpy()
+    keep = placed.to_numpy()
+    codes = {name: values[keep] for name, values in codes.items()}
+    lecture = cols["assistant"] == ""
+    # Without a year, divisions of one major cannot be told apart.
+    has_major = (cols["major"] != "") & (cols["year"] != "")
+
+    hits: Dict[str, np.ndarray] = {}
+    for kind, mask in (
+        ("room", cols["room"] != ""),
+        ("instructor", lecture & (cols["instructor"] != "")),
+        ("assistant", ~lecture),
+    ):
+        hits[kind] = _sweep(group_codes(codes, ["day", kind]), cols, mask, mask)
+    division = group_codes(codes, ["day", "major", "year"])
+    hits["division"] = np.concatenate(
+        [
+            _sweep(division, cols, has_major & lecture, has_major),
+            _sweep(division, cols, has_major & ~lecture, has_major & lecture),
+        ]
+    )
+    seats = room_seats(rows, rooms)
+    hits["capacity"] = np.flatnonzero(cols["students"] > seats)
+    hits["availability"] = _outside_availability(rows, lecture, doctors)
+    opens, closes = _opening_hours(rows, time_grid or TimeGrid())
+    hits["opening_hours"] = np.flatnonzero((cols["start"] < opens) | (cols["end"] > closes))
+
+    conflicts: Dict[str, List[Dict[str, Any]]] = {}
+    for kind in CONFLICT_KINDS:
+        listed = hits[kind][:max_findings]
+        if kind in ("room", "instructor", "assistant", "division"):
+            conflicts[kind] = [_overlap_finding(cols, kind, row, other) for row, other in listed]
+        else:
+            conflicts[kind] = [_finding(cols, kind, hit) for hit in listed]
+            for finding, hit in zip(conflicts[kind], listed):
+                if kind == "capacity":
+                    finding["students"] = int(cols["students"][hit])
+                    finding["capacity"] = int(seats[hit])
+                elif kind == "opening_hours":
+                    finding["opens"] = minutes_to_time_str(int(opens[hit]))
+                    finding["closes"] = minutes_to_time_str(int(closes[hit]))
+
+    counts = {kind: len(hits[kind]) for kind in CONFLICT_KINDS}
+    return {
+        "valid": not any(counts.values()),
+        "rows": len(frame),
+        "checked_rows": len(rows),
+        "unassigned_rows": int((~placed).sum()),
+        "counts": counts,
+        "conflicts": conflicts,
+        "elapsed_seconds": time.perf_counter() - started,
+    }
+
+
+def normalize_schedule(
+    schedule: pd.DataFrame, courses: Optional[pd.DataFrame] = None
+) -> tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """Standard columns (stripped strings for names, minutes for times, floats
+    for students) and an integer code per distinct value of each name column.
+
+    ``placed`` marks rows with a day and a positive duration.
+    """
+    frame = pd.DataFrame(index=pd.RangeIndex(len(schedule)))
+    codes: Dict[str, np.ndarray] = {}
+    for key, candidates in _COLUMNS.items():
+        column = find_column(schedule, candidates, required=False)
+        if column is None:
+            values = pd.Series([None] * len(schedule), dtype=object)
+        else:
+            values = schedule[column].reset_index(drop=True)
+        if key in ("start", "end"):
+            frame[key] = times_to_minutes(values)
+        elif key == "students":
+            frame[key] = pd.to_numeric(values, errors="coerce").astype(float)
+        else:
+            frame[key], codes[key] = _strings(values, with_codes=True)
+
+    if courses is not None and len(courses) and (frame["year"] == "").any():
+        name_col = find_column(courses, ["Course_Name"], required=False)
+        year_col = find_column(courses, ["Year"], required=False)
+        if name_col and year_col:
+            years = pd.Series(_strings(courses[year_col]), index=_strings(courses[name_col]))
+            years = years[~years.index.duplicated()]
+            missing = frame["year"] == ""
+            frame.loc[missing, "year"] = frame.loc[missing, "course"].map(years).fillna("")
+            codes["year"] = pd.factorize(frame["year"])[0]
+    frame["placed"] = (
+        (frame["day"] != "") & (frame["day"] != "UNASSIGNED") & (frame["start"] < frame["end"])
+    )
+    return frame, codes
+
+
+def _strings(values: pd.Series, with_codes: bool = False):
+    """Stripped strings, with missing values as ""; each distinct value is cleaned once.
+
+    With ``with_codes`` also returns a code per row that is equal for equal
+    cleaned strings.
+    """
+    raw_codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # Missing values (code -1) take the appended "".
+    cleaned_codes, cleaned = pd.factorize(
+        np.array([_clean(value) for value in uniques] + [""], dtype=object)
+    )
+    strings = np.asarray(cleaned, dtype=object)[cleaned_codes][raw_codes]
+    if with_codes:
+        return strings, cleaned_codes[raw_codes].astype(np.int64)
+    return strings
+
+
+def _clean(value: Any) -> str:
+    # 3.0 from a numeric Excel column and "3" name the same year.
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def group_codes(codes: Dict[str, np.ndarray], keys: List[str]) -> np.ndarray:
+    """Group number per row for the combination of the ``keys`` columns."""
+    group = np.zeros(len(codes[keys[0]]), dtype=np.int64)
+    for key in keys:
+        values = codes[key]
+        size = int(values.max()) + 1 if len(values) else 1
+        group = group * size + values
+    # Renumber densely so group * _GROUP_SPAN stays small.
+    return np.unique(group, return_inverse=True)[1].astype(np.int64)
+
+
+def _sweep(
+    groups: np.ndarray, cols: Dict[str, np.ndarray], checked: np.ndarray, blocking: np.ndarray
+) -> np.ndarray:
+    """(row, other_row) positions where a ``checked`` row starts before an
+    earlier-starting ``blocking`` row of its group has ended.
+
+    Each conflicting row is listed once, paired with the overlapping row
+    that ends last.
+    """
+    idx = np.flatnonzero(checked | blocking)
+    if len(idx) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    start, end = cols["start"], cols["end"]
+    order = idx[np.argsort(((groups[idx] * _GROUP_SPAN) + start[idx]) * _GROUP_SPAN + end[idx])]
+
+    base = groups[order] * _GROUP_SPAN
+    # Non-blocking rows sit at their group's floor, below any start in it.
+    ends = np.where(blocking[order], base + end[order], base)
+    count = len(order)
+    latest = np.maximum.accumulate(ends * count + np.arange(count))
+    before = np.concatenate(([-1], latest[:-1]))
+    hit = checked[order] & (base + start[order] < before // count)
+    return np.column_stack((order[hit], order[before[hit] % count]))
+
+
+def room_seats(rows: pd.DataFrame, rooms: Optional[pd.DataFrame]) -> np.ndarray:
+    """Capacity of each row's room; NaN when unknown."""
+    if rooms is not None and len(rooms):
+        room_col = find_column(rooms, ["Room"], required=False)
+        cap_col = find_column(rooms, ["Capacity"], required=False)
+        if room_col and cap_col:
+            capacity = pd.Series(
+                pd.to_numeric(rooms[cap_col], errors="coerce").to_numpy(dtype=float),
+                index=_strings(rooms[room_col]),
+            )
+            capacity = capacity[~capacity.index.duplicated()]
+            return rows["room"].map(capacity).to_numpy(dtype=float)
+    return np.full(len(rows), np.nan)
+
+
+def _outside_availability(
+    rows: pd.DataFrame, lecture: np.ndarray, doctors: Optional[pd.DataFrame]
+) -> np.ndarray:
+    """Lectures not inside any availability window of their instructor that day."""
+    if doctors is None or not len(doctors):
+        return np.zeros(0, dtype=np.int64)
+    columns = [
+        find_column(doctors, [name], required=False)
+        for name in ("Instructor_Name", "Day", "Start_Time", "End_Time")
+    ]
+    if not all(columns):
+        return np.zeros(0, dtype=np.int64)
+    name_col, day_col, start_col, end_col = columns
+    windows = pd.DataFrame(
+        {
+            "instructor": _strings(doctors[name_col]),
+            "day": _strings(doctors[day_col]),
+            "open": times_to_minutes(doctors[start_col]),
+            "close": times_to_minutes(doctors[end_col]),
+        }
+    )
+    known = rows["instructor"].isin(set(windows["instructor"])).to_numpy()
+    positions = np.flatnonzero(lecture & known)
+    meetings = rows.iloc[positions][["instructor", "day", "start", "end"]]
+    merged = meetings.assign(position=positions).merge(
+        windows, on=["instructor", "day"], how="left"
+    )
+    inside = (merged["open"] <= merged["start"]) & (merged["end"] <= merged["close"])
+    covered = inside.groupby(merged["position"]).any()
+    return covered.index[~covered.to_numpy()].to_numpy(dtype=np.int64)
+
+
+def _opening_hours(rows: pd.DataFrame, time_grid: TimeGrid) -> tuple[np.ndarray, np.ndarray]:
+    """Opening and closing minute of each row's day."""
+    hours = {day: time_grid.hours_for(day) for day in rows["day"].unique()}
+    opens = rows["day"].map({day: value[0] for day, value in hours.items()})
+    closes = rows["day"].map({day: value[1] for day, value in hours.items()})
+    return opens.to_numpy(dtype=np.int64), closes.to_numpy(dtype=np.int64)
+
+
+def _finding(cols: Dict[str, np.ndarray], kind: str, hit: int) -> Dict[str, Any]:
+    resource = {"capacity": "room", "availability": "instructor", "opening_hours": "room"}
+    return {
+        "row": int(cols["row"][hit]),
+        "day": cols["day"][hit],
+        "resource": cols[resource.get(kind, kind)][hit],
+        "course": cols["course"][hit],
+        "start_time": minutes_to_time_str(int(cols["start"][hit])),
+        "end_time": minutes_to_time_str(int(cols["end"][hit])),
+    }
+
+
+def _overlap_finding(
+    cols: Dict[str, np.ndarray], kind: str, hit: int, other: int
+) -> Dict[str, Any]:
+    if kind == "division":
+        finding = _finding(cols, "major", hit)
+        finding["resource"] = f"{cols['major'][hit]} year {cols['year'][hit]}".strip()
+    else:
+        finding = _finding(cols, kind, hit)
+    finding["other_row"] = int(cols["row"][other])
+    finding["other_course"] = cols["course"][other]
+    return finding
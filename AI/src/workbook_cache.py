@@ -0,0 +1,214 @@
+"""Cache of parsed Excel workbooks (all sheets, one parse per file version)."""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = Path("data/Processed Data/.cache")
+CACHE_FORMAT_VERSION = 2
+
+Sheets = Dict[str, pd.DataFrame]
+
+
+def read_workbook(path: Path) -> Sheets:
+    """Parse every sheet in one read-only openpyxl pass.
+
+    Frames match ``pd.read_excel(path, sheet_name=None)``: the first row is
+    the header, the sheet is as wide as its widest row, blank rows inside
+    the data become all-NaN rows, trailing blank rows are dropped and empty
+    cells become NaN.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets: Sheets = {}
+        for worksheet in workbook.worksheets:
+            # Read-only sheets can carry stale dimensions; pandas resets them too.
+            worksheet.reset_dimensions()
+            rows = [_trim_row(row) for row in worksheet.iter_rows(values_only=True)]
+            while rows and not rows[-1]:
+                rows.pop()
+            if not rows:
+                sheets[worksheet.title] = pd.DataFrame()
+                continue
+
+            width = max(len(row) for row in rows)
+            header = rows[0] + (None,) * (width - len(rows[0]))
+            records = [row + (None,) * (width - len(row)) for row in rows[1:]]
+            frame = pd.DataFrame.from_records(records, columns=_column_names(header))
+            if len(frame):
+                frame = frame.where(frame.notna(), np.nan).infer_objects()
+            sheets[worksheet.title] = frame
+        return sheets
+    finally:
+        workbook.close()
+
+
+def _trim_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return tuple(row[:end])
+
+
+def _column_names(header: Tuple[Any, ...]) -> List[Any]:
+    """Header labels with pandas' naming for blank and duplicate cells."""
+    names: List[Any] = []
+    seen: Dict[Any, int] = {}
+    for idx, label in enumerate(header):
+        name = f"Unnamed: {idx}" if label is None else label
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """Parsed workbooks keyed by path, mtime, size and content hash.
+
+    Recent workbooks are kept in memory; every parse is also written to a
+    pickle sidecar so a restarted process skips Excel parsing as well. Only
+    the ``max_sidecars`` most recently used sidecars stay on disk, since
+    every regenerated schedule output adds one. Returned frames are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 16, max_sidecars: int = 64) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_sidecars = max_sidecars
+        self._memory: "OrderedDict[Tuple[str, int, int], Tuple[str, Sheets]]" = OrderedDict()
+        self._lookups = {"memory": 0, "disk": 0, "miss": 0}
+        self._lock = threading.Lock()
+
+    def load(self, path: Path) -> Tuple[Sheets, str]:
+        """Return ``(sheets, "hit" | "miss")`` for the workbook at ``path``."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        stat_key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._memory.get(stat_key)
+            if cached is not None:
+                self._memory.move_to_end(stat_key)
+                self._lookups["memory"] += 1
+                return cached[1], "hit"
+
+        content_hash = file_digest(path)
+        sheets = self._read_sidecar(content_hash)
+        status = "hit"
+        if sheets is None:
+            sheets = self.parse(path)
+            self._write_sidecar(content_hash, stat_key, sheets)
+            status = "miss"
+
+        self._remember(stat_key, content_hash, sheets)
+        with self._lock:
+            self._lookups["disk" if status == "hit" else "miss"] += 1
+        return sheets, status
+
+    def lookups(self) -> Dict[str, int]:
+        """Loads served from memory, from a pickle sidecar, or by parsing (miss)."""
+        with self._lock:
+            return dict(self._lookups)
+
+    def register(self, path: Path, sheets: Sheets, content_hash: Optional[str] = None) -> str:
+        """Store already-parsed sheets for ``path``; returns the content hash."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        stat_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        content_hash = content_hash or file_digest(path)
+        self._write_sidecar(content_hash, stat_key, sheets)
+        self._remember(stat_key, content_hash, sheets)
+        return content_hash
+
+    @staticmethod
+    def parse(path: Path) -> Sheets:
+        """Parse every sheet of the workbook in a single pass."""
+        return read_workbook(path)
+
+    def _remember(self, stat_key: Tuple[str, int, int], content_hash: str, sheets: Sheets) -> None:
+        with self._lock:
+            self._memory[stat_key] = (content_hash, sheets)
+            self._memory.move_to_end(stat_key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _sidecar_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.pkl"
+
+    def _read_sidecar(self, content_hash: str) -> Optional[Sheets]:
+        sidecar = self._sidecar_path(content_hash)
+        if not sidecar.exists():
+            return None
+        try:
+            with open(sidecar, "rb") as handle:
+                payload = pickle.load(handle)
+            if payload.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            # The mtime orders sidecars for eviction, so a read counts as a use.
+            os.utime(sidecar)
+            return payload["sheets"]
+        except Exception as exc:
+            print(f"Ignoring unreadable workbook cache {sidecar}: {exc}")
+            return None
+
+    def _write_sidecar(self, content_hash: str, stat_key: Tuple[str, int, int], sheets: Sheets) -> None:
+        sidecar = self._sidecar_path(content_hash)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar.with_name(
+                f"{sidecar.stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            with open(tmp_path, "wb") as handle:
+                pickle.dump(
+                    {
+                        "version": CACHE_FORMAT_VERSION,
+                        "path": stat_key[0],
+                        "mtime_ns": stat_key[1],
+                        "size": stat_key[2],
+                        "sheets": sheets,
+                    },
+                    handle,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            tmp_path.replace(sidecar)
+        except OSError as exc:
+            print(f"Could not write workbook cache {sidecar}: {exc}")
+            return
+        self._evict_sidecars()
+
+    def _evict_sidecars(self) -> None:
+        """Delete the least recently used sidecars beyond ``max_sidecars``."""
+        sidecars = []
+        for sidecar in self.cache_dir.glob("*.pkl"):
+            try:
+                sidecars.append((sidecar.stat().st_mtime_ns, sidecar))
+            except OSError:
+                continue
+        sidecars.sort(reverse=True)
+        for _, sidecar in sidecars[self.max_sidecars :]:
+            sidecar.unlink(missing_ok=True)
+
+
+workbook_cache = WorkbookCache(Path(__file__).resolve().parent.parent / DEFAULT_CACHE_DIR)
@@ -0,0 +1,155 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from src.admission import (
+    BASE_BYTES,
+    BYTES_PER_ITEM,
+    AdmissionController,
+    AdmissionRejected,
+    ModelEstimate,
+)
+from src.section_scheduler import SectionScheduler
+
+
+def _estimate(label, memory_bytes):
+    return ModelEstimate(label, memory_bytes=memory_bytes, seconds=5)
+
+
+async def _hold(controller, estimate, order, release):
+    async with controller.admit(estimate):
+        order.append(estimate.label)
+        await release.wait()
+
+
+def test_waiting_runs_are_admitted_in_fifo_order():
+    async def scenario():
+        controller = AdmissionController(memory_budget_bytes=100, max_concurrent=4)
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(_hold(controller, _estimate("first", 60), order, release))
+        await asyncio.sleep(0)
+        large = asyncio.create_task(_hold(controller, _estimate("large", 60), order, release))
+        await asyncio.sleep(0)
+        # Fits next to "first", but must not overtake the queued large run.
+        small = asyncio.create_task(_hold(controller, _estimate("small", 10), order, release))
+        await asyncio.sleep(0)
+
+        assert order == ["first"]
+        assert controller.snapshot()["queued"] == 2
+        release.set()
+        await asyncio.gather(first, large, small)
+        return order, controller.snapshot()
+
+    order, snapshot = asyncio.run(scenario())
+
+    assert order == ["first", "large", "small"]
+    assert snapshot["admitted_total"] == 3
+    assert snapshot["queued_total"] == 2
+    assert snapshot["memory_reserved_bytes"] == 0
+
+
+def test_wait_past_the_limit_is_rejected():
+    async def scenario():
+        controller = AdmissionController(
+            memory_budget_bytes=100, max_concurrent=1, max_wait_seconds=0.05
+        )
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, _estimate("first", 10), [], release))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(_estimate("second", 10)):
+                pass
+        release.set()
+        await holder
+        return rejected.value, controller.snapshot()
+
+    rejected, snapshot = asyncio.run(scenario())
+
+    assert rejected.retry_after >= 1
+    assert snapshot["rejected_total"] == 1
+    assert snapshot["queued"] == 0
+
+
+def test_run_larger_than_the_budget_is_rejected_without_retry():
+    async def scenario():
+        controller = AdmissionController(memory_budget_bytes=100)
+        async with controller.admit(_estimate("huge", 101)):
+            pass
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(scenario())
+    assert rejected.value.retry_after is None
+
+
+def test_identical_concurrent_requests_share_one_run():
+    async def scenario():
+        controller = AdmissionController(memory_budget_bytes=100)
+        runs = []
+
+        async def job(value):
+            runs.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        shared = await asyncio.gather(
+            controller.coalesce("a", lambda: job("a")),
+            controller.coalesce("a", lambda: job("a")),
+            controller.coalesce("b", lambda: job("b")),
+        )
+        # Finished runs are forgotten, so the same key runs again.
+        again = await controller.coalesce("a", lambda: job("a"))
+        return shared, again, runs, controller.snapshot()
+
+    shared, again, runs, snapshot = asyncio.run(scenario())
+
+    assert shared == ["a", "a", "b"]
+    assert again == "a"
+    assert runs == ["a", "b", "a"]
+    assert snapshot["coalesced_total"] == 1
+    assert snapshot["in_flight_requests"] == 0
+
+
+def test_coalesced_callers_all_see_the_failure():
+    async def scenario():
+        controller = AdmissionController(memory_budget_bytes=100)
+
+        async def job():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("solver failed")
+
+        return await asyncio.gather(
+            controller.coalesce("a", job), controller.coalesce("a", job), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [str(result) for result in results] == ["solver failed", "solver failed"]
+
+
+def test_estimate_memory_grows_with_model_size():
+    estimate = ModelEstimate.from_size("cp", {"variables": 300, "constraints": 100}, seconds=60)
+
+    assert estimate.memory_bytes == BASE_BYTES + 400 * BYTES_PER_ITEM
+    assert estimate.seconds == 60
+
+
+def test_section_estimate_follows_section_and_room_counts():
+    def scheduler(sections, rooms):
+        empty = pd.DataFrame()
+        return SectionScheduler(
+            cp_schedule=pd.DataFrame({"Day": ["Sunday"] * 5}),
+            rooms=pd.DataFrame({"Room": [f"Lab {i}" for i in range(rooms)]}),
+            sections=pd.DataFrame({"Section": [f"S{i}" for i in range(sections)]}),
+            assistants=empty,
+            divisions=empty,
+            courses=empty,
+            doctors=empty,
+        )
+
+    small = ModelEstimate.from_size("sections", scheduler(10, 2).estimate_size(), seconds=0)
+    large = ModelEstimate.from_size("sections", scheduler(40, 4).estimate_size(), seconds=0)
+
+    assert (small.variables, small.constraints) == (20, 15)
+    assert (large.variables, large.constraints) == (160, 45)
+    assert large.memory_bytes > small.memory_bytes
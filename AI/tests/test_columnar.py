@@ -0,0 +1,112 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import src.main
+from benchmarks.synthetic import CampusSpec, generate_campus, lecture_tables, section_tables
+from src.data_loader import DataLoader
+from src.main import _scheduling_tables, _section_rows
+from src.models import ScheduleRequest, SectionScheduleRequest
+from src.section_loader import SectionDataLoader
+
+CP_SCHEDULE = [
+    {
+        "Day": "Sunday",
+        "Course_Name": "Course 1",
+        "Start_Time": "9:00 AM",
+        "End_Time": "11:00 AM",
+        "Instructor_Name": "Dr 1",
+        "Students": 40,
+        "Room": "Room 1",
+    }
+]
+
+
+def _columns(rows):
+    """The columnar form of ``rows``; every row has the same fields."""
+    return {field: [row[field] for row in rows] for field in rows[0]}
+
+
+def _columnar(tables):
+    return {name: _columns(rows) for name, rows in tables.items()}
+
+
+@pytest.fixture(scope="module")
+def campus():
+    return generate_campus(CampusSpec(courses=12))
+
+
+def test_columnar_and_row_payloads_encode_the_same_instance(campus):
+    tables = lecture_tables(campus)
+    by_rows = ScheduleRequest.model_validate({"data": tables})
+    by_columns = ScheduleRequest.model_validate({"columns": _columnar(tables)})
+
+    loaders = []
+    for request in (by_rows, by_columns):
+        loader = DataLoader()
+        assert loader.load_from_json(_scheduling_tables(request))
+        loaders.append(loader)
+
+    rows_instance, columns_instance = loaders[0].instance, loaders[1].instance
+    for field in dataclasses.fields(rows_instance):
+        expected = getattr(rows_instance, field.name)
+        actual = getattr(columns_instance, field.name)
+        if isinstance(expected, np.ndarray):
+            np.testing.assert_array_equal(actual, expected, err_msg=field.name)
+        else:
+            assert actual == expected, field.name
+
+
+def test_columnar_section_payload_loads_the_same_frames(campus):
+    tables = section_tables(campus, CP_SCHEDULE)
+    by_rows = SectionScheduleRequest.model_validate({"data": tables})
+    by_columns = SectionScheduleRequest.model_validate({"columns": _columnar(tables)})
+
+    rows_loader, columns_loader = SectionDataLoader(), SectionDataLoader()
+    assert rows_loader.load_from_json(_section_rows(by_rows.data))
+    assert columns_loader.load_from_json(by_columns.columns.to_tables())
+
+    for name in tables:
+        expected = getattr(rows_loader, name)
+        actual = getattr(columns_loader, name)
+        pd.testing.assert_frame_equal(actual[list(expected.columns)], expected, obj=name)
+    # Omitted optional columns fall back to the row model's defaults.
+    assert columns_loader.cp_schedule["Assistant_Name"].tolist() == [""]
+
+
+def test_columns_of_different_lengths_are_rejected(campus):
+    columns = _columnar(lecture_tables(campus))
+    columns["rooms"]["Capacity"].pop()
+
+    with pytest.raises(ValidationError, match="same length"):
+        ScheduleRequest.model_validate({"columns": columns})
+
+    response = TestClient(src.main.app).post("/cp/generate", json={"columns": columns})
+    assert response.status_code == 422
+
+
+def test_columnar_days_are_validated_like_rows(campus):
+    columns = _columnar(lecture_tables(campus))
+    columns["courses"]["Days"][0] = 7
+
+    with pytest.raises(ValidationError, match="between 1 and 6"):
+        ScheduleRequest.model_validate({"columns": columns})
+
+
+@pytest.mark.parametrize("sources", [(), ("data", "columns")], ids=["neither", "both"])
+def test_exactly_one_payload_format_is_accepted(campus, sources):
+    lectures = lecture_tables(campus)
+    sections = section_tables(campus, CP_SCHEDULE)
+    lecture_payload = {"data": lectures, "columns": _columnar(lectures)}
+    section_payload = {"data": sections, "columns": _columnar(sections)}
+
+    with pytest.raises(ValidationError, match="exactly one"):
+        ScheduleRequest.model_validate({source: lecture_payload[source] for source in sources})
+    with pytest.raises(ValidationError, match="exactly one"):
+        SectionScheduleRequest.model_validate(
+            {source: section_payload[source] for source in sources}
+        )
@@ -0,0 +1,96 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.compression import CompressionMiddleware, _Encoder, decode_body, negotiate
+
+BODY = json.dumps({"rows": [{"Room_ID": f"R{i}", "Capacity": 30} for i in range(200)]}).encode()
+
+
+def test_gzip_round_trip():
+    assert decode_body("gzip", gzip.compress(BODY), max_size=len(BODY)) == BODY
+
+
+def test_gzip_body_over_the_limit_is_rejected():
+    with pytest.raises(ValueError, match="exceeds"):
+        decode_body("gzip", gzip.compress(BODY), max_size=len(BODY) - 1)
+
+
+def test_corrupt_and_truncated_gzip_are_rejected():
+    encoded = gzip.compress(BODY)
+    with pytest.raises(ValueError, match="Invalid gzip"):
+        decode_body("gzip", b"not gzip", max_size=len(BODY))
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_body("gzip", encoded[: len(encoded) // 2], max_size=len(BODY))
+
+
+def test_zstd_round_trip_and_limit():
+    zstandard = pytest.importorskip("zstandard")
+    encoded = zstandard.ZstdCompressor().compress(BODY)
+
+    assert decode_body("zstd", encoded, max_size=len(BODY)) == BODY
+    with pytest.raises(ValueError, match="exceeds"):
+        decode_body("zstd", encoded, max_size=len(BODY) - 1)
+
+
+def test_streamed_encoder_output_decodes_to_the_input():
+    encoder = _Encoder("gzip", gzip_level=6, zstd_level=3)
+    chunks = [BODY[:1000], BODY[1000:2000], BODY[2000:]]
+    encoded = b"".join(
+        encoder.compress(chunk, final=index == len(chunks) - 1) for index, chunk in enumerate(chunks)
+    )
+
+    assert gzip.decompress(encoded) == BODY
+
+
+def test_negotiate_honours_weights():
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("gzip;q=0, br") is None
+    assert negotiate("") is None
+
+
+async def _echo(request: Request) -> JSONResponse:
+    return JSONResponse(json.loads(await request.body()))
+
+
+def _post(content: bytes, headers: dict, max_request_size: int = 1 << 20) -> httpx.Response:
+    app = Starlette(routes=[Route("/echo", _echo, methods=["POST"])])
+    app.add_middleware(CompressionMiddleware, max_request_size=max_request_size)
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/echo", content=content, headers=headers)
+
+    return asyncio.run(send())
+
+
+def test_middleware_decodes_requests_and_compresses_responses():
+    response = _post(
+        gzip.compress(BODY),
+        {"Content-Type": "application/json", "Content-Encoding": "gzip", "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == json.loads(BODY)
+
+
+def test_middleware_rejects_over_size_and_unknown_encodings():
+    too_large = _post(
+        gzip.compress(BODY),
+        {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        max_request_size=1024,
+    )
+    unknown = _post(BODY, {"Content-Type": "application/json", "Content-Encoding": "br"})
+
+    assert too_large.status_code == 400
+    assert "exceeds 1024 bytes" in too_large.json()["detail"]
+    assert unknown.status_code == 415
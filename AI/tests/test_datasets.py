@@ -0,0 +1,122 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import CampusSpec, generate_campus, lecture_tables
+from src.datasets import DatasetStore, VersionConflict, _apply_changes
+from src.instance import SchedulingInstance
+
+
+def _rooms():
+    return pd.DataFrame(
+        {"Room_ID": ["R1", "R2", "R3"], "Room": ["A", "B", "C"], "Capacity": [30, 40, 50]}
+    )
+
+
+def test_apply_changes_updates_in_place_appends_and_deletes():
+    frame, counts = _apply_changes(
+        _rooms(),
+        ["Room_ID"],
+        [{"Room_ID": "R4", "Room": "D", "Capacity": 60}, {"Room_ID": "R2", "Room": "B", "Capacity": 45}],
+        ["R1"],
+    )
+
+    assert frame.to_dict("records") == [
+        {"Room_ID": "R2", "Room": "B", "Capacity": 45},
+        {"Room_ID": "R3", "Room": "C", "Capacity": 50},
+        {"Room_ID": "R4", "Room": "D", "Capacity": 60},
+    ]
+    assert counts == {"inserted": 1, "updated": 1, "deleted": 1}
+
+
+def test_apply_changes_keeps_replaced_rows_in_their_position():
+    frame, _ = _apply_changes(
+        _rooms(), ["Room_ID"], [{"Room_ID": "R3", "Room": "C2"}, {"Room_ID": "R1", "Room": "A2"}], []
+    )
+
+    assert frame["Room_ID"].tolist() == ["R1", "R2", "R3"]
+    assert frame["Room"].tolist() == ["A2", "B", "C2"]
+
+
+def test_apply_changes_with_composite_keys():
+    doctors = pd.DataFrame(
+        {
+            "Instructor_ID": ["I1", "I1", "I2"],
+            "Day": ["Monday", "Tuesday", "Monday"],
+            "Start_Time": ["9:00 AM", "9:00 AM", "9:00 AM"],
+        }
+    )
+
+    frame, counts = _apply_changes(
+        doctors, ["Instructor_ID", "Day", "Start_Time"], [], [("I1", "Tuesday", "9:00 AM")]
+    )
+
+    assert frame[["Instructor_ID", "Day"]].values.tolist() == [["I1", "Monday"], ["I2", "Monday"]]
+    assert counts["deleted"] == 1
+
+
+def test_apply_changes_deleting_every_row():
+    frame, counts = _apply_changes(_rooms(), ["Room_ID"], [], ["R1", "R2", "R3"])
+
+    assert len(frame) == 0
+    assert list(frame.columns) == ["Room_ID", "Room", "Capacity"]
+    assert counts == {"inserted": 0, "updated": 0, "deleted": 3}
+
+
+def test_apply_changes_rejects_conflicting_rows():
+    with pytest.raises(ValueError, match="Duplicate upsert keys"):
+        _apply_changes(_rooms(), ["Room_ID"], [{"Room_ID": "R9"}, {"Room_ID": "R9"}], [])
+    with pytest.raises(ValueError, match="upserted and deleted"):
+        _apply_changes(_rooms(), ["Room_ID"], [{"Room_ID": "R1"}], ["R1"])
+
+
+def _assert_same_instance(actual: SchedulingInstance, expected: SchedulingInstance):
+    for field in dataclasses.fields(SchedulingInstance):
+        left, right = getattr(actual, field.name), getattr(expected, field.name)
+        if isinstance(right, np.ndarray):
+            assert np.array_equal(left, right), field.name
+        else:
+            assert left == right, field.name
+
+
+def test_patched_instance_equals_full_rebuild():
+    tables = lecture_tables(generate_campus(CampusSpec(courses=20, seed=3)))
+    store = DatasetStore()
+    base = store.put("campus", tables)
+    room, course, doctor = tables["rooms"][0], tables["courses"][1], tables["doctors"][2]
+
+    patched = store.patch(
+        "campus",
+        {
+            "rooms": {"upsert": [{**room, "Capacity": room["Capacity"] + 10}]},
+            "courses": {"delete": [course["Course_ID"]]},
+            "doctors": {
+                "delete": [(doctor["Instructor_ID"], doctor["Day"], doctor["Start_Time"])],
+                "upsert": [{**tables["doctors"][0], "Instructor_ID": "NEW", "Instructor_Name": "Dr New"}],
+            },
+        },
+        base_version=base.version,
+    )
+
+    assert patched.version == base.version + 1
+    assert patched.tables["divisions"] is base.tables["divisions"]
+    assert patched.instance.division_ids is base.instance.division_ids
+    rebuilt = SchedulingInstance.from_frames(
+        patched.tables["rooms"],
+        patched.tables["courses"],
+        patched.tables["doctors"],
+        patched.tables["divisions"],
+    )
+    _assert_same_instance(patched.instance, rebuilt)
+
+
+def test_patch_on_a_stale_version_conflicts():
+    store = DatasetStore()
+    tables = {"rooms": [{"Room_ID": "R1", "Capacity": 30}]}
+    base = store.put("campus", tables)
+    store.patch("campus", {"rooms": {"upsert": [{"Room_ID": "R2", "Capacity": 40}]}})
+
+    with pytest.raises(VersionConflict):
+        store.patch("campus", {"rooms": {"delete": ["R1"]}}, base_version=base.version)
@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.ga_scheduler import VIOLATION_KINDS, GAProblem, evaluate, violations_by_kind
+
+
+def _problem():
+    """Five meetings of one year; meetings 0 and 1 are the two days of one pair."""
+    meetings = 5
+    unused = np.zeros((4, 1), dtype=np.int64)
+    return GAProblem(
+        pair=np.array([0, 0, 1, 2, 3]),
+        rank=np.array([0, 1, 0, 0, 0]),
+        length=np.array([2, 2, 2, 1, 1]),
+        instructor=np.array([0, 0, 1, 2, 3]),
+        group=np.array([0, 0, 1, 2, 3]),
+        year=np.zeros(meetings, dtype=np.int64),
+        day_options=unused,
+        day_count=np.ones(4, dtype=np.int64),
+        room_options=unused,
+        room_count=np.ones(4, dtype=np.int64),
+        start_options=np.zeros((4, 1, 1), dtype=np.int64),
+        start_count=np.ones((4, 1), dtype=np.int64),
+        rooms=3,
+        instructors=4,
+        groups=4,
+        years=1,
+        days=3,
+        stride=10,
+    )
+
+
+def test_violations_by_kind_on_a_conflicting_individual():
+    # Individual 0: meeting 2 shares room 0 with meeting 0 and starts before
+    # it ends; meetings 0 and 1 (same pair, instructor and division) overlap
+    # on one day; the year uses three days. Individual 1 is conflict-free.
+    days = np.array([[0, 0, 0, 1, 2], [0, 1, 0, 0, 1]])
+    rooms = np.array([[0, 1, 0, 2, 2], [0, 0, 1, 2, 2]])
+    starts = np.array([[0, 1, 1, 0, 0], [0, 0, 0, 0, 0]])
+
+    counts, flags = violations_by_kind(_problem(), (days, rooms, starts), max_days_per_year=2)
+
+    assert set(counts) == set(VIOLATION_KINDS)
+    assert {kind: counts[kind].tolist() for kind in VIOLATION_KINDS} == {
+        "room": [1, 0],
+        "instructor": [1, 0],
+        "division": [1, 0],
+        "day": [1, 0],
+        "year_days": [1, 0],
+    }
+    # Overlaps flag both meetings; the year limit flags the meetings on its
+    # least busy days (3 and 4), so every meeting of individual 0 may move.
+    assert flags.tolist() == [[True] * 5, [False] * 5]
+
+    totals, _ = evaluate(_problem(), (days, rooms, starts), max_days_per_year=2)
+    assert totals.tolist() == [5, 0]
+
+
+def test_back_to_back_meetings_do_not_clash():
+    days = np.zeros((1, 5), dtype=np.int64)
+    rooms = np.zeros((1, 5), dtype=np.int64)
+    starts = np.array([[0, 2, 4, 6, 7]])
+    days[0, 1] = 1  # the pair's second meeting on its own day
+
+    counts, flags = violations_by_kind(_problem(), (days, rooms, starts), max_days_per_year=2)
+
+    assert sum(counts.values()).tolist() == [0]
+    assert not flags.any()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from src.instance import DEFAULT_DAYS, SchedulingInstance
+
+
+def _tables():
+    rooms = pd.DataFrame(
+        {
+            "Room_ID": ["R1", "R2"],
+            "Room": ["Hall", "Lab"],
+            "Type": ["Lecture", "Lab"],
+            "Capacity": [90, 25],
+        }
+    )
+    courses = pd.DataFrame(
+        {
+            "Course_ID": ["C1", "C2", "C3"],
+            "Course_Name": ["Algebra", "Physics", "Chemistry"],
+            "Instructor_ID": ["D2", "D1", "D9"],
+            "Type": ["Lecture", "Lab", "Lecture"],
+            "Days": [2, 1, 1],
+            "Hours_per_day": [2, 3, None],
+            "Year": [1, 1, 2],
+        }
+    )
+    doctors = pd.DataFrame(
+        {
+            "Instructor_ID": ["D1", "D2", "D1"],
+            "Instructor_Name": ["Dr A", "Dr B", "Dr A"],
+            "Day": ["Monday", "Sunday", "Sunday"],
+            "Start_Time": ["08:00", "09:00", "10:00"],
+            "End_Time": ["12:00", "17:00", "14:00"],
+        }
+    )
+    divisions = pd.DataFrame({"Num_ID": ["G1"], "Major": ["CS"], "Year": [1], "StudentNum": [40]})
+    return rooms, courses, doctors, divisions
+
+
+def test_tables_are_encoded_as_codes():
+    instance = SchedulingInstance.from_frames(*_tables())
+
+    # Days follow the Doctors sheet; instructors are coded in first-seen order.
+    assert instance.days == ("Monday", "Sunday")
+    assert instance.instructor_ids == ("D1", "D2", "D9")
+    assert instance.course_instructor.tolist() == [1, 0, 2]
+    assert instance.instructor_days == {0: [0, 1], 1: [1]}
+    assert instance.availability_start.tolist() == [480, 540, 600]
+    assert instance.availability_end.tolist() == [720, 1020, 840]
+    assert instance.course_hours.tolist() == [2, 3, 0]
+    assert instance.room_capacity.dtype == np.int64
+    assert instance.rooms_of_type("Lab") == [1]
+    assert instance.room_index == {"R1": 0, "R2": 1}
+    assert instance.division_students.tolist() == [40]
+
+
+def test_instructor_without_doctors_row_gets_a_placeholder_name():
+    instance = SchedulingInstance.from_frames(*_tables())
+
+    assert instance.instructor_name(0) == "Dr A"
+    assert instance.instructor_name(2) == "Unknown (D9)"
+
+
+def test_missing_doctors_fall_back_to_default_days():
+    rooms, courses, _, divisions = _tables()
+    instance = SchedulingInstance.from_frames(rooms, courses, pd.DataFrame(), divisions)
+
+    assert instance.days == DEFAULT_DAYS
+    assert instance.availability_start.size == 0
+
+
+def test_with_tables_shares_unchanged_fields():
+    rooms, courses, doctors, divisions = _tables()
+    instance = SchedulingInstance.from_frames(rooms, courses, doctors, divisions)
+    bigger = rooms.assign(Capacity=[100, 30])
+
+    updated = instance.with_tables(bigger, courses, doctors, divisions, changed={"rooms"})
+
+    assert updated.room_capacity.tolist() == [100, 30]
+    assert updated.course_instructor is instance.course_instructor
+    assert updated.division_students is instance.division_students
+    assert instance.with_tables(rooms, courses, doctors, divisions, changed=()) is instance
@@ -0,0 +1,121 @@
+import pandas as pd
+
+from src.data_loader import DataLoader
+from src.joint_scheduler import JointScheduler
+from src.scheduler import SchedulingCP
+from src.section_scheduler import FINAL_COLS, SectionScheduler
+from src.time_grid import TimeGrid
+from src.utils import time_to_minutes
+
+# One Sunday morning, 08:00-12:00: the only section block is 09:00-11:00.
+GRID = TimeGrid(day_end=12 * 60)
+
+
+def _tables(hours=1):
+    return {
+        "rooms": [
+            {"Room_ID": "R1", "Room": "Hall", "Capacity": 100, "Type": "Lecture"},
+            {"Room_ID": "R2", "Room": "Lab A", "Capacity": 40, "Type": "Lab"},
+            {"Room_ID": "R3", "Room": "Lab B", "Capacity": 40, "Type": "Lab"},
+        ],
+        "courses": [
+            {
+                "Course_ID": "C1",
+                "Course_Name": "Programming Lab",
+                "Department": "CS",
+                "Major": "CS",
+                "Days": 1,
+                "Hours_per_day": hours,
+                "Instructor_ID": "D1",
+                "Year": 1,
+                "Type": "Lecture",
+            }
+        ],
+        "doctors": [
+            {
+                "Instructor_ID": "D1",
+                "Instructor_Name": "Dr A",
+                "Department": "CS",
+                "Day": "Sunday",
+                "Start_Time": "08:00",
+                "End_Time": "12:00",
+            }
+        ],
+        "divisions": [
+            {"Num_ID": "CS", "Department": "CS", "Major": "CS", "Year": 1, "StudentNum": 60}
+        ],
+    }
+
+
+def _joint_scheduler(**table_kwargs):
+    tables = _tables(**table_kwargs)
+    loader = DataLoader()
+    assert loader.load_from_json(tables)
+    section_scheduler = SectionScheduler(
+        cp_schedule=pd.DataFrame(columns=FINAL_COLS),
+        rooms=pd.DataFrame(tables["rooms"]),
+        sections=pd.DataFrame(
+            {
+                "Course_Name": ["Programming Lab"] * 2,
+                "Division": ["CS"] * 2,
+                "Section": ["S1", "S2"],
+            }
+        ),
+        assistants=pd.DataFrame(
+            {"Assistant_ID": ["A1", "A2"], "Assistant_Name": ["TA One", "TA Two"]}
+        ),
+        divisions=pd.DataFrame(tables["divisions"]),
+        courses=pd.DataFrame(tables["courses"]),
+        doctors=pd.DataFrame(tables["doctors"]),
+        time_grid=GRID,
+    )
+    joint = JointScheduler(
+        loader.instance,
+        section_scheduler=section_scheduler,
+        time_limit_seconds=10,
+        max_days_per_year=6,
+        time_grid=GRID,
+    )
+    return joint, section_scheduler, loader
+
+
+def test_sections_run_side_by_side_but_never_with_their_lecture():
+    joint, section_scheduler, _ = _joint_scheduler()
+    schedule = joint.solve()
+    assert schedule
+
+    placements = joint.section_placements()
+    assert sorted(placements) == [
+        ("Sunday", 540, 660, "Lab A"),
+        ("Sunday", 540, 660, "Lab B"),
+    ]
+    lectures = joint.schedule_frame(schedule)
+    for start, end in zip(lectures["Start_Time"], lectures["End_Time"]):
+        assert time_to_minutes(end) <= 540 or time_to_minutes(start) >= 660
+
+    result = section_scheduler.build_result(
+        joint.section_demands, placements, cp_schedule=lectures
+    )
+    assert result.unassigned_sections == 0
+    assert result.total_rows == len(lectures) + 2
+
+
+def test_a_lecture_inside_the_only_block_keeps_its_sections_out():
+    # A three-hour lecture in a four-hour day always meets the 09:00-11:00 block.
+    joint, _, _ = _joint_scheduler(hours=3)
+    assert joint.solve()
+
+    assert joint.section_placements() == [None, None]
+
+
+def test_estimate_adds_the_sections_to_the_lecture_model():
+    joint, _, loader = _joint_scheduler()
+    lectures_only = SchedulingCP(
+        loader.instance, time_limit_seconds=10, max_days_per_year=6, time_grid=GRID
+    )
+
+    joint_size, lecture_size = joint.estimate_size(), lectures_only.estimate_size()
+
+    assert joint_size["sections"] == 2
+    assert joint_size["variables"] > lecture_size["variables"]
+    assert joint_size["constraints"] > lecture_size["constraints"]
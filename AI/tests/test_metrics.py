@@ -0,0 +1,91 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main
+from src.metrics import CONTENT_TYPE, MetricsRegistry
+
+
+def test_counters_and_gauges_render_one_sample_per_series():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    running = registry.gauge("running", "Runs in progress.")
+    requests.inc(route="/cp/generate")
+    requests.inc(2, route="/cp/generate")
+    requests.inc(route='say "hi"\n')
+    running.inc()
+    running.dec(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/cp/generate"} 3',
+        'requests_total{route="say \\"hi\\"\\n"} 1',
+        "# HELP running Runs in progress.",
+        "# TYPE running gauge",
+        "running 0.5",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    seconds = registry.histogram("solve_seconds", "Solve time.", ("engine",), buckets=(1, 0.1))
+    for value in (0.05, 0.5, 0.7, 30):
+        seconds.observe(value, engine="cp")
+
+    assert registry.render().splitlines()[2:] == [
+        'solve_seconds_bucket{engine="cp",le="0.1"} 1',
+        'solve_seconds_bucket{engine="cp",le="1"} 3',
+        'solve_seconds_bucket{engine="cp",le="+Inf"} 4',
+        'solve_seconds_sum{engine="cp"} 31.25',
+        'solve_seconds_count{engine="cp"} 4',
+    ]
+
+
+def test_series_must_use_exactly_the_declared_labels():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs.", ("engine", "status"))
+
+    with pytest.raises(ValueError, match="expects labels"):
+        runs.inc(engine="cp")
+    with pytest.raises(ValueError, match="expects labels"):
+        runs.inc(engine="cp", status="OPTIMAL", route="/")
+
+
+def test_collectors_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    queued = []
+
+    @registry.collector
+    def _queue():
+        yield "queued", "gauge", "Queued runs.", [({"pool": "cp"}, len(queued))]
+
+    queued.append("run")
+    assert registry.render().splitlines() == [
+        "# HELP queued Queued runs.",
+        "# TYPE queued gauge",
+        'queued{pool="cp"} 1',
+    ]
+
+
+def test_metrics_endpoint_labels_requests_by_route_template():
+    client = TestClient(src.main.app)
+    client.get("/datasets/does-not-exist")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    text = response.text
+    assert re.search(
+        r'^scheduler_http_requests_total\{method="GET",route="/datasets/\{campus\}",'
+        r'status="404"\} [1-9]',
+        text,
+        re.MULTILINE,
+    )
+    assert 'route="unmatched",status="404"' in text
+    assert "does-not-exist" not in text
+    assert "# TYPE scheduler_http_request_duration_seconds histogram" in text
+    assert "# TYPE scheduler_admission_running gauge" in text
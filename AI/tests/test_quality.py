@@ -0,0 +1,63 @@
+import pandas as pd
+
+from src.quality import schedule_quality
+
+
+def _schedule(rows):
+    return pd.DataFrame(
+        rows,
+        columns=["Day", "Course_Name", "Instructor_Name", "Room", "Start_Time", "End_Time", "Major", "Year"],
+    )
+
+
+def test_division_gaps_and_idle_minutes():
+    schedule = _schedule(
+        [
+            # CS year 1, Monday: 9-10, 11-12 and 11:30-1 overlap, then 2-3.
+            ["Monday", "A", "Dr A", "R1", "9:00 AM", "10:00 AM", "CS", 1],
+            ["Monday", "B", "Dr B", "R1", "11:00 AM", "12:00 PM", "CS", 1],
+            ["Monday", "C", "Dr C", "R2", "11:30 AM", "1:00 PM", "CS", 1],
+            ["Monday", "D", "Dr A", "R1", "2:00 PM", "3:00 PM", "CS", 1],
+            ["Tuesday", "E", "Dr A", "R1", "10:00 AM", "12:00 PM", "CS", 1],
+            # CS year 2: back to back, no gap.
+            ["Monday", "F", "Dr B", "R2", "9:00 AM", "10:00 AM", "CS", 2],
+            ["Monday", "G", "Dr C", "R2", "10:00 AM", "11:00 AM", "CS", 2],
+        ]
+    )
+
+    result = schedule_quality(schedule)
+
+    divisions = {row["year"]: row for row in result["divisions"]}
+    assert divisions["1"]["idle_minutes"] == 120
+    assert divisions["1"]["gaps"] == 2
+    assert divisions["1"]["minutes"] == 60 + 60 + 90 + 60 + 120
+    # Monday 9-3 less the two idle hours, plus Tuesday's two hours.
+    assert divisions["1"]["busy_minutes"] == 240 + 120
+    assert divisions["1"]["busiest_day_minutes"] == 240
+    assert divisions["1"]["days"] == 2
+    assert divisions["2"]["idle_minutes"] == 0
+    assert divisions["2"]["gaps"] == 0
+
+    summary = result["summary"]
+    assert summary["division_idle_minutes"] == 120
+    assert summary["division_gaps"] == 2
+    assert summary["meetings"] == 7
+
+
+def test_instructor_load_and_days():
+    schedule = _schedule(
+        [
+            ["Monday", "A", "Dr A", "R1", "9:00 AM", "10:00 AM", "CS", 1],
+            ["Monday", "D", "Dr A", "R1", "2:00 PM", "3:00 PM", "CS", 1],
+            ["Tuesday", "E", "Dr A", "R1", "10:00 AM", "12:00 PM", "CS", 1],
+            ["Monday", "B", "Dr B", "R2", "11:00 AM", "12:00 PM", "CS", 2],
+        ]
+    )
+
+    instructors = {row["instructor"]: row for row in schedule_quality(schedule)["instructors"]}
+
+    assert instructors["Dr A"]["meetings"] == 3
+    assert instructors["Dr A"]["minutes"] == 240
+    assert instructors["Dr A"]["days"] == 2
+    assert instructors["Dr A"]["idle_minutes"] == 240
+    assert instructors["Dr B"]["minutes"] == 60
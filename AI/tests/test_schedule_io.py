@@ -0,0 +1,134 @@
+import importlib.util
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.output_writer import OutputWriter
+from src.schedule_io import frame_rows, read_schedule, sheet_path, write_schedule
+
+COLUMNS = ["Day", "Course_Name", "Students", "Start_Time"]
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "Day": ["Sunday", "Monday", "Tuesday"],
+            "Course_Name": ["Algebra", "Physics", None],
+            "Students": [40, 35, 20],
+            "Start_Time": ["9:00 AM", "11:00 AM", "1:00 PM"],
+        }
+    )
+
+
+def _sheets():
+    frame = _frame()
+    return {
+        "Schedule": (COLUMNS, frame_rows(frame, COLUMNS)),
+        "Sections_Only": (COLUMNS, frame_rows(frame.iloc[1:], COLUMNS)),
+    }
+
+
+FORMATS = [
+    "xlsx",
+    "csv",
+    "jsonl",
+    pytest.param(
+        "parquet",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("pyarrow") is None
+            and importlib.util.find_spec("fastparquet") is None,
+            reason="needs pyarrow or fastparquet",
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("output_format", FORMATS)
+def test_written_sheets_read_back_unchanged(tmp_path, output_format):
+    path = write_schedule(tmp_path / f"out.{output_format}", _sheets())
+
+    sheets = read_schedule(path, ["Schedule", "Sections_Only"])
+
+    expected = _frame()
+    pd.testing.assert_frame_equal(sheets["Schedule"], expected, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        sheets["Sections_Only"], expected.iloc[1:].reset_index(drop=True), check_dtype=False
+    )
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    path = write_schedule(tmp_path / "out.csv", _sheets())
+    before = path.read_bytes()
+
+    def failing_rows():
+        yield ("Sunday", "Algebra", 40, "9:00 AM")
+        raise RuntimeError("solver output broke mid-write")
+
+    with pytest.raises(RuntimeError):
+        write_schedule(path, {"Schedule": (COLUMNS, failing_rows())})
+
+    assert path.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.csv", "out_Sections_Only.csv"]
+
+
+def test_locked_target_gets_a_timestamped_copy(tmp_path, monkeypatch):
+    locked = tmp_path / "out.jsonl"
+    locked.write_text("old\n")
+    replace = type(locked).replace
+
+    def refuse_locked(self, target):
+        if str(target) == str(locked):
+            raise PermissionError("file is open elsewhere")
+        return replace(self, target)
+
+    monkeypatch.setattr(type(locked), "replace", refuse_locked)
+    written = write_schedule(locked, _sheets())
+
+    assert written != locked and written.name.startswith("out_")
+    assert locked.read_text() == "old\n"
+    # Later sheets follow the fallback name, so the pair still reads together.
+    assert sheet_path(written, "Sections_Only", 1).exists()
+    assert len(read_schedule(written, ["Schedule", "Sections_Only"])["Sections_Only"]) == 2
+
+
+def test_cells_are_written_as_native_values(tmp_path):
+    frame = pd.DataFrame({"Students": np.array([1, 2], dtype=np.int64), "Ratio": [0.5, np.nan]})
+    columns = list(frame.columns)
+
+    path = write_schedule(tmp_path / "out.jsonl", {"Schedule": (columns, frame_rows(frame, columns))})
+
+    assert path.read_text().splitlines() == [
+        '{"Students": 1, "Ratio": 0.5}',
+        '{"Students": 2, "Ratio": null}',
+    ]
+
+
+def test_output_writer_reports_done_and_failed_jobs(tmp_path):
+    writer = OutputWriter(max_workers=1)
+    release = threading.Event()
+    path = tmp_path / "out.csv"
+
+    def slow_write():
+        release.wait(5)
+        return write_schedule(path, _sheets())
+
+    def broken_write():
+        raise OSError("disk full")
+
+    done_id = writer.submit(path, slow_write)
+    failed_id = writer.submit(tmp_path / "other.csv", broken_write)
+    assert writer.status(done_id)["status"] in ("pending", "writing")
+    release.set()
+    writer.wait_for_path(path, timeout=5)
+    writer.shutdown()
+
+    done, failed = writer.status(done_id), writer.status(failed_id)
+    assert done["status"] == "done"
+    assert done["output_path"] == str(path.resolve())
+    assert failed["status"] == "failed" and failed["error"] == "disk full"
+    assert writer.status("unknown") is None
+    assert os.path.getsize(path) > 0
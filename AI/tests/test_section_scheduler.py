@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import CampusSpec, generate_campus, lecture_tables, section_tables
+from src.data_loader import DataLoader
+from src.scheduler import SchedulingCP
+from src.section_loader import SectionDataLoader
+from src.section_scheduler import SectionScheduler
+from src.section_utils import OccupancyIndex
+
+
+def test_occupancy_index_checks_overlap_per_day_and_key():
+    occupancy = OccupancyIndex()
+    occupancy.add("Sunday", "Lab 1", 540, 660)
+
+    assert not occupancy.is_free("Sunday", "Lab 1", 600, 720)
+    assert not occupancy.is_free("Sunday", "Lab 1", 480, 900)
+    # Back-to-back meetings and other rooms or days do not clash.
+    assert occupancy.is_free("Sunday", "Lab 1", 660, 780)
+    assert occupancy.is_free("Sunday", "Lab 1", 420, 540)
+    assert occupancy.is_free("Sunday", "Lab 2", 540, 660)
+    assert occupancy.is_free("Monday", "Lab 1", 540, 660)
+
+
+@pytest.fixture(scope="module")
+def section_scheduler():
+    campus = generate_campus(CampusSpec(courses=10, seed=1))
+    loader = DataLoader()
+    assert loader.load_from_json(lecture_tables(campus))
+    cp = SchedulingCP(loader.instance, time_limit_seconds=10, max_days_per_year=6)
+    schedule = cp.solve()
+    assert schedule
+
+    section_loader = SectionDataLoader()
+    tables = section_tables(campus, cp.schedule_frame(schedule).to_dict("records"))
+    assert section_loader.load_from_json(tables)
+    return SectionScheduler(
+        cp_schedule=section_loader.cp_schedule,
+        rooms=section_loader.rooms,
+        sections=section_loader.sections,
+        assistants=section_loader.assistants,
+        divisions=section_loader.divisions,
+        courses=section_loader.courses,
+        doctors=section_loader.doctors,
+    )
+
+
+def _placements(result):
+    return result.section_schedule[["Course_Name", "Day", "Room", "Start_Time"]].to_dict("records")
+
+
+def test_rerun_against_its_own_output_keeps_every_section(section_scheduler):
+    first = section_scheduler.run()
+    again = section_scheduler.run(previous_schedule=first.section_schedule)
+
+    placed = len(first.section_schedule) - first.unassigned_sections
+    assert placed > 0
+    assert again.unchanged_sections == placed
+    assert again.moved_sections == len(first.section_schedule) - placed
+    assert _placements(again) == _placements(first)
+
+
+def test_rerun_moves_only_sections_whose_slot_is_no_longer_valid(section_scheduler):
+    first = section_scheduler.run()
+    previous = first.section_schedule.copy()
+    placed_rows = previous.index[previous["Day"] != "UNASSIGNED"]
+    # A day outside the grid invalidates exactly one previous placement.
+    previous.loc[placed_rows[0], "Day"] = "Friday"
+
+    again = section_scheduler.run(previous_schedule=previous)
+
+    assert again.unchanged_sections == len(placed_rows) - 1
+    kept = pd.DataFrame(_placements(again)).drop(index=placed_rows[0])
+    assert kept.to_dict("records") == pd.DataFrame(_placements(first)).drop(
+        index=placed_rows[0]
+    ).to_dict("records")
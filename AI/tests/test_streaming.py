@@ -0,0 +1,116 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main
+from benchmarks.synthetic import CampusSpec, generate_campus, section_tables
+from src.main import NDJSON_MEDIA_TYPE
+
+# One two-hour course on five days, with one room and a two-hour day, so
+# the schedule is unique and both requests solve to the same rows.
+DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
+LECTURES = {
+    "rooms": [{"Room_ID": "R1", "Room": "Hall", "Capacity": 100, "Type": "Lecture"}],
+    "courses": [
+        {
+            "Course_ID": "C1",
+            "Course_Name": "Algebra",
+            "Department": "CS",
+            "Major": "CS",
+            "Days": len(DAYS),
+            "Hours_per_day": 2,
+            "Instructor_ID": "D1",
+            "Year": 1,
+            "Type": "Lecture",
+        }
+    ],
+    "doctors": [
+        {
+            "Instructor_ID": "D1",
+            "Instructor_Name": "Dr A",
+            "Department": "CS",
+            "Day": day,
+            "Start_Time": "08:00",
+            "End_Time": "10:00",
+        }
+        for day in DAYS
+    ],
+    "divisions": [
+        {"Num_ID": "CS", "Department": "CS", "Major": "CS", "Year": 1, "StudentNum": 60}
+    ],
+}
+CP_BODY = {
+    "data": LECTURES,
+    "config": {
+        "time_limit_seconds": 10,
+        "max_days_per_year": 6,
+        "time_grid": {"day_start": "08:00", "day_end": "10:00"},
+    },
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Small chunks, so the rows arrive over several writes.
+    monkeypatch.setattr(src.main, "STREAM_CHUNK_ROWS", 2)
+    return TestClient(src.main.app)
+
+
+def _records(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _rows(records, part):
+    return [
+        {key: value for key, value in record.items() if key not in ("record", "part")}
+        for record in records
+        if record["record"] == "row" and record["part"] == part
+    ]
+
+
+def test_cp_stream_sends_header_rows_and_end(client):
+    expected = client.post("/cp/generate", json=CP_BODY).json()
+    records = _records(client.post("/cp/generate/stream", json=CP_BODY))
+
+    header, end = records[0], records[-1]
+    assert header["record"] == "header" and header["success"]
+    assert "schedule" not in header
+    assert end == {"record": "end", "rows": len(DAYS)}
+    assert [record["record"] for record in records[1:-1]] == ["row"] * len(DAYS)
+    assert _rows(records, "cp") == expected["schedule"]
+
+
+def test_section_stream_sends_the_cp_rows_before_the_sections(client):
+    campus = generate_campus(CampusSpec(courses=6))
+    cp_schedule = [
+        {
+            "Day": "Sunday",
+            "Course_Name": course["Course_Name"],
+            "Start_Time": "9:00 AM",
+            "End_Time": "11:00 AM",
+            "Instructor_Name": "Dr 1",
+            "Students": 40,
+            "Room": campus["rooms"][0]["Room"],
+        }
+        for course in campus["courses"][:2]
+    ]
+    body = {"data": section_tables(campus, cp_schedule)}
+
+    expected = client.post("/sections/generate", json=body).json()
+    records = _records(client.post("/sections/generate/stream", json=body))
+
+    assert records[0]["total_rows"] == expected["total_rows"]
+    assert records[-1] == {"record": "end", "rows": expected["total_rows"]}
+    parts = [record["part"] for record in records[1:-1]]
+    assert parts == sorted(parts)  # "cp" rows, then "sections" rows
+    assert _rows(records, "cp") == expected["cp_schedule"]
+    assert _rows(records, "sections") == expected["sections_schedule"]
+
+
+def test_stream_rejects_bad_payloads_before_streaming(client):
+    response = client.post("/cp/generate/stream", json={"config": CP_BODY["config"]})
+
+    assert response.status_code == 422
@@ -0,0 +1,71 @@
+import pydantic
+import pytest
+
+from benchmarks.synthetic import CampusSpec, generate_campus, lecture_tables
+from src.data_loader import DataLoader
+from src.models import TimeGridConfig
+from src.scheduler import SchedulingCP
+from src.time_grid import TimeGrid
+from src.utils import time_to_minutes
+
+
+def _config_grid():
+    return TimeGrid.from_config(
+        TimeGridConfig(
+            granularity_minutes=30,
+            opening_hours={"Thursday": {"start": "08:00", "end": "13:00"}},
+            durations={"Lab": 90},
+        )
+    )
+
+
+def test_default_grid_has_hourly_starts_inside_the_day():
+    grid = TimeGrid()
+
+    assert grid.slot_starts() == list(range(480, 1021, 60))
+    assert grid.allowed_start_indices("Sunday", 120) == list(range(8))
+    assert grid.to_index(600) == 2
+    assert grid.duration_for("Lecture", 2) == 120
+    assert grid.section_blocks("Sunday") == [(540, 660), (660, 780), (780, 900), (900, 1020)]
+
+
+def test_config_grid_applies_granularity_hours_and_durations():
+    grid = _config_grid()
+
+    assert grid.duration_for("Lab", 2) == 90
+    assert grid.duration_for("Lecture", 2) == 120
+    assert grid.slots_for(90) == 3
+    # Thursday closes at 13:00, so a 90-minute meeting starts by 11:30.
+    assert grid.allowed_start_indices("Thursday", 90) == list(range(8))
+    assert grid.section_blocks("Thursday") == [(540, 660), (660, 780)]
+
+
+def test_section_blocks_start_on_the_grid():
+    grid = TimeGrid(section_start=time_to_minutes("09:30"))
+
+    assert grid.section_blocks("Sunday") == [(600, 720), (720, 840), (840, 960)]
+
+
+def test_invalid_grids_are_rejected():
+    with pytest.raises(ValueError):
+        TimeGrid(granularity_minutes=45)
+    with pytest.raises(ValueError):
+        TimeGrid(opening_hours={"Sunday": (600, 600)})
+    with pytest.raises(pydantic.ValidationError):
+        TimeGridConfig(granularity_minutes=45)
+    with pytest.raises(pydantic.ValidationError):
+        TimeGridConfig(day_start="17:00", day_end="08:00")
+
+
+def test_cp_schedule_respects_opening_hours():
+    loader = DataLoader()
+    assert loader.load_from_json(lecture_tables(generate_campus(CampusSpec(courses=10, seed=2))))
+    grid = TimeGrid(opening_hours={day: (480, 780) for day in ("Sunday", "Monday")})
+    cp = SchedulingCP(loader.instance, time_limit_seconds=10, max_days_per_year=6, time_grid=grid)
+    schedule = cp.solve()
+    assert schedule
+
+    frame = cp.schedule_frame(schedule)
+    short_days = frame[frame["Day"].isin(["Sunday", "Monday"])]
+    assert len(short_days) > 0
+    assert max(time_to_minutes(end) for end in short_days["End_Time"]) <= 780
@@ -0,0 +1,108 @@
+import io
+import os
+import time
+
+import openpyxl
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main
+import src.uploads
+from src.uploads import REQUIRED_SHEETS, UploadStore, UploadTooLarge
+from src.workbook_cache import WorkbookCache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = WorkbookCache(tmp_path / "cache")
+    monkeypatch.setattr(src.uploads, "workbook_cache", cache)
+    return cache
+
+
+def _workbook_bytes(kind="data", sheets=None, marker=0):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name in sheets or REQUIRED_SHEETS[kind]:
+        sheet = workbook.create_sheet(name)
+        sheet.append(["ID", "Value"])
+        sheet.append([name, marker])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _uploads(store):
+    return sorted(path.name for path in store.upload_dir.iterdir())
+
+
+def test_store_registers_the_parsed_workbook(tmp_path, cache):
+    store = UploadStore(tmp_path / "uploads")
+
+    upload_id, path, sheets = store.store(io.BytesIO(_workbook_bytes()), "data")
+
+    assert upload_id.startswith("data_")
+    assert store.resolve(upload_id, "data") == path
+    assert store.resolve(upload_id, "sdata") is None
+    assert store.resolve("../data_0123456789abcdef", "data") is None
+    assert set(sheets) == set(REQUIRED_SHEETS["data"])
+    assert cache.load(path) == (sheets, "hit")
+    # The same workbook uploaded again keeps its id.
+    assert store.store(io.BytesIO(_workbook_bytes()), "data")[0] == upload_id
+    assert _uploads(store) == [f"{upload_id}.xlsx"]
+
+
+@pytest.mark.parametrize(
+    "body, error",
+    [
+        (_workbook_bytes(sheets=["Rooms"]), ValueError),
+        (b"not a workbook", ValueError),
+        (b"x" * 2048, UploadTooLarge),
+    ],
+    ids=["missing-sheets", "not-xlsx", "too-large"],
+)
+def test_rejected_uploads_leave_nothing_behind(tmp_path, body, error):
+    store = UploadStore(tmp_path / "uploads", chunk_size=256, max_bytes=1024)
+    if error is not UploadTooLarge:
+        store.max_bytes = len(body) + 1
+
+    with pytest.raises(error):
+        store.store(io.BytesIO(body), "data")
+    assert _uploads(store) == []
+
+
+def test_expire_keeps_the_newest_uploads_within_the_age_limit(tmp_path):
+    store = UploadStore(tmp_path / "uploads", max_uploads=2, max_age_seconds=3600)
+    ids = []
+    for marker in range(3):
+        upload_id, path, _ = store.store(io.BytesIO(_workbook_bytes(marker=marker)), "data")
+        age = (3 - marker) * 60
+        os.utime(path, (time.time() - age, time.time() - age))
+        ids.append(upload_id)
+
+    # Each upload expires the others; the third pushed out the oldest.
+    assert _uploads(store) == sorted(f"{upload_id}.xlsx" for upload_id in ids[1:])
+
+    stale = store.upload_dir / f"{ids[1]}.xlsx"
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+    assert store.expire() == 1
+    assert store.resolve(ids[1], "data") is None
+    assert store.resolve(ids[2], "data") is not None
+
+
+def test_upload_endpoint_reports_sheets_and_rejects_oversized_files(tmp_path, monkeypatch):
+    store = UploadStore(tmp_path / "uploads", max_bytes=64 * 1024)
+    monkeypatch.setattr(src.main, "upload_store", store)
+    client = TestClient(src.main.app)
+
+    response = client.post(
+        "/uploads/sdata", files={"file": ("SData.xlsx", _workbook_bytes("sdata"))}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["upload_id"].startswith("sdata_")
+    assert body["sheets"] == {name: 1 for name in REQUIRED_SHEETS["sdata"]}
+
+    too_large = client.post("/uploads/data", files={"file": ("Data.xlsx", b"x" * 70 * 1024)})
+    assert too_large.status_code == 413
+    wrong = client.post("/uploads/data", files={"file": ("Data.xlsx", _workbook_bytes("sdata"))})
+    assert wrong.status_code == 400
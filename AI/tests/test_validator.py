@@ -0,0 +1,88 @@
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from src.validator import _sweep, validate_schedule
+
+
+def _brute_force(groups, cols, checked, blocking):
+    """Checked rows overlapping an earlier-starting blocking row of their group."""
+    start, end = cols["start"], cols["end"]
+    hits = {}
+    for row, other in product(range(len(groups)), repeat=2):
+        if (
+            row != other
+            and checked[row]
+            and blocking[other]
+            and groups[row] == groups[other]
+            and start[other] < start[row] < end[other]
+        ):
+            hits.setdefault(row, []).append(other)
+    return hits
+
+
+def test_sweep_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        n = int(rng.integers(2, 30))
+        # Distinct starts, so "earlier" never depends on sort tie-breaking.
+        start = rng.choice(np.arange(480, 1080), size=n, replace=False).astype(np.int64)
+        cols = {"start": start, "end": start + rng.integers(30, 180, size=n)}
+        groups = rng.integers(0, 4, size=n).astype(np.int64)
+        checked = rng.random(n) < 0.7
+        blocking = rng.random(n) < 0.7
+
+        pairs = _sweep(groups, cols, checked, blocking)
+        expected = _brute_force(groups, cols, checked, blocking)
+
+        assert sorted(pairs[:, 0].tolist()) == sorted(expected)
+        for row, other in pairs.tolist():
+            assert other in expected[row]
+            # Paired with the overlapping row that ends last.
+            assert cols["end"][other] == max(cols["end"][o] for o in expected[row])
+
+
+def test_sweep_ignores_back_to_back_and_other_groups():
+    cols = {"start": np.array([540, 600, 540]), "end": np.array([600, 660, 600])}
+    everything = np.ones(3, dtype=bool)
+
+    assert len(_sweep(np.array([0, 0, 1]), cols, everything, everything)) == 0
+
+
+def test_validate_schedule_counts_each_kind():
+    schedule = pd.DataFrame(
+        [
+            ["Monday", "Algorithms", "Dr A", "", "Hall 1", "9:00 AM", "11:00 AM", "CS", 2, 50],
+            ["Monday", "Databases", "Dr A", "", "Hall 2", "10:00 AM", "12:00 PM", "IS", 3, 40],
+            ["Monday", "Networks", "Dr B", "", "Hall 1", "10:30 AM", "11:30 AM", "CS", 2, 30],
+            ["Monday", "Algorithms Lab", "", "Eng C", "Lab 1", "9:00 AM", "10:00 AM", "CS", 2, 20],
+        ],
+        columns=[
+            "Day",
+            "Course_Name",
+            "Instructor_Name",
+            "Assistant_Name",
+            "Room",
+            "Start_Time",
+            "End_Time",
+            "Major",
+            "Year",
+            "Students",
+        ],
+    )
+    rooms = pd.DataFrame({"Room": ["Hall 1", "Hall 2", "Lab 1"], "Capacity": [60, 30, 25]})
+
+    result = validate_schedule(schedule, rooms=rooms)
+
+    assert result["counts"] == {
+        "room": 1,
+        "instructor": 1,
+        "division": 2,
+        "assistant": 0,
+        "capacity": 1,
+        "availability": 0,
+        "opening_hours": 0,
+    }
+    assert result["conflicts"]["room"][0]["other_course"] == "Algorithms"
+    assert not result["valid"]
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.workbook_cache import WorkbookCache, file_digest, read_workbook
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def _assert_matches_pandas(path):
+    expected = pd.read_excel(path, sheet_name=None)
+    sheets = read_workbook(path)
+
+    assert list(sheets) == list(expected)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(sheets[name], frame)
+
+
+@pytest.mark.parametrize(
+    "path", sorted(DATA_DIR.glob("*/*.xlsx")), ids=lambda path: path.name
+)
+def test_read_workbook_matches_read_excel_on_bundled_workbooks(path):
+    _assert_matches_pandas(path)
+
+
+def test_read_workbook_matches_read_excel_on_irregular_sheets(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Rooms"
+    sheet.append(["Room", None, "Room", "Capacity"])
+    sheet.append(["Hall", "x", "A", 100])
+    sheet.append([])
+    sheet.append(["Lab", None, None, 25.5])
+    sheet.append(["Annex"])
+    sheet.append([])
+    workbook.create_sheet("Empty")
+    numbers = workbook.create_sheet("Numbers")
+    numbers.append(["Year", "Students"])
+    numbers.append([1, 40])
+    numbers.append([None, None])
+    numbers.append([2, None])
+    path = tmp_path / "irregular.xlsx"
+    workbook.save(path)
+
+    _assert_matches_pandas(path)
+
+
+def _workbook(path, rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_cache_serves_memory_then_sidecar_then_reparses_on_change(tmp_path):
+    path = _workbook(tmp_path / "data.xlsx", [["Room", "Capacity"], ["Hall", 100]])
+    cache = WorkbookCache(tmp_path / "cache")
+
+    first, first_status = cache.load(path)
+    second, second_status = cache.load(path)
+    assert (first_status, second_status) == ("miss", "hit")
+    assert second is first
+
+    # A new process finds the pickle sidecar instead of parsing again.
+    restarted = WorkbookCache(tmp_path / "cache")
+    from_disk, disk_status = restarted.load(path)
+    assert disk_status == "hit"
+    pd.testing.assert_frame_equal(from_disk["Sheet"], first["Sheet"])
+
+    _workbook(path, [["Room", "Capacity"], ["Hall", 120]])
+    changed, changed_status = restarted.load(path)
+    assert changed_status == "miss"
+    assert changed["Sheet"]["Capacity"].tolist() == [120]
+    assert cache.lookups() == {"memory": 1, "disk": 0, "miss": 1}
+    assert restarted.lookups() == {"memory": 0, "disk": 1, "miss": 1}
+
+
+def test_only_the_most_recent_sidecars_are_kept(tmp_path):
+    cache = WorkbookCache(tmp_path / "cache", max_sidecars=2)
+    paths = [_workbook(tmp_path / f"out_{idx}.xlsx", [["Row"], [idx]]) for idx in range(4)]
+    for path in paths:
+        cache.load(path)
+
+    kept = {sidecar.stem for sidecar in (tmp_path / "cache").glob("*.pkl")}
+    assert kept == {file_digest(path) for path in paths[2:]}
@@ -1,3 +1,5 @@
+const zlib = require('zlib');
+
 jest.mock('node-fetch', () => jest.fn());
 
 jest.mock('../../../config/env', () => ({
@@ -575,6 +577,163 @@ describe('AIIntegrationService', () => {
     });
   });
 
+  describe('jsonPost', () => {
+    test('sends small bodies as plain JSON', () => {
+      const options = service.jsonPost({ data: { rooms: [] } });
+
+      expect(options).toEqual({
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ data: { rooms: [] } }),
+      });
+    });
+
+    test('gzips bodies of 1 KiB or more', () => {
+      const payload = { data: { rooms: Array.from({ length: 100 }, (_, i) => ({ Room_ID: `R${i}` })) } };
+
+      const options = service.jsonPost(payload);
+
+      expect(options.headers).toEqual({ 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' });
+      expect(JSON.parse(zlib.gunzipSync(options.body).toString())).toEqual(payload);
+    });
+  });
+
+  describe('dataset sync', () => {
+    const makeTables = () => ({
+      rooms: [
+        { Room_ID: 'R1', Capacity: 40 },
+        { Room_ID: 'R2', Capacity: 20 },
+      ],
+      courses: [{ Course_ID: 'C1', Course_Name: 'Algorithms' }],
+      doctors: [
+        { Instructor_ID: 'I1', Day: 'Monday', Start_Time: '9:00 AM', End_Time: '11:00 AM' },
+        { Instructor_ID: 'I1', Day: 'Tuesday', Start_Time: '9:00 AM', End_Time: '11:00 AM' },
+      ],
+      divisions: [{ Num_ID: 1, Group: 'G1' }],
+    });
+    const jsonResponse = (status, body) => ({
+      ok: status >= 200 && status < 300,
+      status,
+      json: async () => body,
+      text: async () => JSON.stringify(body),
+    });
+    const sentBody = call => JSON.parse(call[1].body);
+
+    test('first sync uploads the full tables with PUT', async () => {
+      const tables = makeTables();
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 1 }));
+
+      const version = await service.syncDataset('campus 1', tables);
+
+      expect(version).toBe(1);
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(fetch.mock.calls[0][0]).toBe('http://ai.test/datasets/campus%201');
+      expect(fetch.mock.calls[0][1].method).toBe('PUT');
+      expect(sentBody(fetch.mock.calls[0])).toEqual({ data: tables });
+    });
+
+    test('sends nothing when the tables did not change', async () => {
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 1 }));
+      await service.syncDataset('campus-1', makeTables());
+
+      const version = await service.syncDataset('campus-1', makeTables());
+
+      expect(version).toBe(1);
+      expect(fetch).toHaveBeenCalledTimes(1);
+    });
+
+    test('sends only changed rows with PATCH, keying doctors by instructor, day and start', async () => {
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 1 }));
+      await service.syncDataset('campus-1', makeTables());
+      const tables = makeTables();
+      tables.rooms = [{ Room_ID: 'R1', Capacity: 45 }];
+      tables.doctors = [tables.doctors[0]];
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 2 }));
+
+      const version = await service.syncDataset('campus-1', tables);
+
+      expect(version).toBe(2);
+      expect(fetch.mock.calls[1][1].method).toBe('PATCH');
+      expect(sentBody(fetch.mock.calls[1])).toEqual({
+        base_version: 1,
+        changes: {
+          rooms: { upsert: [{ Room_ID: 'R1', Capacity: 45 }], delete: ['R2'] },
+          doctors: {
+            upsert: [],
+            delete: [{ Instructor_ID: 'I1', Day: 'Tuesday', Start_Time: '9:00 AM' }],
+          },
+        },
+      });
+    });
+
+    test('falls back to PUT when the PATCH base version is stale (409)', async () => {
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 1 }));
+      await service.syncDataset('campus-1', makeTables());
+      const tables = makeTables();
+      tables.courses[0].Course_Name = 'Data Structures';
+      fetch
+        .mockResolvedValueOnce(jsonResponse(409, { detail: 'stale base version' }))
+        .mockResolvedValueOnce(jsonResponse(200, { version: 5 }));
+
+      const version = await service.syncDataset('campus-1', tables);
+
+      expect(version).toBe(5);
+      expect(fetch.mock.calls.map(call => call[1].method)).toEqual(['PUT', 'PATCH', 'PUT']);
+      expect(sentBody(fetch.mock.calls[2])).toEqual({ data: tables });
+    });
+
+    test('throws on other PATCH errors', async () => {
+      fetch.mockResolvedValueOnce(jsonResponse(200, { version: 1 }));
+      await service.syncDataset('campus-1', makeTables());
+      const tables = makeTables();
+      tables.divisions = [];
+      fetch.mockResolvedValueOnce(jsonResponse(500, 'boom'));
+
+      await expect(service.syncDataset('campus-1', tables)).rejects.toThrow('AI Dataset Error: 500');
+    });
+
+    test('diffDataset reports only tables with changes', async () => {
+      fetch.mockResolvedValue(jsonResponse(200, { version: 1 }));
+      const tables = makeTables();
+      tables.divisions.push({ Num_ID: 2, Group: 'G2' });
+      await service.syncDataset('before', makeTables());
+      await service.syncDataset('after', tables);
+
+      const changes = service.diffDataset(service.datasets.get('before').rows, service.datasets.get('after').rows);
+
+      expect(changes).toEqual({ divisions: { upsert: [{ Num_ID: 2, Group: 'G2' }], delete: [] } });
+    });
+
+    test('runCpGenerate re-uploads the dataset and retries when the AI lost it (404)', async () => {
+      fetch
+        .mockResolvedValueOnce(jsonResponse(200, { version: 1 }))
+        .mockResolvedValueOnce(jsonResponse(404, { detail: 'unknown dataset' }))
+        .mockResolvedValueOnce(jsonResponse(200, { version: 1 }))
+        .mockResolvedValueOnce(jsonResponse(200, { total_assignments: 1, schedule: [{ course_name: 'C' }] }));
+      jest.spyOn(service, 'transformRoomToAI').mockImplementation(r => r);
+      jest.spyOn(service, 'transformCourseToAI').mockImplementation(c => c);
+      jest.spyOn(service, 'transformInstructorToAI').mockImplementation(i => [i]);
+      jest.spyOn(service, 'transformDivisionToAI').mockImplementation(d => d);
+      const tables = makeTables();
+
+      const rows = await service.runCpGenerate('campus-1', {
+        rooms: tables.rooms,
+        courses: tables.courses,
+        instructors: tables.doctors,
+        divisions: tables.divisions,
+      });
+
+      expect(rows).toEqual([{ course_name: 'C' }]);
+      expect(fetch.mock.calls.map(call => [call[0], call[1].method])).toEqual([
+        ['http://ai.test/datasets/campus-1', 'PUT'],
+        ['http://ai.test/cp/generate', 'POST'],
+        ['http://ai.test/datasets/campus-1', 'PUT'],
+        ['http://ai.test/cp/generate', 'POST'],
+      ]);
+      expect(sentBody(fetch.mock.calls[3]).dataset).toEqual({ campus: 'campus-1', version: 1 });
+    });
+  });
+
   describe('sessionsToCpRows', () => {
     test('maps stored lecture sessions to CP row shape', () => {
       const rows = service.sessionsToCpRows([
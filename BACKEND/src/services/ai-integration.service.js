@@ -1,3 +1,4 @@
+const zlib = require('zlib');
 const fetch = require('node-fetch');
 const { prisma } = require('../config/db');
 const env = require('../config/env');
@@ -6,9 +7,40 @@ const env = require('../config/env');
 // type exist to derive a capacity from.
 const DEFAULT_SECTION_SIZE = 25;
 
+// Request bodies at least this large are gzipped; the AI service decodes
+// Content-Encoding and gzips large responses (node-fetch inflates those).
+const GZIP_MIN_BYTES = 1024;
+
+// Row keys of the AI service's dataset tables (AI/src/datasets.py).
+const DATASET_KEYS = {
+  rooms: ['Room_ID'],
+  courses: ['Course_ID'],
+  doctors: ['Instructor_ID', 'Day', 'Start_Time'],
+  divisions: ['Num_ID']
+};
+
 class AIIntegrationService {
   constructor() {
     this.aiApiUrl = env.AI_API_URL;
+    // campusId -> { version, rows: { table: Map(key -> { row, json }) } }
+    this.datasets = new Map();
+  }
+
+  /**
+   * Build fetch options for a JSON POST to the AI service.
+   * @param {Object} payload - request body
+   * @returns {Object} fetch options, gzip-encoded when the body is large
+   */
+  jsonPost(payload) {
+    const json = JSON.stringify(payload);
+    if (Buffer.byteLength(json) < GZIP_MIN_BYTES) {
+      return { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: json };
+    }
+    return {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+      body: zlib.gzipSync(json)
+    };
   }
 
   /**
@@ -115,33 +147,40 @@ class AIIntegrationService {
 
   /**
    * Run the CP lecture solver for the given campus data and return its rows.
+   * The campus tables are synced to an AI-side dataset and solved by reference.
+   * @param {string} campusId
    * @param {{rooms:Array, courses:Array, instructors:Array, divisions:Array}} data
    * @returns {Promise<Array<Object>>} CP lecture schedule rows (AI response shape)
    */
-  async runCpGenerate({ rooms, courses, instructors, divisions }) {
+  async runCpGenerate(campusId, { rooms, courses, instructors, divisions }) {
     console.log('🔄 Transforming data for AI...');
-    const aiData = {
-      data: {
-        rooms: rooms.map(r => this.transformRoomToAI(r)),
-        courses: courses.map(c => this.transformCourseToAI(c)),
-        doctors: instructors.flatMap(i => this.transformInstructorToAI(i)),
-        divisions: divisions.map(d => this.transformDivisionToAI(d))
-      },
-      config: {
-        time_limit_seconds: 300,
-        max_days_per_year: 3,
-        relax_if_infeasible: true
-      }
+    const tables = {
+      rooms: rooms.map(r => this.transformRoomToAI(r)),
+      courses: courses.map(c => this.transformCourseToAI(c)),
+      doctors: instructors.flatMap(i => this.transformInstructorToAI(i)),
+      divisions: divisions.map(d => this.transformDivisionToAI(d))
+    };
+    const config = {
+      time_limit_seconds: 300,
+      max_days_per_year: 3,
+      relax_if_infeasible: true
     };
 
     console.log('🚀 Calling AI CP service at:', this.aiApiUrl);
-    const response = await fetch(`${this.aiApiUrl}/cp/generate`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json'
-      },
-      body: JSON.stringify(aiData)
-    });
+    let version = await this.syncDataset(campusId, tables);
+    let response = await fetch(
+      `${this.aiApiUrl}/cp/generate`,
+      this.jsonPost({ dataset: { campus: campusId, version }, config })
+    );
+    if (response.status === 404) {
+      // The AI service restarted or evicted the version: upload it again.
+      this.datasets.delete(campusId);
+      version = await this.syncDataset(campusId, tables);
+      response = await fetch(
+        `${this.aiApiUrl}/cp/generate`,
+        this.jsonPost({ dataset: { campus: campusId, version }, config })
+      );
+    }
 
     if (!response.ok) {
       const errorText = await response.text();
@@ -153,6 +192,87 @@ class AIIntegrationService {
     return aiResult.schedule || [];
   }
 
+  /**
+   * Make the AI service hold the given campus tables and return the dataset
+   * version to solve against. After the first full upload only changed rows
+   * are sent (PATCH); a full PUT is used again if the AI lost the base version.
+   * @param {string} campusId
+   * @param {Object} tables - { rooms, courses, doctors, divisions } in AI shape
+   * @returns {Promise<number>} dataset version
+   */
+  async syncDataset(campusId, tables) {
+    const url = `${this.aiApiUrl}/datasets/${encodeURIComponent(campusId)}`;
+    const rows = {};
+    for (const [name, keyColumns] of Object.entries(DATASET_KEYS)) {
+      rows[name] = new Map(
+        tables[name].map(row => [
+          JSON.stringify(keyColumns.map(column => row[column])),
+          { row, json: JSON.stringify(row) }
+        ])
+      );
+    }
+
+    const cached = this.datasets.get(campusId);
+    if (cached) {
+      const changes = this.diffDataset(cached.rows, rows);
+      if (Object.keys(changes).length === 0) {
+        return cached.version;
+      }
+      const response = await fetch(url, {
+        ...this.jsonPost({ base_version: cached.version, changes }),
+        method: 'PATCH'
+      });
+      if (response.ok) {
+        const result = await response.json();
+        this.datasets.set(campusId, { version: result.version, rows });
+        return result.version;
+      }
+      if (response.status !== 404 && response.status !== 409) {
+        const errorText = await response.text();
+        throw new Error(`AI Dataset Error: ${response.status} - ${errorText}`);
+      }
+    }
+
+    const response = await fetch(url, { ...this.jsonPost({ data: tables }), method: 'PUT' });
+    if (!response.ok) {
+      const errorText = await response.text();
+      throw new Error(`AI Dataset Error: ${response.status} - ${errorText}`);
+    }
+    const result = await response.json();
+    this.datasets.set(campusId, { version: result.version, rows });
+    return result.version;
+  }
+
+  /**
+   * Row-level changes between two keyed snapshots, in PATCH /datasets shape.
+   * @returns {Object} { table: { upsert: [rows], delete: [keys] } } for changed tables
+   */
+  diffDataset(previous, current) {
+    const changes = {};
+    for (const [name, keyColumns] of Object.entries(DATASET_KEYS)) {
+      const upsert = [];
+      for (const [key, entry] of current[name]) {
+        if (previous[name].get(key)?.json !== entry.json) {
+          upsert.push(entry.row);
+        }
+      }
+      const deleted = [];
+      for (const [key, entry] of previous[name]) {
+        if (!current[name].has(key)) {
+          deleted.push(
+            keyColumns.length === 1
+              ? entry.row[keyColumns[0]]
+              : Object.fromEntries(keyColumns.map(column => [column, entry.row[column]]))
+          );
+        }
+      }
+      if (upsert.length > 0 || deleted.length > 0) {
+        changes[name] = { upsert, delete: deleted };
+      }
+    }
+    return changes;
+  }
+
   /**
    * Delete any existing Schedule records (and their sessions) matching a
    * campus + semester + tag, so regeneration replaces the previous result.
@@ -184,7 +304,7 @@ class AIIntegrationService {
    */
   async generateLecturesSchedule(campusId, semester) {
     const data = await this.fetchCampusData(campusId);
-    const cpRows = await this.runCpGenerate(data);
+    const cpRows = await this.runCpGenerate(campusId, data);
 
     // Regenerating lectures invalidates the previously generated sections.
     await this.replaceExistingSchedules(campusId, semester, AIIntegrationService.SECTIONS_TAG);
@@ -588,13 +708,7 @@ class AIIntegrationService {
    * @returns {Promise<Array<Object>>} sections_schedule rows
    */
   async callSectionsEndpoint(data) {
-    const response = await fetch(`${this.aiApiUrl}/sections/generate`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json'
-      },
-      body: JSON.stringify({ data })
-    });
+    const response = await fetch(`${this.aiApiUrl}/sections/generate`, this.jsonPost({ data }));
 
     if (!response.ok) {
       const errorText = await response.text();